@@ -0,0 +1,84 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Benchmark the wall-clock time of command line reports.
+
+Each run starts a new process, like a script or a cron job, reporting from a
+database of a year of tasks. The time of a bare interpreter and of importing
+peewee are given for reference.
+
+Usage: python3 benchmarks/bench_cli.py [number of runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_export import create_tasks  # noqa: E402
+
+from taskcounter.db import close_database, create_database  # noqa: E402
+from taskcounter.db.model import DB  # noqa: E402
+from taskcounter.db.utility import migrate_database  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wall_time(args, env):
+    """Return the seconds to run python with arguments, in a new process."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark for every command."""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 11
+    with tempfile.TemporaryDirectory() as home:
+        database = os.path.join(home, 'taskcounter.db')
+        DB.init(database)
+        create_database()
+        migrate_database()
+        create_tasks(1)
+        close_database()
+
+        env = dict(os.environ, HOME=home, PYTHONPATH=ROOT)
+        cli = ['-m', 'taskcounter', '--database', database]
+        commands = (
+            ('python', ['-c', 'pass']),
+            ('import peewee', ['-c', 'import peewee']),
+            ('report week', cli + ['report', '--year', '2010',
+                                   '--week', '10']),
+            ('report year', cli + ['report', '--year', '2010']),
+            ('hours', cli + ['hours', '--year', '2010']),
+        )
+        print('{:<14} {:>10} {:>10}'.format('command', 'median ms',
+                                            'min ms'))
+        for name, args in commands:
+            timings = [wall_time(args, env) for _ in range(runs)]
+            print('{:<14} {:>10.1f} {:>10.1f}'.format(
+                name, statistics.median(timings) * 1000,
+                min(timings) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Benchmark the per-keystroke latency of task name completion.
+
+Task names are typed character by character, in each match mode, against
+an index of many distinct task names.
+
+Usage: python3 benchmarks/bench_completion.py [number of task names]
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taskcounter.model import CompletionIndex  # noqa: E402
+
+WORDS = ('meeting', 'review', 'support', 'release', 'planning', 'bug',
+         'customer', 'deploy', 'design', 'documentation', 'interview',
+         'training', 'lunch', 'mail', 'project', 'sprint', 'test', 'build')
+
+TYPED_NAMES = 200
+
+
+def task_names(count):
+    """Get distinct random task names."""
+    names = set()
+    while len(names) < count:
+        names.add('{} {} {}'.format(random.choice(WORDS).capitalize(),
+                                    random.choice(WORDS),
+                                    random.randrange(1000)))
+    return sorted(names)
+
+
+def main():
+    """Run the benchmark for every match mode."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    random.seed(0)
+    today = date.today()
+    names = task_names(count)
+    uses = [(name, random.randint(1, 50),
+             today - timedelta(days=random.randrange(365)))
+            for name in names]
+
+    start = time.perf_counter()
+    index = CompletionIndex(uses, today)
+    print('{} task names indexed in {:.1f} ms'.format(
+        len(index), (time.perf_counter() - start) * 1000))
+
+    typed = random.sample(names, TYPED_NAMES)
+    print('{:<10} {:>10} {:>10} {:>10}'.format('match', 'median ms',
+                                               'p99 ms', 'max ms'))
+    for match in CompletionIndex.MATCHES:
+        timings = []
+        for name in typed:
+            for end in range(1, len(name) + 1):
+                start = time.perf_counter()
+                index.complete(name[:end], match)
+                timings.append(time.perf_counter() - start)
+        timings.sort()
+        print('{:<10} {:>10.3f} {:>10.3f} {:>10.3f}'.format(
+            match, statistics.median(timings) * 1000,
+            timings[int(len(timings) * 0.99)] * 1000, timings[-1] * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Benchmark the time and memory of exports over periods of years.
+
+Rows are streamed from the database to the writers, so the peak memory
+allocated by an export must not grow with the length of the period.
+
+Usage: python3 benchmarks/bench_export.py [number of years]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, time as clock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taskcounter.db import Day, Task, Week, close_database, create_database  # noqa: E402
+from taskcounter.db.model import DB  # noqa: E402
+from taskcounter.db.utility import migrate_database  # noqa: E402
+from taskcounter.export import REPORTS, WRITERS, export  # noqa: E402
+from taskcounter.weekcalendar import dates_of_week, iso_weeks_for_year  # noqa: E402
+
+FIRST_YEAR = 2010
+
+TASKS_PER_DAY = 10
+
+
+def create_tasks(years):
+    """Create tasks on the working days of years."""
+    with DB.atomic():
+        for year in range(FIRST_YEAR, FIRST_YEAR + years):
+            for week_number in range(1, iso_weeks_for_year(year) + 1):
+                week = Week.create(year=year, week_number=week_number)
+                for date_ in dates_of_week(year, week_number)[:5]:
+                    day = Day.create(date=date_, week=week)
+                    Task.insert_many(
+                        {'name': 'task {}'.format(i), 'day': day,
+                         'start_time': clock(8 + i % 12),
+                         'end_time': clock(8 + i % 12, 30)}
+                        for i in range(TASKS_PER_DAY)).execute()
+
+
+def bench_export(format_, report, years):
+    """Return the milliseconds and peak kilobytes of an export to a file.
+
+    Memory is traced in a second run, tracing slows the export down.
+    """
+    start_date = date(FIRST_YEAR, 1, 1)
+    end_date = date(FIRST_YEAR + years - 1, 12, 31)
+    with open(os.devnull, 'w', encoding='utf-8', newline='') as stream:
+        start = time.perf_counter()
+        export(stream, format_, report, start_date, end_date, 420)
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        export(stream, format_, report, start_date, end_date, 420)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed * 1000, peak / 1024
+
+
+def main():
+    """Run the benchmark for every report and format, on growing periods."""
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    with tempfile.TemporaryDirectory() as directory:
+        DB.init(os.path.join(directory, 'export.db'))
+        create_database()
+        migrate_database()
+        create_tasks(years)
+
+        print('{:<8} {:<9} {:>6} {:>10} {:>10}'.format(
+            'report', 'format', 'years', 'ms', 'peak KiB'))
+        for report in REPORTS:
+            for format_ in WRITERS:
+                for period in sorted({1, years // 2 or 1, years}):
+                    milliseconds, peak = bench_export(format_, report, period)
+                    print('{:<8} {:<9} {:>6} {:>10.1f} {:>10.1f}'.format(
+                        report, format_, period, milliseconds, peak))
+        close_database()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Benchmark the rendering cost of a week for each logging configuration.
+
+Debug logs of hot paths are gated by the TASKCOUNTER_DEBUG flag read at
+startup, so the rendering cost must not depend on the logging configuration
+set afterwards.
+
+Usage: python3 benchmarks/bench_logging.py [number of rounds]
+"""
+
+import logging
+import os
+import statistics
+import sys
+import time
+from datetime import time as clock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import Qt  # noqa: E402
+from PyQt5.QtGui import QGuiApplication  # noqa: E402
+
+from taskcounter.db import (Day, Task, close_database,  # noqa: E402
+                            create_database)
+from taskcounter.db.model import DB  # noqa: E402
+from taskcounter.db.utility import migrate_database  # noqa: E402
+from taskcounter.enum import WeekDay  # noqa: E402
+from taskcounter.model import SettingModel, WeekModel  # noqa: E402
+from taskcounter.utility import (color_between, contrast_color,  # noqa: E402
+                                 minutes_to_time_str, weekday_from_date)
+
+TASKS_PER_DAY = 12
+
+ROLES = (Qt.DisplayRole, Qt.BackgroundRole, Qt.ForegroundRole,
+         Qt.TextAlignmentRole)
+
+
+def render_week(week):
+    """Render every cell of a week, then its counters."""
+    for week_day in WeekDay:
+        day_model = week[week_day]
+        day_model.update_rendering()
+        weekday_from_date(day_model.date)
+        for row in range(day_model.rowCount()):
+            for column in range(day_model.columnCount()):
+                index = day_model.index(row, column)
+                for role in ROLES:
+                    day_model.data(index, role)
+    for minutes in range(0, 600, 5):
+        minutes_to_time_str(minutes)
+        color = color_between('#ff0000', '#00ff00', minutes / 600)
+        contrast_color(color)
+
+
+def bench_configuration(week, level, rounds):
+    """Return the median milliseconds to render a week at a log level."""
+    root = logging.getLogger()
+    handler = logging.FileHandler(os.devnull)
+    root.addHandler(handler)
+    logging.getLogger('taskcounter').setLevel(level)
+    try:
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            render_week(week)
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings) * 1000
+    finally:
+        root.removeHandler(handler)
+        handler.close()
+
+
+def main():
+    """Run the benchmark for every logging configuration."""
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    QGuiApplication([sys.argv[0], '-platform', 'offscreen'])
+    DB.init(':memory:')
+    create_database()
+    migrate_database()
+    SettingModel.load_cache()
+
+    for day in Day.select().where(Day.week == WeekModel(2018, 10).week_id):
+        Task.insert_many(
+            {'name': 'task {}'.format(i), 'day': day,
+             'start_time': clock(i), 'end_time': clock(i, 30)}
+            for i in range(TASKS_PER_DAY)).execute()
+    week = WeekModel(2018, 10)
+    # warm up the lazy day models and the caches.
+    render_week(week)
+
+    print('{:<10} {:>12}'.format('level', 'median ms'))
+    for name, level in (('WARNING', logging.WARNING),
+                        ('INFO', logging.INFO),
+                        ('DEBUG', logging.DEBUG)):
+        print('{:<10} {:>12.3f}'.format(
+            name, bench_configuration(week, level, rounds)))
+    close_database()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Benchmark commit latency of single-row writes for each pragma profile.
+
+Usage: python3 benchmarks/bench_pragmas.py [number of writes]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taskcounter.db import Day, Task, Week, close_database, create_database  # noqa: E402
+from taskcounter.db.model import (DB, PRAGMA_PROFILE_VARIABLE,  # noqa: E402
+                                  PRAGMA_PROFILES)
+from taskcounter.db.utility import migrate_database  # noqa: E402
+
+
+def bench_profile(profile, directory, writes):
+    """Return the mean latency in milliseconds of single-row commits."""
+    os.environ[PRAGMA_PROFILE_VARIABLE] = profile
+    DB.init(os.path.join(directory, profile + '.db'))
+    create_database()
+    migrate_database()
+
+    week = Week.create(year=2018, week_number=10)
+    day = Day.create(date='2018-03-05', week=week)
+
+    start = time.perf_counter()
+    for i in range(writes):
+        # like the day model: one autocommit statement per cell edit.
+        task_id = Task.insert(name='task {}'.format(i), day=day).execute()
+        Task.update(start_time='08:00').where(Task.id == task_id).execute()
+        Task.update(end_time='09:00').where(Task.id == task_id).execute()
+    elapsed = time.perf_counter() - start
+
+    close_database()
+    return elapsed / (writes * 3) * 1000
+
+
+def main():
+    """Run the benchmark for every profile."""
+    writes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with tempfile.TemporaryDirectory() as directory:
+        print('{:<10} {:>12}'.format('profile', 'ms / commit'))
+        for profile in PRAGMA_PROFILES:
+            latency = bench_profile(profile, directory, writes)
+            print('{:<10} {:>12.3f}'.format(profile, latency))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Benchmark the time to the first paint of the main window.
+
+Each run starts a new process, with an empty home directory, loading the
+resources from the binary resource file or from the resources module. Cold
+runs also start with an empty bytecode cache, like a first launch.
+
+Usage: python3 benchmarks/bench_startup.py [number of runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# run in a new process, prints the seconds to the first paint.
+CHILD = '''
+import time
+start = time.perf_counter()
+
+from PyQt5.QtCore import QEvent
+from PyQt5.QtWidgets import QApplication
+
+import taskcounter.taskcounter
+
+
+class TimedMainWindow(taskcounter.taskcounter.MainWindow):
+    """Main window quitting on its first paint."""
+
+    def event(self, event):
+        """Print the elapsed time on the first paint."""
+        if event.type() == QEvent.Paint:
+            print(time.perf_counter() - start)
+            QApplication.instance().exit(0)
+        return super().event(event)
+
+
+taskcounter.taskcounter.MainWindow = TimedMainWindow
+taskcounter.taskcounter.main()
+'''
+
+
+def time_to_first_paint(resource_module, cold):
+    """Return the seconds to the first paint, in a new process."""
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, PYTHONPATH=ROOT)
+        if cold:
+            env['PYTHONPYCACHEPREFIX'] = os.path.join(home, 'pycache')
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        if resource_module:
+            env['TASKCOUNTER_RESOURCE_MODULE'] = '1'
+        output = subprocess.run([sys.executable, '-c', CHILD], env=env,
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL,
+                                check=True).stdout
+        return float(output.split()[-1])
+
+
+def main():
+    """Run the benchmark for both resource loadings."""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print('{:<18} {:>14} {:>14}'.format('resources', 'warm median ms',
+                                        'cold median ms'))
+    for name, resource_module in (('resources.rcc', False),
+                                  ('resources.py', True)):
+        medians = [statistics.median(
+            time_to_first_paint(resource_module, cold)
+            for _ in range(runs)) * 1000 for cold in (False, True)]
+        print('{:<18} {:>14.1f} {:>14.1f}'.format(name, *medians))
+
+
+if __name__ == '__main__':
+    main()
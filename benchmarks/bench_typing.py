@@ -0,0 +1,123 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Benchmark the per-keystroke latency of typing a long task name.
+
+The task name line edit is compared with a line edit rewriting its whole
+text on every change, as it used to.
+
+Usage: python3 benchmarks/bench_typing.py [task name length]
+"""
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QMimeData, Qt  # noqa: E402
+from PyQt5.QtTest import QTest  # noqa: E402
+from PyQt5.QtWidgets import QApplication, QCompleter  # noqa: E402
+
+from taskcounter.db import close_database, create_database  # noqa: E402
+from taskcounter.db.model import DB  # noqa: E402
+from taskcounter.db.utility import migrate_database  # noqa: E402
+from taskcounter.gui.lineedit import LineEdit  # noqa: E402
+from taskcounter.model import (CompletionIndex,  # noqa: E402
+                               CompletionModel, SettingModel)
+
+PASTED_LINES = 200
+
+
+class RewritingLineEdit(LineEdit):
+    """Line edit rewriting its whole text on every change."""
+
+    def __init__(self, parent=None):
+        """Construct a rewriting line edit."""
+        super().__init__(parent)
+        self.textChanged.connect(self.__rewrite)
+
+    def insertFromMimeData(self, source):
+        """Insert pasted text as is, then rewrite it."""
+        self.textCursor().insertText(source.text())
+
+    def __rewrite(self):
+        """Rewrite the text on a single line, keeping the cursor."""
+        self.blockSignals(True)
+        cursor_position = self.textCursor().position()
+        origin = self.toPlainText()
+        whitespaces = len(origin) - len(origin.lstrip())
+        self.setPlainText(' '.join(origin.splitlines()).lstrip())
+        cursor = self.textCursor()
+        cursor.setPosition(max(cursor_position - whitespaces, 0))
+        self.setTextCursor(cursor)
+        self.ensureCursorVisible()
+        self.blockSignals(False)
+
+
+def bench_line_edit(line_edit_class, model, length):
+    """Return the keystroke timings and the paste time of a line edit."""
+    editor = line_edit_class()
+    editor.set_completer(QCompleter(model, editor))
+    editor.show()
+    text = ('Write the documentation of the release ' * length)[:length]
+    timings = []
+    for character in text:
+        start = time.perf_counter()
+        QTest.keyClick(editor, character)
+        timings.append(time.perf_counter() - start)
+    editor.completer.popup().hide()
+
+    pasted = QMimeData()
+    pasted.setText('\n'.join([text] * PASTED_LINES))
+    start = time.perf_counter()
+    editor.insertFromMimeData(pasted)
+    paste_time = time.perf_counter() - start
+    assert '\n' not in editor.toPlainText()
+    editor.close()
+    return timings, paste_time
+
+
+def main():
+    """Run the benchmark for both line edits."""
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    app = QApplication([sys.argv[0], '-platform', 'offscreen'])
+    app.setAttribute(Qt.AA_Use96Dpi)
+    DB.init(':memory:')
+    create_database()
+    migrate_database()
+    SettingModel.load_cache()
+
+    model = CompletionModel()
+    model.set_index(CompletionIndex(
+        ('Write task {}'.format(i), i % 7 + 1, None) for i in range(5000)))
+
+    print('{:<12} {:>14} {:>14} {:>10}'.format(
+        'line edit', 'median ms/key', 'p99 ms/key', 'paste ms'))
+    for name, line_edit_class in (('rewriting', RewritingLineEdit),
+                                  ('incremental', LineEdit)):
+        timings, paste_time = bench_line_edit(line_edit_class, model, length)
+        timings.sort()
+        print('{:<12} {:>14.3f} {:>14.3f} {:>10.1f}'.format(
+            name, statistics.median(timings) * 1000,
+            timings[int(len(timings) * 0.99)] * 1000, paste_time * 1000))
+    close_database()
+
+
+if __name__ == '__main__':
+    main()
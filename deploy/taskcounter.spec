@@ -15,7 +15,7 @@ else:
 a = Analysis(['../main.py'],
              pathex=['.'],
              binaries=[],
-             datas=[],
+             datas=[('../taskcounter/resources.rcc', 'taskcounter')],
              hiddenimports=[],
              hookspath=[],
              runtime_hooks=[],
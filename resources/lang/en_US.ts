@@ -34,203 +34,344 @@
         <translation>Third-Party Software Notices</translation>
     </message>
 </context>
+<context>
+    <name>ExportDialog</name>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="158"/>
+        <source>Export</source>
+        <translation>Export</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="47"/>
+        <source>From</source>
+        <translation>From</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="51"/>
+        <source>To</source>
+        <translation>To</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="58"/>
+        <source>Report</source>
+        <translation>Report</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="60"/>
+        <source>Summary</source>
+        <translation>Summary</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="61"/>
+        <source>Tasks</source>
+        <translation>Tasks</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="63"/>
+        <source>Format</source>
+        <translation>Format</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="69"/>
+        <source>Copy</source>
+        <translation>Copy</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="71"/>
+        <source>Save...</source>
+        <translation>Save...</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="146"/>
+        <source>Save report</source>
+        <translation>Save report</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="158"/>
+        <source>Unable to save the report: {}</source>
+        <translation>Unable to save the report: {}</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="109"/>
+        <source>Date</source>
+        <translation>Date</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="111"/>
+        <source>Task</source>
+        <translation>Task</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="109"/>
+        <source>Start Time</source>
+        <translation>Start Time</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="109"/>
+        <source>End Time</source>
+        <translation>End Time</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="111"/>
+        <source>Time</source>
+        <translation>Time</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="111"/>
+        <source>Decimal Time</source>
+        <translation>Decimal Time</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="111"/>
+        <source>Man Day</source>
+        <translation>Man Day</translation>
+    </message>
+</context>
 <context>
     <name>MainWindow</name>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="192"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="210"/>
         <source>Year</source>
         <translation>Year</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="204"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="222"/>
         <source>Week</source>
         <translation>Week</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="255"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="272"/>
         <source>Week time</source>
         <translation>Week time</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="228"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="246"/>
         <source>Man day time</source>
         <translation>Man day time</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="243"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="260"/>
         <source>Week summary</source>
         <translation>Week summary</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="261"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="278"/>
         <source>Day time</source>
         <translation>Day time</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="265"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="282"/>
         <source>Catch-up time</source>
         <translation>Catch-up time</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="321"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="338"/>
         <source>Task counter</source>
         <translation>Task counter</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="387"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="443"/>
         <source>Go to {day}</source>
         <translation>Go to {day}</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="393"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="449"/>
         <source>Previous Week</source>
         <translation>Previous Week</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="397"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="453"/>
         <source>Go to Previous Week</source>
         <translation>Go to Previous Week</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="399"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="455"/>
         <source>Next Week</source>
         <translation>Next Week</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="402"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="458"/>
         <source>Go to Next Week</source>
         <translation>Go to Next Week</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="404"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="460"/>
         <source>Today</source>
         <translation>Today</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="407"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="463"/>
         <source>Go to today</source>
         <translation>Go to today</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="409"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="465"/>
         <source>About</source>
         <translation>About</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="411"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="467"/>
         <source>About this application</source>
         <translation>About this application</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="415"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="476"/>
         <source>About Qt</source>
         <translation>About Qt</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="417"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="478"/>
         <source>Preferences</source>
         <translation>Preferences</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="420"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="481"/>
         <source>Edit preferences</source>
         <translation>Edit preferences</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="422"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="483"/>
         <source>&amp;Quit</source>
         <translation>&amp;Quit</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="424"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="485"/>
         <source>Quit application</source>
         <translation>Quit application</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="427"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="488"/>
         <source>Export</source>
         <translation>Export</translation>
     </message>
     <message>
         <location filename="../../taskcounter/gui/mainwindow.py" line="429"/>
         <source>Export week summary as html table</source>
-        <translation>Export week summary as html table</translation>
+        <translation type="obsolete">Export week summary as html table</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="444"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="505"/>
         <source>Application</source>
         <translation>Application</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="450"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="512"/>
         <source>Weeks</source>
         <translation>Weeks</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="456"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="518"/>
         <source>Days</source>
         <translation>Days</translation>
     </message>
     <message>
         <location filename="../../taskcounter/gui/mainwindow.py" line="702"/>
         <source>Task</source>
-        <translation>Task</translation>
+        <translation type="obsolete">Task</translation>
     </message>
     <message>
         <location filename="../../taskcounter/gui/mainwindow.py" line="706"/>
         <source>Time</source>
-        <translation>Time</translation>
+        <translation type="obsolete">Time</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="368"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="424"/>
         <source>Monday</source>
         <translation>Monday</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="370"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="426"/>
         <source>Tuesday</source>
         <translation>Tuesday</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="372"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="428"/>
         <source>Wednesday</source>
         <translation>Wednesday</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="374"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="430"/>
         <source>Thursday</source>
         <translation>Thursday</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="376"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="432"/>
         <source>Friday</source>
         <translation>Friday</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="378"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="434"/>
         <source>Saturday</source>
         <translation>Saturday</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="380"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="436"/>
         <source>Sunday</source>
         <translation>Sunday</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="258"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="275"/>
         <source>Remaining week time</source>
         <translation>Remaining week time</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="268"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="285"/>
         <source>Total annual time</source>
         <translation>Total annual time</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="244"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="261"/>
         <source>Daily summary</source>
         <translation>Daily summary</translation>
     </message>
+    <message>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="371"/>
+        <source>Loading totals...</source>
+        <translation>Loading totals...</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="469"/>
+        <source>Performance</source>
+        <translation>Performance</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="471"/>
+        <source>Show the database statements of each action</source>
+        <translation>Show the database statements of each action</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="490"/>
+        <source>Export a report of a period</source>
+        <translation>Export a report of a period</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="677"/>
+        <source>This time overlaps another task</source>
+        <translation>This time overlaps another task</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="687"/>
+        <source>Unable to save the last changes</source>
+        <translation>Unable to save the last changes</translation>
+    </message>
+</context>
+<context>
+    <name>PerformanceDialog</name>
+    <message>
+        <location filename="../../taskcounter/gui/performancedialog.py" line="40"/>
+        <source>Performance</source>
+        <translation>Performance</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/performancedialog.py" line="55"/>
+        <source>Refresh</source>
+        <translation>Refresh</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/performancedialog.py" line="56"/>
+        <source>Reset</source>
+        <translation>Reset</translation>
+    </message>
 </context>
 <context>
     <name>SettingDialog</name>
@@ -270,12 +411,12 @@
         <translation>Current cell color</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/settingdialog.py" line="131"/>
+        <location filename="../../taskcounter/gui/settingdialog.py" line="132"/>
         <source>Select invalid color</source>
         <translation>Select invalid color</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/settingdialog.py" line="145"/>
+        <location filename="../../taskcounter/gui/settingdialog.py" line="147"/>
         <source>Select current cell color</source>
         <translation>Select current cell color</translation>
     </message>
@@ -34,203 +34,344 @@
         <translation>Avis relatifs aux logiciels tiers</translation>
     </message>
 </context>
+<context>
+    <name>ExportDialog</name>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="158"/>
+        <source>Export</source>
+        <translation>Exporter</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="47"/>
+        <source>From</source>
+        <translation>Du</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="51"/>
+        <source>To</source>
+        <translation>Au</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="58"/>
+        <source>Report</source>
+        <translation>Rapport</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="60"/>
+        <source>Summary</source>
+        <translation>Résumé</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="61"/>
+        <source>Tasks</source>
+        <translation>Tâches</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="63"/>
+        <source>Format</source>
+        <translation>Format</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="69"/>
+        <source>Copy</source>
+        <translation>Copier</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="71"/>
+        <source>Save...</source>
+        <translation>Enregistrer...</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="146"/>
+        <source>Save report</source>
+        <translation>Enregistrer le rapport</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="158"/>
+        <source>Unable to save the report: {}</source>
+        <translation>Impossible d'enregistrer le rapport : {}</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="109"/>
+        <source>Date</source>
+        <translation>Date</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="111"/>
+        <source>Task</source>
+        <translation>Tâche</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="109"/>
+        <source>Start Time</source>
+        <translation>Heure de début</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="109"/>
+        <source>End Time</source>
+        <translation>Heure de fin</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="111"/>
+        <source>Time</source>
+        <translation>Temps</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="111"/>
+        <source>Decimal Time</source>
+        <translation>Temps décimal</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/exportdialog.py" line="111"/>
+        <source>Man Day</source>
+        <translation>Jour homme</translation>
+    </message>
+</context>
 <context>
     <name>MainWindow</name>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="192"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="210"/>
         <source>Year</source>
         <translation>Année</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="204"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="222"/>
         <source>Week</source>
         <translation>Semaine</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="255"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="272"/>
         <source>Week time</source>
         <translation>Temps de la semaine</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="228"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="246"/>
         <source>Man day time</source>
         <translation>Temps de jour homme</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="243"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="260"/>
         <source>Week summary</source>
         <translation>Résumé de la semaine</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="261"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="278"/>
         <source>Day time</source>
         <translation>Temps du jour</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="265"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="282"/>
         <source>Catch-up time</source>
         <translation>Temps de rattrapage</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="321"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="338"/>
         <source>Task counter</source>
         <translation>Compteur de tâches</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="387"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="443"/>
         <source>Go to {day}</source>
         <translation>Aller à {day}</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="393"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="449"/>
         <source>Previous Week</source>
         <translation>Semaine précédente</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="397"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="453"/>
         <source>Go to Previous Week</source>
         <translation>Aller à la semaine précédente</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="399"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="455"/>
         <source>Next Week</source>
         <translation>Semaine prochaine</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="402"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="458"/>
         <source>Go to Next Week</source>
         <translation>Aller à la semaine prochaine</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="404"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="460"/>
         <source>Today</source>
         <translation>Aujourd'hui</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="407"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="463"/>
         <source>Go to today</source>
         <translation>Aller à aujourd'hui</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="409"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="465"/>
         <source>About</source>
         <translation>À propos</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="411"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="467"/>
         <source>About this application</source>
         <translation>À propos de cette application</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="415"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="476"/>
         <source>About Qt</source>
         <translation>À propos de Qt</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="417"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="478"/>
         <source>Preferences</source>
         <translation>Préférences</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="420"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="481"/>
         <source>Edit preferences</source>
         <translation>Modifier les préférences</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="422"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="483"/>
         <source>&amp;Quit</source>
         <translation>&amp;Quitter</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="424"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="485"/>
         <source>Quit application</source>
         <translation>Quitter l'application</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="427"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="488"/>
         <source>Export</source>
         <translation>Exporter</translation>
     </message>
     <message>
         <location filename="../../taskcounter/gui/mainwindow.py" line="429"/>
         <source>Export week summary as html table</source>
-        <translation>Exporter le résumé de la semaine en tant que tableau html</translation>
+        <translation type="obsolete">Exporter le résumé de la semaine en tant que tableau html</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="444"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="505"/>
         <source>Application</source>
         <translation>Application</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="450"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="512"/>
         <source>Weeks</source>
         <translation>Semaines</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="456"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="518"/>
         <source>Days</source>
         <translation>Jours</translation>
     </message>
     <message>
         <location filename="../../taskcounter/gui/mainwindow.py" line="702"/>
         <source>Task</source>
-        <translation>Tâche</translation>
+        <translation type="obsolete">Tâche</translation>
     </message>
     <message>
         <location filename="../../taskcounter/gui/mainwindow.py" line="706"/>
         <source>Time</source>
-        <translation>Temps</translation>
+        <translation type="obsolete">Temps</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="368"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="424"/>
         <source>Monday</source>
         <translation>Lundi</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="370"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="426"/>
         <source>Tuesday</source>
         <translation>Mardi</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="372"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="428"/>
         <source>Wednesday</source>
         <translation>Mercredi</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="374"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="430"/>
         <source>Thursday</source>
         <translation>Jeudi</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="376"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="432"/>
         <source>Friday</source>
         <translation>Vendredi</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="378"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="434"/>
         <source>Saturday</source>
         <translation>Samedi</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="380"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="436"/>
         <source>Sunday</source>
         <translation>Dimanche</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="258"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="275"/>
         <source>Remaining week time</source>
         <translation>Temps restant de la semaine</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="268"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="285"/>
         <source>Total annual time</source>
         <translation>Temps total annuel</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/mainwindow.py" line="244"/>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="261"/>
         <source>Daily summary</source>
         <translation>Résumé du jour</translation>
     </message>
+    <message>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="371"/>
+        <source>Loading totals...</source>
+        <translation>Chargement des totaux...</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="469"/>
+        <source>Performance</source>
+        <translation>Performances</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="471"/>
+        <source>Show the database statements of each action</source>
+        <translation>Afficher les requêtes de la base de données de chaque action</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="490"/>
+        <source>Export a report of a period</source>
+        <translation>Exporter un rapport d'une période</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="677"/>
+        <source>This time overlaps another task</source>
+        <translation>Cet horaire chevauche une autre tâche</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/mainwindow.py" line="687"/>
+        <source>Unable to save the last changes</source>
+        <translation>Impossible d'enregistrer les dernières modifications</translation>
+    </message>
+</context>
+<context>
+    <name>PerformanceDialog</name>
+    <message>
+        <location filename="../../taskcounter/gui/performancedialog.py" line="40"/>
+        <source>Performance</source>
+        <translation>Performances</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/performancedialog.py" line="55"/>
+        <source>Refresh</source>
+        <translation>Actualiser</translation>
+    </message>
+    <message>
+        <location filename="../../taskcounter/gui/performancedialog.py" line="56"/>
+        <source>Reset</source>
+        <translation>Réinitialiser</translation>
+    </message>
 </context>
 <context>
     <name>SettingDialog</name>
@@ -270,12 +411,12 @@
         <translation>Couleur de la cellule courante</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/settingdialog.py" line="131"/>
+        <location filename="../../taskcounter/gui/settingdialog.py" line="132"/>
         <source>Select invalid color</source>
         <translation>Selectionner la couleur invalide</translation>
     </message>
     <message>
-        <location filename="../../taskcounter/gui/settingdialog.py" line="145"/>
+        <location filename="../../taskcounter/gui/settingdialog.py" line="147"/>
         <source>Select current cell color</source>
         <translation>Selectionner la couleur de la cellule courante</translation>
     </message>
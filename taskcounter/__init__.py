@@ -39,10 +39,18 @@ rotate_handler = RotatingFileHandler(filename=log_file, mode='a',
                                      backupCount=9, maxBytes=1000000,
                                      encoding='utf-8')
 
+# environment variable enabling the debug logs.
+DEBUG_VARIABLE = 'TASKCOUNTER_DEBUG'
+
+# read once, hot paths format their debug logs only if enabled.
+DEBUG = bool(os.environ.get(DEBUG_VARIABLE))
+
+log_level = logging.DEBUG if DEBUG else logging.INFO
+
 rotate_handler.setFormatter(formatter)
-rotate_handler.setLevel(logging.INFO)
+rotate_handler.setLevel(log_level)
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
+logger.setLevel(log_level)
 logger.addHandler(rotate_handler)
 logger.info('Initialize logger')
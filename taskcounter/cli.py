@@ -0,0 +1,158 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter command line interface, reporting without Qt."""
+
+import argparse
+import logging
+import os
+import sys
+from datetime import date
+
+from peewee import DatabaseError
+
+from taskcounter.db import DB, Week
+from taskcounter.export import (SUMMARY_COLUMNS, WRITERS, summary_table_rows,
+                                writer_for)
+from taskcounter.model import (SettingModel, get_annual_summary,
+                               get_daily_summary,
+                               get_total_annual_worked_hours,
+                               get_week_summary)
+from taskcounter.weekcalendar import iso_weeks_for_year, week_of_date
+
+logger = logging.getLogger(__name__)
+
+
+def man_day_minutes(text):
+    """Get the minutes of a hh:mm man day time argument."""
+    try:
+        hours, minutes = (int(part) for part in text.split(':'))
+    except ValueError:
+        hours, minutes = -1, 0
+    if hours < 0 or not 0 <= minutes < 60:
+        raise argparse.ArgumentTypeError(
+            'invalid man day time: {!r}, expected hh:mm'.format(text))
+    return hours * 60 + minutes
+
+
+def iso_date(text):
+    """Get the date of a yyyy-mm-dd date argument."""
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            'invalid date: {!r}, expected yyyy-mm-dd'.format(text)) from None
+
+
+def build_parser():
+    """Build the parser of the command line arguments."""
+    current_year, _ = week_of_date(date.today())
+
+    parser = argparse.ArgumentParser(
+        prog='taskcounter',
+        description='Report the time counted by task counter, without '
+                    'starting the user interface.')
+    parser.add_argument('--database', default=DB.database,
+                        help='database file, %(default)s by default')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    report = commands.add_parser(
+        'report', help='write the summary of the tasks of a week, a date or '
+                       'a year')
+    report.add_argument('--year', type=int, default=current_year,
+                        help='year of the summary, the current year by '
+                             'default')
+    period = report.add_mutually_exclusive_group()
+    period.add_argument('--week', type=int,
+                        help='week number of the summary, the whole year if '
+                             'not given')
+    period.add_argument('--date', type=iso_date,
+                        help='date of the summary, yyyy-mm-dd')
+    report.add_argument('--format', choices=sorted(WRITERS), default='csv',
+                        help='output format, %(default)s by default')
+    report.add_argument('--man-day', type=man_day_minutes,
+                        help='man day time, hh:mm, the default man day time '
+                             'setting by default')
+    report.add_argument('--output',
+                        help='file to write, the standard output by default')
+
+    hours = commands.add_parser('hours',
+                                help='print the hours worked in a year')
+    hours.add_argument('--year', type=int, default=current_year,
+                       help='year, the current year by default')
+    return parser
+
+
+def summary(args, man_day):
+    """Get the summary of the period of the arguments."""
+    if args.date is not None:
+        return get_daily_summary(args.date, man_day)
+    if args.week is not None:
+        week = Week.get_or_none((Week.year == args.year)
+                                & (Week.week_number == args.week))
+        return get_week_summary(week, man_day) if week else {}
+    return get_annual_summary(args.year, man_day)
+
+
+def write_report(args, stream):
+    """Write the summary of the arguments to a text stream."""
+    if args.man_day is not None:
+        man_day = args.man_day
+    else:
+        man_day = SettingModel.default_man_day_minutes()
+    writer = writer_for(args.format, stream)
+    return writer.write(SUMMARY_COLUMNS,
+                        summary_table_rows(summary(args, man_day)))
+
+
+def main(argv=None):
+    """Run a command, return the exit status."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if (args.command == 'report' and args.week is not None
+            and not 1 <= args.week <= iso_weeks_for_year(args.year)):
+        parser.error('week {} is not a week of {}'.format(args.week,
+                                                          args.year))
+    # connecting would create an empty database.
+    if not os.path.isfile(args.database):
+        parser.error('no database: {}'.format(args.database))
+
+    logger.info('Run command: %s', args.command)
+    DB.init(args.database)
+    try:
+        DB.connect()
+        if args.command == 'hours':
+            print(get_total_annual_worked_hours(args.year))
+        elif args.output:
+            with open(args.output, 'w', encoding='utf-8',
+                      newline='') as stream:
+                write_report(args, stream)
+        else:
+            write_report(args, sys.stdout)
+            sys.stdout.flush()
+    except BrokenPipeError:
+        # the reader of the output exited, like head, silence the final flush.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (DatabaseError, OSError) as error:
+        logger.error('Unable to run command: %s', args.command,
+                     exc_info=True)
+        print('taskcounter: {}'.format(error), file=sys.stderr)
+        return 1
+    finally:
+        DB.close()
+    return 0
@@ -17,8 +17,10 @@
 
 """Task counter db module init."""
 
-from peewee import SQL, IntegrityError, fn
+from peewee import SQL, DatabaseError, IntegrityError, fn
 
+from .instrumentation import instrumented
+from .model import DB
 from .day import Day
 from .setting import Setting
 from .task import Task
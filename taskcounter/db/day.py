@@ -29,6 +29,14 @@ class Day(BaseModel):
     date = DateField(unique=True)
     week = ForeignKeyField(Week, related_name='days')
 
+    class Meta:
+        """Meta class."""
+
+        # covering index to find the days of a week.
+        indexes = (
+            (('week', 'date'), False),
+        )
+
     def __str__(self):
         """Get string representation."""
         return 'Day: {}'.format(self.date)
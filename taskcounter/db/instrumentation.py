@@ -0,0 +1,145 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter query instrumentation."""
+
+import logging
+import threading
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from functools import wraps
+
+NO_ACTION = '(no action)'
+
+SlowQuery = namedtuple('SlowQuery', ['action', 'sql', 'seconds'])
+
+
+class ActionStats:
+    """Statement count and time of an action, in total and per statement."""
+
+    def __init__(self):
+        """Construct empty action statistics."""
+        self.calls = 0
+        self.statements = 0
+        self.seconds = 0
+        # sql: [count, seconds]
+        self.queries = {}
+
+
+class QueryInstrumentation:
+    """Time every SQL statement, grouped by the action that executed it.
+
+    An action is the outermost function decorated with instrumented, such as
+    the slot of a user interface event, on the current thread.
+    """
+
+    # statements taking at least this time are logged as slow.
+    DEFAULT_SLOW_THRESHOLD = 0.05
+
+    def __init__(self, slow_threshold=DEFAULT_SLOW_THRESHOLD,
+                 slow_capacity=50):
+        """Construct a query instrumentation."""
+        self.slow_threshold = slow_threshold
+        self._slow_capacity = slow_capacity
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.actions = {}
+        self.slow_queries = deque(maxlen=slow_capacity)
+
+    def __actions(self):
+        """Get the stack of actions of the current thread."""
+        try:
+            return self._local.actions
+        except AttributeError:
+            self._local.actions = []
+            return self._local.actions
+
+    @contextmanager
+    def action(self, name):
+        """Group the statements of the block of a with statement."""
+        actions = self.__actions()
+        actions.append(name)
+        if len(actions) == 1:
+            with self._lock:
+                self.actions.setdefault(name, ActionStats()).calls += 1
+        try:
+            yield
+        finally:
+            actions.pop()
+
+    def record(self, sql, seconds):
+        """Record the time of a statement, for the current action."""
+        actions = self.__actions()
+        action = actions[0] if actions else NO_ACTION
+        with self._lock:
+            stats = self.actions.setdefault(action, ActionStats())
+            stats.statements += 1
+            stats.seconds += seconds
+            query = stats.queries.setdefault(sql, [0, 0])
+            query[0] += 1
+            query[1] += seconds
+            if seconds >= self.slow_threshold:
+                self.slow_queries.append(SlowQuery(action, sql, seconds))
+        if seconds >= self.slow_threshold:
+            logger = logging.getLogger(__name__)
+            logger.warning('Slow query in %s (%.1f ms): %s', action,
+                           seconds * 1000, sql)
+
+    def reset(self):
+        """Forget all the recorded statements."""
+        with self._lock:
+            self.actions = {}
+            self.slow_queries = deque(maxlen=self._slow_capacity)
+
+    def report(self, statements_per_action=5):
+        """Get a report of the actions, slowest first, and slow queries."""
+        lines = []
+        with self._lock:
+            for name, stats in sorted(self.actions.items(),
+                                      key=lambda item: -item[1].seconds):
+                lines.append('{}: {} calls, {} statements, {:.1f} ms'.format(
+                    name, stats.calls, stats.statements,
+                    stats.seconds * 1000))
+                # repeated statements of an action hint at N+1 queries.
+                for sql, (count, seconds) in sorted(
+                        stats.queries.items(),
+                        key=lambda item: -item[1][1]
+                )[:statements_per_action]:
+                    lines.append('    {:>5} x {:>8.1f} ms  {}'.format(
+                        count, seconds * 1000, ' '.join(sql.split())[:120]))
+
+            lines.append('')
+            lines.append('Slow queries (>= {:.1f} ms): {}'.format(
+                self.slow_threshold * 1000, len(self.slow_queries)))
+            for slow_query in self.slow_queries:
+                lines.append('    {:>8.1f} ms  {}  {}'.format(
+                    slow_query.seconds * 1000, slow_query.action,
+                    ' '.join(slow_query.sql.split())[:120]))
+        return '\n'.join(lines)
+
+
+INSTRUMENTATION = QueryInstrumentation()
+
+
+def instrumented(function):
+    """Decorate a function so that it is an action of the instrumentation."""
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        """Run the function as an action."""
+        with INSTRUMENTATION.action(function.__qualname__):
+            return function(*args, **kwargs)
+    return wrapper
@@ -17,13 +17,79 @@
 
 """Task counter base database model."""
 
+import threading
+import time
 from os import path
 
 from peewee import Model, SqliteDatabase
 
 from taskcounter import taskcounter_dir
 
-DB = SqliteDatabase(path.join(taskcounter_dir, 'taskcounter.db'))
+from .instrumentation import INSTRUMENTATION
+
+
+class InstrumentedSqliteDatabase(SqliteDatabase):
+    """SQLite database counting and timing the statements it executes."""
+
+    def __init__(self, *args, **kwargs):
+        """Construct a database."""
+        super().__init__(*args, **kwargs)
+        # each thread counts its own statements, without lock.
+        self._statement_counts = threading.local()
+        self.instrumentation = INSTRUMENTATION
+
+    @property
+    def statement_count(self):
+        """Get the number of statements executed by the current thread."""
+        return getattr(self._statement_counts, 'count', 0)
+
+    def execute_sql(self, sql, *args, **kwargs):
+        """Execute a SQL statement, count and time it."""
+        self._statement_counts.count = self.statement_count + 1
+        start = time.perf_counter()
+        try:
+            return super().execute_sql(sql, *args, **kwargs)
+        finally:
+            self.instrumentation.record(sql, time.perf_counter() - start)
+
+
+DB = InstrumentedSqliteDatabase(path.join(taskcounter_dir,
+                                          'taskcounter.db'))
+
+# environment variable overriding the pragma profile setting.
+PRAGMA_PROFILE_VARIABLE = 'TASKCOUNTER_DB_PROFILE'
+
+DEFAULT_PRAGMA_PROFILE = 'balanced'
+
+# safe: rollback journal and full fsync on every commit, SQLite defaults.
+# balanced: write-ahead log, fsync only on checkpoints, larger caches.
+# fast: like balanced, without fsync, a power loss may lose last commits.
+PRAGMA_PROFILES = {
+    'safe': (
+        ('journal_mode', 'delete'),
+        ('synchronous', 'full'),
+        ('cache_size', -2000),
+        ('mmap_size', 0),
+        ('temp_store', 'default'),
+        ('foreign_keys', 1),
+    ),
+    'balanced': (
+        ('journal_mode', 'wal'),
+        ('synchronous', 'normal'),
+        ('cache_size', -16000),
+        ('mmap_size', 64 * 1024 * 1024),
+        ('temp_store', 'memory'),
+        ('foreign_keys', 1),
+    ),
+    'fast': (
+        ('journal_mode', 'wal'),
+        ('synchronous', 'off'),
+        ('cache_size', -64000),
+        ('mmap_size', 256 * 1024 * 1024),
+        ('temp_store', 'memory'),
+        ('foreign_keys', 1),
+    ),
+}
 
 
 class BaseModel(Model):
@@ -17,7 +17,8 @@
 
 """Task counter task database model."""
 
-from peewee import CharField, Check, ForeignKeyField, TimeField
+from peewee import (CharField, Check, ForeignKeyField, IntegerField,
+                    TimeField)
 
 from .day import Day
 from .model import BaseModel
@@ -50,12 +51,18 @@ class Task(BaseModel):
     start_time = TimeField(null=True)
     end_time = TimeField(null=True)
     day = ForeignKeyField(Day, related_name='tasks')
+    # duration in seconds, kept in sync with start and end times by triggers.
+    duration = IntegerField(null=True)
 
     class Meta:
         """Meta class."""
         table_name = "task"
         constraints = [Check("start_time is NULL or start_time LIKE '__:__:__'"),
                        Check("end_time is NULL or end_time LIKE '__:__:__'")]
+        # covering index of summaries, grouped by name for days of a week.
+        indexes = (
+            (('day', 'name', 'duration'), False),
+        )
 
     def __str__(self):
         """Get string representation."""
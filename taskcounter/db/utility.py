@@ -18,14 +18,19 @@
 """Task counter utility functions."""
 
 import logging
+import os
 import sys
 
-from .model import DB
+from peewee import IntegerField
+
+from .model import (DB, DEFAULT_PRAGMA_PROFILE, PRAGMA_PROFILE_VARIABLE,
+                    PRAGMA_PROFILES)
 from .day import Day
 from .setting import Setting
 from .task import Task, TaskOld
 from .version import Version
 from .week import Week
+from ..model.settingmodel import SettingModel
 from ..model.versionmodel import VersionModel
 
 
@@ -36,6 +41,27 @@ def create_database():
     DB.connect()
     logger.info('Create tables Week, Day, Task, Setting if necessary')
     DB.create_tables([Week, Day, TaskOld, Setting], safe=True)
+    apply_pragma_profile(pragma_profile())
+
+
+def pragma_profile():
+    """Get the pragma profile name, from the environment or the settings."""
+    logger = logging.getLogger(__name__)
+    profile = (os.environ.get(PRAGMA_PROFILE_VARIABLE)
+               or SettingModel.database_profile())
+    if profile not in PRAGMA_PROFILES:
+        logger.warning('Unknown pragma profile: %s', profile)
+        profile = DEFAULT_PRAGMA_PROFILE
+    return profile
+
+
+def apply_pragma_profile(profile):
+    """Apply the pragmas of a profile, also on later connections."""
+    logger = logging.getLogger(__name__)
+    logger.info('Apply pragma profile: %s', profile)
+    for key, value in PRAGMA_PROFILES[profile]:
+        result = DB.pragma(key, value, permanent=True)
+        logger.info('Pragma %s = %s: %s', key, value, result)
 
 
 def migrate_database():
@@ -47,11 +73,14 @@ def migrate_database():
     DB.create_tables([Version], safe=True)
 
     logger.info('Check migrations')
-    current_version = VersionModel.get_current_version()
-    if current_version is None:
-        if migrate_to_version_1():
-            next_version = 1
-            update_ok = VersionModel.set_current_version(next_version)
+    current_version = VersionModel.get_current_version() or 0
+    migrations = (migrate_to_version_1, migrate_to_version_2,
+                  migrate_to_version_3)
+    for next_version, migration in enumerate(migrations, start=1):
+        if current_version < next_version:
+            with DB.atomic():
+                update_ok = (migration() and
+                             VersionModel.set_current_version(next_version))
             if update_ok:
                 logger.info('Database migrated to version: %s', next_version)
             else:
@@ -96,6 +125,65 @@ def migrate_to_version_1():
     return True
 
 
+def migrate_to_version_2():
+    """Store the duration of tasks in seconds, to sum integers instead of
+    parsing times. Triggers keep the duration in sync on write."""
+    logger = logging.getLogger(__name__)
+    logger.info('Migrate to version 2')
+
+    # a new database already has the column, created by version 1.
+    if 'duration' not in [column.name for column in DB.get_columns('task')]:
+        logger.info('Add column duration to table task')
+        # imported by migrations only, it imports every playhouse database.
+        from playhouse.migrate import SqliteMigrator, migrate
+        migrator = SqliteMigrator(DB)
+        migrate(migrator.add_column('task', 'duration',
+                                    IntegerField(null=True)))
+
+    duration = ("strftime('%s', NEW.end_time) "
+                "- strftime('%s', NEW.start_time)")
+
+    logger.info('Create triggers to compute task duration')
+    DB.execute_sql('CREATE TRIGGER IF NOT EXISTS task_duration_insert '
+                   'AFTER INSERT ON task '
+                   'BEGIN UPDATE task SET duration = {} '
+                   'WHERE id = NEW.id; END'.format(duration))
+    DB.execute_sql('CREATE TRIGGER IF NOT EXISTS task_duration_update '
+                   'AFTER UPDATE OF start_time, end_time ON task '
+                   'BEGIN UPDATE task SET duration = {} '
+                   'WHERE id = NEW.id; END'.format(duration))
+
+    logger.info('Compute duration of existing tasks')
+    DB.execute_sql("UPDATE task SET duration = strftime('%s', end_time) "
+                   "- strftime('%s', start_time)")
+
+    return True
+
+
+def migrate_to_version_3():
+    """Add covering indexes matching the summary queries."""
+    logger = logging.getLogger(__name__)
+    logger.info('Migrate to version 3')
+
+    from playhouse.migrate import SqliteMigrator, migrate
+    migrator = SqliteMigrator(DB)
+    for table, columns in (('task', ('day_id', 'name', 'duration')),
+                           ('day', ('week_id', 'date'))):
+        name = '_'.join((table,) + columns)
+        # a new database already has the indexes, declared on models.
+        if name not in [index.name for index in DB.get_indexes(table)]:
+            logger.info('Create index %s', name)
+            migrate(migrator.add_index(table, columns, False))
+
+    return True
+
+
+def explain_query_plan(sql, params=None):
+    """Get the details of the query plan of a SQL statement."""
+    cursor = DB.execute_sql('EXPLAIN QUERY PLAN ' + sql, params)
+    return [row[-1] for row in cursor.fetchall()]
+
+
 def close_database():
     """Close the database."""
     logger = logging.getLogger(__name__)
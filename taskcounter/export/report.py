@@ -0,0 +1,120 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter export reports, streamed from the database."""
+
+import logging
+
+from taskcounter.db import Day, Task
+from taskcounter.enum import ResultColumn, TaskColumn
+from taskcounter.model import summary_query, summary_task
+from taskcounter.utility import (minutes_to_decimal_time_str,
+                                 minutes_to_time_str)
+
+from .writer import writer_for
+
+logger = logging.getLogger(__name__)
+
+SUMMARY = 'summary'
+TASKS = 'tasks'
+
+REPORTS = (SUMMARY, TASKS)
+
+# the untranslated titles of the summary and task tables headers, the
+# user interface passes translated titles.
+SUMMARY_COLUMNS = tuple(column.name.replace('_', ' ')
+                        for column in ResultColumn)
+TASKS_COLUMNS = (('Date',)
+                 + tuple(column.name.replace('_', ' ')
+                         for column in TaskColumn if column != TaskColumn.Id)
+                 + ('Time',))
+
+
+def _time_str(time_):
+    """Get a hh:mm string from a stored hh:mm:ss time, empty if None."""
+    return time_[:5] if time_ is not None else ''
+
+
+def _summary_row(task):
+    """Get a row of the summary report from the summary of a task name."""
+    return (task[ResultColumn.Task],
+            minutes_to_time_str(task[ResultColumn.Time]),
+            minutes_to_decimal_time_str(task[ResultColumn.Decimal_Time]),
+            task[ResultColumn.Man_Day])
+
+
+def summary_rows(start_date, end_date, man_day_minutes=0):
+    """Yield the task name, time, decimal time and man days of each task name
+    between two dates included, most time first."""
+    query = summary_query(Day.date.between(start_date, end_date))
+    # rows are fetched from the cursor one by one, not cached by peewee.
+    for name, minutes in query.iterator():
+        yield _summary_row(summary_task(man_day_minutes, name, minutes))
+
+
+def summary_table_rows(tasks):
+    """Yield the rows of the summary report from a summary, as built by
+    summary_from_rows."""
+    for task in tasks.values():
+        yield _summary_row(task)
+
+
+def task_rows(start_date, end_date):
+    """Yield the date, name, start time, end time and time of each task
+    between two dates included, in chronological order."""
+    # dates and times are read as stored, in iso format, parsing them costs
+    # more than the rest of the export.
+    query = (Task.select(Day.date.coerce(False), Task.name,
+                         Task.start_time.coerce(False),
+                         Task.end_time.coerce(False), Task.duration)
+             .join(Day)
+             .where(Day.date.between(start_date, end_date))
+             .order_by(Day.date, Task.start_time.is_null(),
+                       Task.start_time, Task.id)
+             .tuples())
+    for date_, name, start_time, end_time, duration in query.iterator():
+        time_ = minutes_to_time_str(duration / 60) if duration else ''
+        yield (date_, name, _time_str(start_time),
+               _time_str(end_time), time_)
+
+
+def report_rows(report, start_date, end_date, man_day_minutes=0):
+    """Get the default column titles and the rows of a report."""
+    if report == SUMMARY:
+        return SUMMARY_COLUMNS, summary_rows(start_date, end_date,
+                                             man_day_minutes)
+    if report == TASKS:
+        return TASKS_COLUMNS, task_rows(start_date, end_date)
+    raise ValueError('Unknown report: {}'.format(report))
+
+
+def export(stream, format_, report, start_date, end_date, man_day_minutes=0,
+           columns=None):
+    """Write a report between two dates to a text stream, in a format.
+
+    The rows are written while they are read from the database, so that
+    the memory used does not depend on the length of the period. Column
+    titles default to the untranslated ones. Return the number of rows
+    written.
+    """
+    writer = writer_for(format_, stream)
+    default_columns, rows = report_rows(report, start_date, end_date,
+                                        man_day_minutes)
+    count = writer.write(columns or default_columns, rows)
+    logger.info('Exported %s %s rows from %s to %s as %s', count, report,
+                start_date, end_date, format_)
+    return count
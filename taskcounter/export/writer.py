@@ -0,0 +1,195 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter export writers."""
+
+import csv
+import json
+from abc import ABC, abstractmethod
+from html import escape
+
+HTML_HEAD = ('<html><head>'
+             '<meta http-equiv="content-type" '
+             'content="text/html; charset=utf-8">'
+             '</head><body>\n'
+             '<table cellpadding="0" cellspacing="0" border="0" '
+             'style="width:100%;">\n')
+
+HTML_HEADER_CELL = ('<th style="border:2px solid black;margin:0;padding:2px;'
+                    'text-align:center;background-color:#ddd;">{}</th>')
+
+HTML_FIRST_CELL = ('<td style="border:2px solid black;margin:0;padding:2px;'
+                   'text-align:left;">{}</td>')
+
+HTML_CELL = ('<td style="border:2px solid black;margin:0;padding:2px;'
+             'text-align:center;">{}</td>')
+
+HTML_ROW = '<tr>{}</tr>\n'
+
+HTML_TAIL = '</table></body></html>\n'
+
+
+def _text(value):
+    """Get the text of a cell value, empty if None."""
+    return '' if value is None else str(value)
+
+
+class Writer(ABC):
+    """Write a table, row by row, to a text stream."""
+
+    FORMAT = None
+    TITLE = None
+    EXTENSION = None
+    MIME_TYPE = 'text/plain'
+
+    def __init__(self, stream):
+        """Construct a writer to a text stream."""
+        self.stream = stream
+
+    @abstractmethod
+    def begin(self, columns):
+        """Write the head of the table, from the column titles."""
+
+    @abstractmethod
+    def row(self, values):
+        """Write a row of the table."""
+
+    def end(self):
+        """Write the tail of the table."""
+
+    def write(self, columns, rows):
+        """Write a whole table, return the number of rows written."""
+        self.begin(columns)
+        count = 0
+        for count, values in enumerate(rows, 1):
+            self.row(values)
+        self.end()
+        return count
+
+
+class HtmlWriter(Writer):
+    """Write an html table, styled to be pasted in documents."""
+
+    FORMAT = 'html'
+    TITLE = 'HTML'
+    EXTENSION = 'html'
+    MIME_TYPE = 'text/html'
+
+    def begin(self, columns):
+        """Write the document head and the header row."""
+        self.stream.write(HTML_HEAD)
+        self.stream.write(HTML_ROW.format(''.join(
+            HTML_HEADER_CELL.format(escape(column)) for column in columns)))
+
+    def row(self, values):
+        """Write a row, the first cell aligned left."""
+        first, *others = (escape(_text(value)) for value in values)
+        self.stream.write(HTML_ROW.format(
+            HTML_FIRST_CELL.format(first)
+            + ''.join(HTML_CELL.format(value) for value in others)))
+
+    def end(self):
+        """Write the document tail."""
+        self.stream.write(HTML_TAIL)
+
+
+class CsvWriter(Writer):
+    """Write comma separated values, the stream opened with newline=''."""
+
+    FORMAT = 'csv'
+    TITLE = 'CSV'
+    EXTENSION = 'csv'
+    MIME_TYPE = 'text/csv'
+
+    def __init__(self, stream):
+        """Construct a csv writer to a text stream."""
+        super().__init__(stream)
+        self._writer = csv.writer(stream)
+
+    def begin(self, columns):
+        """Write the header row."""
+        self._writer.writerow(columns)
+
+    def row(self, values):
+        """Write a row."""
+        self._writer.writerow([_text(value) for value in values])
+
+
+class JsonLinesWriter(Writer):
+    """Write a json object per row, keyed by column title."""
+
+    FORMAT = 'jsonl'
+    TITLE = 'JSON Lines'
+    EXTENSION = 'jsonl'
+    MIME_TYPE = 'application/jsonl'
+
+    def __init__(self, stream):
+        """Construct a json lines writer to a text stream."""
+        super().__init__(stream)
+        self._columns = ()
+
+    def begin(self, columns):
+        """Keep the column titles, json lines have no header."""
+        self._columns = tuple(columns)
+
+    def row(self, values):
+        """Write a row as a json object."""
+        self.stream.write(json.dumps(dict(zip(self._columns, values)),
+                                     ensure_ascii=False, default=str))
+        self.stream.write('\n')
+
+
+class MarkdownWriter(Writer):
+    """Write a markdown table."""
+
+    FORMAT = 'markdown'
+    TITLE = 'Markdown'
+    EXTENSION = 'md'
+    MIME_TYPE = 'text/markdown'
+
+    @staticmethod
+    def _cell(value):
+        """Get the text of a cell, pipes and line breaks escaped."""
+        return (_text(value).replace('\\', '\\\\').replace('|', '\\|')
+                .replace('\n', ' '))
+
+    def _line(self, cells):
+        """Write a line of cells."""
+        self.stream.write('| {} |\n'.format(' | '.join(cells)))
+
+    def begin(self, columns):
+        """Write the header row and its separator."""
+        self._line(self._cell(column) for column in columns)
+        self._line('---' for _ in columns)
+
+    def row(self, values):
+        """Write a row."""
+        self._line(self._cell(value) for value in values)
+
+
+# format: writer class.
+WRITERS = {writer.FORMAT: writer for writer in (HtmlWriter, CsvWriter,
+                                                JsonLinesWriter,
+                                                MarkdownWriter)}
+
+
+def writer_for(format_, stream):
+    """Get a writer of a format to a stream, raise ValueError if unknown."""
+    try:
+        return WRITERS[format_](stream)
+    except KeyError:
+        raise ValueError('Unknown export format: {}'.format(format_)) from None
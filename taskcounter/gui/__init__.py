@@ -21,7 +21,10 @@ from .durationedit import DurationEdit
 from .centermixin import CenterMixin
 from .settingdialog import SettingDialog
 from .aboutdialog import AboutDialog
+from .performancedialog import PerformanceDialog
+from .exportdialog import ExportDialog
 from .lineedit import LineEdit
 from .taskdelegate import TaskNameDelegate
 from .flowlayout import FlowLayout
+from .refreshscheduler import RefreshScheduler
 from .mainwindow import MainWindow
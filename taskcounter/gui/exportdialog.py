@@ -0,0 +1,162 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter export dialog."""
+
+import io
+import logging
+
+from PyQt5.QtCore import QMimeData, Qt, pyqtSlot
+from PyQt5.QtGui import QClipboard
+from PyQt5.QtWidgets import (QApplication, QComboBox, QDateEdit, QDialog,
+                             QDialogButtonBox, QFileDialog, QGridLayout,
+                             QLabel, QMessageBox, QPushButton)
+
+from taskcounter.export import SUMMARY, TASKS, WRITERS, export
+
+from .centermixin import CenterMixin
+
+
+class ExportDialog(CenterMixin, QDialog):
+    """Dialog exporting a report of a period to the clipboard or a file."""
+
+    def __init__(self, start_date, end_date, man_day_minutes, parent=None):
+        """Construct an export dialog for a period, by default."""
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self.logger.info('Opening export dialog')
+        self.setWindowTitle(self.tr('Export'))
+        self.center()
+
+        self.man_day_minutes = man_day_minutes
+
+        start_label = QLabel(self.tr('From'), self)
+        self.start_edit = QDateEdit(start_date, self)
+        self.start_edit.setCalendarPopup(True)
+
+        end_label = QLabel(self.tr('To'), self)
+        self.end_edit = QDateEdit(end_date, self)
+        self.end_edit.setCalendarPopup(True)
+        # the period never ends before it starts.
+        self.end_edit.setMinimumDate(self.start_edit.date())
+        self.start_edit.dateChanged.connect(self.end_edit.setMinimumDate)
+
+        report_label = QLabel(self.tr('Report'), self)
+        self.report_combo = QComboBox(self)
+        self.report_combo.addItem(self.tr('Summary'), SUMMARY)
+        self.report_combo.addItem(self.tr('Tasks'), TASKS)
+
+        format_label = QLabel(self.tr('Format'), self)
+        self.format_combo = QComboBox(self)
+        for format_, writer in WRITERS.items():
+            self.format_combo.addItem(writer.TITLE, format_)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        copy_button = QPushButton(self.tr('Copy'), self)
+        copy_button.setDefault(True)
+        save_button = QPushButton(self.tr('Save...'), self)
+        button_box.addButton(copy_button, QDialogButtonBox.ActionRole)
+        button_box.addButton(save_button, QDialogButtonBox.ActionRole)
+        button_box.rejected.connect(self.reject)
+        copy_button.clicked.connect(self.__copy)
+        save_button.clicked.connect(self.__save)
+
+        main_layout = QGridLayout()
+
+        main_layout.addWidget(start_label, 0, 0)
+        main_layout.addWidget(self.start_edit, 0, 1)
+
+        main_layout.addWidget(end_label, 1, 0)
+        main_layout.addWidget(self.end_edit, 1, 1)
+
+        main_layout.addWidget(report_label, 2, 0)
+        main_layout.addWidget(self.report_combo, 2, 1)
+
+        main_layout.addWidget(format_label, 3, 0)
+        main_layout.addWidget(self.format_combo, 3, 1)
+
+        main_layout.addWidget(button_box, 4, 0, 1, 2)
+
+        self.setLayout(main_layout)
+
+    @property
+    def format(self):
+        """Get the selected format."""
+        return self.format_combo.currentData()
+
+    @property
+    def report(self):
+        """Get the selected report."""
+        return self.report_combo.currentData()
+
+    def columns(self):
+        """Get the translated column titles of the selected report."""
+        if self.report == TASKS:
+            return (self.tr('Date'), self.tr('Task'), self.tr('Start Time'),
+                    self.tr('End Time'), self.tr('Time'))
+        return (self.tr('Task'), self.tr('Time'), self.tr('Decimal Time'),
+                self.tr('Man Day'))
+
+    def export(self, stream):
+        """Write the selected report to a text stream."""
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            return export(stream, self.format, self.report,
+                          self.start_edit.date().toPyDate(),
+                          self.end_edit.date().toPyDate(),
+                          self.man_day_minutes, self.columns())
+        finally:
+            QApplication.restoreOverrideCursor()
+
+    @pyqtSlot()
+    def __copy(self):
+        """Copy the selected report to the clipboard."""
+        stream = io.StringIO()
+        self.export(stream)
+
+        mime_data = QMimeData()
+        if WRITERS[self.format].MIME_TYPE == 'text/html':
+            mime_data.setHtml(stream.getvalue())
+        else:
+            mime_data.setText(stream.getvalue())
+        QApplication.clipboard().setMimeData(mime_data, QClipboard.Clipboard)
+        self.accept()
+
+    @pyqtSlot()
+    def __save(self):
+        """Save the selected report to a file."""
+        writer = WRITERS[self.format]
+        file_name = 'taskcounter-{}-{}-{}.{}'.format(
+            self.report, self.start_edit.date().toString('yyyyMMdd'),
+            self.end_edit.date().toString('yyyyMMdd'), writer.EXTENSION)
+        path, _ = QFileDialog.getSaveFileName(
+            self, self.tr('Save report'), file_name,
+            '{} (*.{})'.format(writer.TITLE, writer.EXTENSION))
+        if not path:
+            return
+
+        try:
+            # newline is handled by the writers, csv ends rows with \r\n.
+            with open(path, 'w', encoding='utf-8', newline='') as stream:
+                self.export(stream)
+        except OSError as error:
+            self.logger.error('Unable to export to %s', path, exc_info=True)
+            QMessageBox.warning(self, self.tr('Export'),
+                                self.tr('Unable to save the report: {}')
+                                .format(error.strerror))
+        else:
+            self.accept()
@@ -17,10 +17,17 @@
 
 """Task counter custom line edit."""
 
+import re
+
 from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot
 from PyQt5.QtGui import QTextCursor, QTextOption
 from PyQt5.QtWidgets import QCompleter, QTextEdit
 
+from taskcounter.model import CompletionModel
+
+# the line boundaries of str.splitlines.
+LINE_BREAKS = re.compile('[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]+')
+
 
 class LineEdit(QTextEdit):
     """Custom LineEdit."""
@@ -43,10 +50,15 @@ class LineEdit(QTextEdit):
         """Set the completer on the editor."""
         if completer:
             completer.setWidget(self)
-            completer.setCompletionMode(QCompleter.PopupCompletion)
-            completer.setCaseSensitivity(Qt.CaseInsensitive)
-            completer.setModelSorting(
-                QCompleter.CaseSensitivelySortedModel)
+            if isinstance(completer.model(), CompletionModel):
+                # the model ranks the task names completing the text.
+                completer.setCompletionMode(
+                    QCompleter.UnfilteredPopupCompletion)
+            else:
+                completer.setCompletionMode(QCompleter.PopupCompletion)
+                completer.setCaseSensitivity(Qt.CaseInsensitive)
+                completer.setModelSorting(
+                    QCompleter.CaseSensitivelySortedModel)
             completer.setMaxVisibleItems(15)
             completer.activated.connect(self.__insert_completion)
             self.completer = completer
@@ -74,23 +86,46 @@ class LineEdit(QTextEdit):
 
         super().keyPressEvent(event)
 
-        if not self.toPlainText():
+        text = self.toPlainText()
+        if not text:
             self.completer.popup().hide()
             return
 
-        self.completer.setCompletionPrefix(self.toPlainText())
+        model = self.completer.model()
+        if isinstance(model, CompletionModel):
+            model.complete(text)
+            if not model.rowCount():
+                self.completer.popup().hide()
+                return
+        else:
+            self.completer.setCompletionPrefix(text)
         self.completer.popup().setCurrentIndex(
             self.completer.completionModel().index(0, 0))
         self.completer.complete()
 
+    def insertFromMimeData(self, source):
+        """Insert pasted or dropped text on a single line, in one pass."""
+        if not source.hasText():
+            return
+        text = LINE_BREAKS.sub(' ', source.text())
+        cursor = self.textCursor()
+        if cursor.selectionStart() == 0:
+            text = text.lstrip()
+        cursor.insertText(text)
+        self.ensureCursorVisible()
+
     @pyqtSlot()
     def __text_has_changed(self):
         """When the text has changed."""
+        origin = self.toPlainText()
+        # most changes are typed characters, leaving a single line.
+        if not origin[:1].isspace() and not LINE_BREAKS.search(origin):
+            return
+
         # remove new lines and strip left blank characters
         self.blockSignals(True)
         cursor_position = self.textCursor().position()
 
-        origin = self.toPlainText()
         # count first whitespaces
         whitespaces = len(origin) - len(origin.lstrip())
 
@@ -20,23 +20,25 @@
 import datetime
 import logging
 
-from PyQt5.QtCore import (QByteArray, QItemSelectionModel, QMimeData, Qt,
-                          pyqtSlot)
-from PyQt5.QtGui import QBrush, QClipboard, QColor, QIcon, QPalette
-from PyQt5.QtWidgets import (QAction, QActionGroup, QApplication, QFrame,
-                             QGridLayout, QHBoxLayout, QHeaderView, QLabel,
-                             QLCDNumber, QMainWindow, QSpinBox, QTableView,
-                             QTimeEdit, QToolBar, QWidget, qApp)
-
-from taskcounter.db import close_database
+from PyQt5.QtCore import QItemSelectionModel, Qt, pyqtSlot
+from PyQt5.QtGui import QBrush, QColor, QIcon, QPalette
+from PyQt5.QtWidgets import (QAction, QActionGroup, QFrame, QGridLayout,
+                             QHBoxLayout, QHeaderView, QLabel, QLCDNumber,
+                             QMainWindow, QSpinBox, QTableView, QTimeEdit,
+                             QToolBar, QWidget, qApp)
+
+from taskcounter.db import close_database, instrumented
 from taskcounter.enum import ResultColumn, TaskColumn, WeekDay
-from taskcounter.gui import (AboutDialog, DurationEdit, FlowLayout,
+from taskcounter.gui import (AboutDialog, DurationEdit, ExportDialog,
+                             FlowLayout, PerformanceDialog, RefreshScheduler,
                              SettingDialog, TaskNameDelegate)
-from taskcounter.model import (SettingModel, SummaryModel, WeekModel,
-                               get_total_annual_worked_hours)
-from taskcounter.utility import (color_between, contrast_color,
-                                 minutes_to_time_str, weekday_from_date,
+from taskcounter.model import (AggregateModel, ColorModel, CompletionModel,
+                               QueryExecutor, SettingModel, SummaryModel,
+                               WeekCache)
+from taskcounter.utility import (minutes_to_time_str, next_week,
+                                 previous_week, weekday_from_date,
                                  weeks_for_year)
+from taskcounter.weekcalendar import dates_of_week
 
 
 class MainWindow(QMainWindow):
@@ -53,8 +55,27 @@ class MainWindow(QMainWindow):
         self.daily_result_view = None
         self.result_model = SummaryModel(self)
         self.daily_result_model = SummaryModel(self)
+        # totals are loaded by the query executor.
+        self.aggregate_model = AggregateModel(load=False)
+        # task names too, then shared by the task name editors.
+        self.completion_model = CompletionModel(self)
+        self.query_executor = QueryExecutor(self)
+        self.query_executor.finished.connect(self.__query_finished)
+        self.query_executor.failed.connect(self.__query_failed)
+        # counters are refreshed at most once per event loop iteration.
+        self.refresh_scheduler = RefreshScheduler(
+            SettingModel.refresh_delay(), self)
+        for name, refresh in (
+                ('day', self.__update_day_time_counter),
+                ('week', self.__update_week_time_counter),
+                ('catch_up', self.__update_catch_up_time_counter),
+                ('annual', self.__update_total_annual_time_counter),
+                ('week_summary', self.__update_week_summary),
+                ('daily_summary', self.__update_daily_summary)):
+            self.refresh_scheduler.register(name, refresh)
         self.week_edit = None
         self.week_wrapper = None
+        self.week_cache = WeekCache(SettingModel.week_cache_size(), self)
         self.year_edit = None
         self.week_time_edit = None
         self.man_day_edit = None
@@ -67,6 +88,10 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """When application is about to close."""
+        if self.task_model:
+            self.task_model.flush_writes()
+        self.week_cache.prefetcher.wait()
+        self.query_executor.stop()
         close_database()
 
     def __set_window_size(self):
@@ -89,17 +114,17 @@ class MainWindow(QMainWindow):
         """Initialize current cell color."""
         palette = table.palette()
         current_cell_color = SettingModel.current_cell_color()
-        current_text_color = contrast_color(current_cell_color.name())
+        current_text_color = ColorModel.contrast_color(current_cell_color)
         palette.setBrush(QPalette.Highlight,
                          QBrush(QColor(current_cell_color)))
         palette.setBrush(QPalette.HighlightedText,
-                         QBrush(QColor(current_text_color)))
+                         QBrush(current_text_color))
         table.setPalette(palette)
 
     @staticmethod
-    def __set_task_delegate(table):
+    def __set_task_delegate(table, completion_model):
         """Set a task delegate on a table."""
-        delegate = TaskNameDelegate(table)
+        delegate = TaskNameDelegate(table, completion_model)
         table.setItemDelegateForColumn(
             TaskColumn.Task.value, delegate)
 
@@ -222,8 +247,7 @@ class MainWindow(QMainWindow):
         man_day_layout.addWidget(man_day_label)
         man_day_layout.addWidget(self.man_day_edit)
 
-        self.man_day_edit.timeChanged.connect(self.__update_week_summary)
-        self.man_day_edit.timeChanged.connect(self.__update_daily_summary)
+        self.man_day_edit.timeChanged.connect(self.__man_day_time_changed)
 
         header_layout.addWidget(year_widget)
         header_layout.addWidget(week_widget)
@@ -322,7 +346,7 @@ class MainWindow(QMainWindow):
         self.__init_current_cell_color(self.task_view)
         self.__disable_headers_click(self.task_view)
         self.task_view.setSelectionMode(QTableView.SingleSelection)
-        self.__set_task_delegate(self.task_view)
+        self.__set_task_delegate(self.task_view, self.completion_model)
 
         self.result_view = QTableView(self)
         self.__init_current_cell_color(self.result_view)
@@ -342,8 +366,47 @@ class MainWindow(QMainWindow):
 
         self.__validate_week_and_year()
 
+        # tasks cannot be edited until the totals are loaded.
+        self.task_view.setEnabled(False)
+        self.statusBar().showMessage(self.tr('Loading totals...'))
+        self.query_executor.submit('aggregates', AggregateModel.load_rows)
+        self.query_executor.submit('task_names', CompletionModel.load_index)
+
         self.show()
 
+    @pyqtSlot(object, object)
+    @instrumented
+    def __query_finished(self, key, result):
+        """Use the result of an asynchronous query, event."""
+        if key == 'aggregates':
+            self.aggregate_model.set_rows(result)
+            self.__aggregates_loaded()
+        elif key == 'task_names':
+            self.completion_model.set_index(result)
+
+    @pyqtSlot(object)
+    @instrumented
+    def __query_failed(self, key):
+        """Run a failed asynchronous query again on this thread, event."""
+        if key == 'aggregates':
+            self.aggregate_model.reload()
+            self.__aggregates_loaded()
+        elif key == 'task_names':
+            self.completion_model.load()
+
+    def __aggregates_loaded(self):
+        """Enable the tasks once the totals are loaded."""
+        # the current week may have been created or changed meanwhile.
+        self.aggregate_model.register_week(self.week_wrapper.week_id,
+                                           self.year_edit.value(),
+                                           self.week_wrapper.minutes_to_work)
+        self.aggregate_model.set_minutes_to_work(
+            self.week_wrapper.week_id, self.week_wrapper.minutes_to_work)
+        self.statusBar().clearMessage()
+        self.task_view.setEnabled(True)
+        self.task_view.setFocus(Qt.OtherFocusReason)
+        self.__update_time()
+
     def __create_toolbars_and_menus(self):
         """Create the toolbars and menus."""
         toolbar_weeks = QToolBar(self)
@@ -403,6 +466,11 @@ class MainWindow(QMainWindow):
         about_act.triggered.connect(self.__about)
         about_act.setStatusTip(self.tr('About this application'))
 
+        performance_act = QAction(self.tr('Performance'), self)
+        performance_act.triggered.connect(self.__performance)
+        performance_act.setStatusTip(
+            self.tr('Show the database statements of each action'))
+
         about_qt_act = QAction(self.tr('About Qt'), self)
         about_qt_act.triggered.connect(qApp.aboutQt)
         about_qt_act.setStatusTip(self.tr('About Qt'))
@@ -419,7 +487,7 @@ class MainWindow(QMainWindow):
 
         export_act = QAction(QIcon(':/export.png'), self.tr('Export'), self)
         export_act.setShortcut('Ctrl+E')
-        export_act.setStatusTip(self.tr('Export week summary as html table'))
+        export_act.setStatusTip(self.tr('Export a report of a period'))
         export_act.triggered.connect(self.__export)
 
         toolbar_weeks.addAction(today_act)
@@ -436,6 +504,7 @@ class MainWindow(QMainWindow):
 
         app_menu = menu_bar.addMenu(self.tr('Application'))
         app_menu.addAction(about_act)
+        app_menu.addAction(performance_act)
         app_menu.addAction(about_qt_act)
         app_menu.addAction(settings_act)
         app_menu.addAction(exit_act)
@@ -452,9 +521,14 @@ class MainWindow(QMainWindow):
 
     def __validate_week_and_year(self):
         """Validate the week and the year and update a WeekModel."""
-        self.week_wrapper = WeekModel(
-            self.year_edit.value(), self.week_edit.value(), self)
+        self.week_wrapper = self.week_cache.get(
+            self.year_edit.value(), self.week_edit.value())
         self.logger.debug('Week wrapper: %s', self.week_wrapper)
+        self.aggregate_model.register_week(self.week_wrapper.week_id,
+                                           self.year_edit.value(),
+                                           self.week_wrapper.minutes_to_work)
+        self.week_cache.prefetch_around(self.year_edit.value(),
+                                        self.week_edit.value())
 
         self.week_time_edit.blockSignals(True)
         self.week_time_edit.minutes = self.week_wrapper.minutes_to_work
@@ -469,30 +543,29 @@ class MainWindow(QMainWindow):
             self.day_actions[WeekDay.Monday].activate(QAction.Trigger)
 
     @pyqtSlot()
+    @instrumented
     def __previous_week(self):
         """Go to the previous week."""
-        current_week = int(self.week_edit.value())
-        if current_week - 1 == 0:
-            current_year = int(self.year_edit.value())
-            weeks_of_previous_year = weeks_for_year(current_year - 1)
-            self.week_edit.setValue(weeks_of_previous_year)
-            self.year_edit.setValue(current_year - 1)
-        else:
-            self.week_edit.setValue(current_week - 1)
+        year, week_number = previous_week(int(self.year_edit.value()),
+                                          int(self.week_edit.value()))
+        self.__go_to_week(year, week_number)
 
     @pyqtSlot()
+    @instrumented
     def __next_week(self):
         """Go to the next week."""
-        current_week = int(self.week_edit.value())
-        current_year = int(self.year_edit.value())
-        weeks_of_current_year = weeks_for_year(current_year)
-        if current_week + 1 > weeks_of_current_year:
-            self.week_edit.setValue(1)
-            self.year_edit.setValue(current_year + 1)
-        else:
-            self.week_edit.setValue(current_week + 1)
+        year, week_number = next_week(int(self.year_edit.value()),
+                                      int(self.week_edit.value()))
+        self.__go_to_week(year, week_number)
+
+    def __go_to_week(self, year, week_number):
+        """Go to a week of a year."""
+        self.week_edit.setValue(week_number)
+        if year != self.year_edit.value():
+            self.year_edit.setValue(year)
 
     @pyqtSlot()
+    @instrumented
     def __today(self):
         """Go to the current day, today."""
         self.year_edit.setValue(datetime.datetime.now().year)
@@ -507,11 +580,25 @@ class MainWindow(QMainWindow):
         about.exec_()
 
     @pyqtSlot()
+    def __performance(self):
+        """Open the performance page."""
+        performance = PerformanceDialog(self)
+        performance.exec_()
+
+    @pyqtSlot()
+    @instrumented
     def __export(self):
-        """Export data."""
-        self.__export_cells_as_table()
+        """Export a report, of the current week by default."""
+        week_dates = dates_of_week(self.year_edit.value(),
+                                   self.week_edit.value())
+        man_day_time = self.man_day_edit.time()
+        export = ExportDialog(week_dates[0], week_dates[-1],
+                              man_day_time.hour() * 60
+                              + man_day_time.minute(), self)
+        export.exec_()
 
     @pyqtSlot()
+    @instrumented
     def __edit_preferences(self):
         """Edit preferences."""
         settings = SettingDialog(self)
@@ -520,16 +607,21 @@ class MainWindow(QMainWindow):
         self.__update_settings()
 
     @pyqtSlot()
+    @instrumented
     def __change_current_day(self):
         """Change the current day for edition."""
         sender = self.sender()
         if self.week_wrapper:
             if self.task_model:
-                self.task_model.dataChanged.disconnect()
+                self.task_model.flush_writes()
+                self.task_model.task_changed.disconnect()
+                self.task_model.overlap_rejected.disconnect()
+                self.task_model.write_failed.disconnect()
             self.task_model = self.week_wrapper[WeekDay[sender.objectName()]]
             self.__update_time()
-            self.task_model.dataChanged.connect(
-                self.__update_time)
+            self.task_model.task_changed.connect(self.__task_changed)
+            self.task_model.overlap_rejected.connect(self.__overlap_rejected)
+            self.task_model.write_failed.connect(self.__write_failed)
 
             # set readable date in title
             self.__set_day_title(
@@ -547,12 +639,14 @@ class MainWindow(QMainWindow):
             self.task_view.selectionModel().setCurrentIndex(index, flags)
 
     @pyqtSlot(int)
+    @instrumented
     def __year_changed(self, year):
         """Change the current year, event."""
         self.__update_week_edit(year)
         self.__validate_week_and_year()
 
     @pyqtSlot()
+    @instrumented
     def __week_changed(self):
         """Change the current week, event."""
         self.__validate_week_and_year()
@@ -562,35 +656,67 @@ class MainWindow(QMainWindow):
         weeks = weeks_for_year(int(year))
         self.week_edit.setMaximum(weeks)
 
+    @pyqtSlot(object, object)
+    @instrumented
+    def __task_changed(self, old_task, new_task):
+        """Apply the change of a task to the aggregates, event."""
+        self.aggregate_model.apply(self.task_model.date,
+                                   self.task_model.week_id,
+                                   old_task, new_task)
+        self.completion_model.apply(old_task, new_task)
+        self.__update_time()
+
+    @pyqtSlot(list)
+    def __overlap_rejected(self, rows):
+        """Highlight the tasks a rejected time overlaps, event."""
+        selection_model = self.task_view.selectionModel()
+        flags = QItemSelectionModel.Select | QItemSelectionModel.Rows
+        selection_model.clearSelection()
+        for row in rows:
+            selection_model.select(self.task_model.index(row, 0), flags)
+        self.statusBar().showMessage(
+            self.tr('This time overlaps another task'), 5000)
+
+    @pyqtSlot()
+    @instrumented
+    def __write_failed(self):
+        """Reload the totals of the writes rolled back, event."""
+        self.aggregate_model.reload()
+        self.completion_model.load()
+        self.__aggregates_loaded()
+        self.statusBar().showMessage(
+            self.tr('Unable to save the last changes'), 5000)
+
     @pyqtSlot()
     def __update_time(self):
         """Update time counters."""
-        self.__update_day_time_counter()
-        self.__update_week_time_counter()
-        self.__update_catch_up_time_counter()
-        self.__update_total_annual_time_counter()
-        self.__update_week_summary()
-        self.__update_daily_summary()
+        self.refresh_scheduler.mark_dirty()
+
+    @pyqtSlot()
+    def __man_day_time_changed(self):
+        """Update the summaries with the new man day time, event."""
+        self.refresh_scheduler.mark_dirty('week_summary', 'daily_summary')
 
     def __update_day_time_counter(self):
         """Update the day time counter."""
-        self.day_time_lcd.display(
-            minutes_to_time_str(self.task_model.minutes_of_day))
+        self.day_time_lcd.display(minutes_to_time_str(
+            self.aggregate_model.minutes_of_day(self.task_model.date)))
 
     def __update_week_time_counter(self):
         """Update the week time counters."""
-        self.week_time_lcd.display(
-            minutes_to_time_str(self.week_wrapper.minutes_of_week))
+        minutes_of_week = self.aggregate_model.minutes_of_week(
+            self.week_wrapper.week_id)
+        self.week_time_lcd.display(minutes_to_time_str(minutes_of_week))
         self.remaining_week_time_lcd.display(
             minutes_to_time_str(max(0, self.week_wrapper.minutes_to_work
-                                    - self.week_wrapper.minutes_of_week)))
+                                    - minutes_of_week)))
 
         self.__update_week_counter_color()
 
     def __update_catch_up_time_counter(self):
         """Update the catch-up time counter."""
-        to_work = self.week_wrapper.total_time_to_work
-        worked = self.week_wrapper.total_time_worked
+        to_work = self.aggregate_model.total_time_to_work
+        worked = self.aggregate_model.total_time_worked
 
         catch_up_time = worked - to_work
         abs_time = abs(catch_up_time)
@@ -610,7 +736,8 @@ class MainWindow(QMainWindow):
 
     def __update_total_annual_time_counter(self):
         """Update the total annual time counter."""
-        total = get_total_annual_worked_hours(self.year_edit.value())
+        total = self.aggregate_model.annual_worked_hours(
+            self.year_edit.value())
         self.total_annual_lcd.display(total)
 
     def __build_lcd_number_widget(self):
@@ -622,6 +749,7 @@ class MainWindow(QMainWindow):
         return lcdnumber
 
     @pyqtSlot()
+    @instrumented
     def __week_time_changed(self):
         """Change the work time of the week, event."""
         self.__update_week_time()
@@ -631,21 +759,19 @@ class MainWindow(QMainWindow):
         minutes_time = self.week_time_edit.minutes
         if self.week_wrapper:
             self.week_wrapper.minutes_to_work = minutes_time
-        self.__update_week_counter_color()
-        self.__update_catch_up_time_counter()
-        self.__update_week_time_counter()
+            self.aggregate_model.set_minutes_to_work(
+                self.week_wrapper.week_id, minutes_time)
+        self.refresh_scheduler.mark_dirty('week', 'catch_up')
 
     def __update_week_counter_color(self):
         """Update the week counter color depending on the time percentage."""
         percent = 1
         if self.week_wrapper.minutes_to_work:
             # denominator cannot be zero
-            percent = (self.week_wrapper.minutes_of_week /
-                       self.week_wrapper.minutes_to_work)
+            percent = (self.aggregate_model.minutes_of_week(
+                self.week_wrapper.week_id) / self.week_wrapper.minutes_to_work)
 
-        color = color_between(SettingModel.invalid_color().name(),
-                              SettingModel.valid_color().name(), percent)
-        self.__change_week_color(QColor(color))
+        self.__change_week_color(ColorModel.gradient_color(percent))
 
     def __build_title_label(self, title):
         """Build a label widget with a given title."""
@@ -665,7 +791,8 @@ class MainWindow(QMainWindow):
             man_day_time = self.man_day_edit.time()
             man_day_minutes = man_day_time.hour() * 60 + man_day_time.minute()
 
-            tasks = self.week_wrapper.week_summary(man_day_minutes)
+            tasks = self.aggregate_model.week_summary(
+                self.week_wrapper.week_id, man_day_minutes)
             self.result_model.tasks = tasks
             self.__resize_result_headers()
 
@@ -676,65 +803,16 @@ class MainWindow(QMainWindow):
             man_day_time = self.man_day_edit.time()
             man_day_minutes = man_day_time.hour() * 60 + man_day_time.minute()
 
-            tasks = self.week_wrapper.daily_summary(self.task_model.date, man_day_minutes)
+            tasks = self.aggregate_model.daily_summary(
+                self.task_model.date, man_day_minutes)
             self.daily_result_model.tasks = tasks
             self.__resize_daily_result_headers()
 
-    def __export_cells_as_table(self):
-        """Copy tasks and time cells as html table."""
-        model = self.result_view.model()
-
-        table_text = '<html><head>'
-        table_text += '<meta http-equiv="content-type" '
-        table_text += 'content="text/html; charset=utf-8">'
-        table_text += '</head><body>'
-        table_text += '<table cellpadding="0" cellspacing="0" border="0" '
-        table_text += 'style="width:100%;">'
-
-        table_text += '<tr>'
-        table_text += ('<th style="border:2px solid black;'
-                       'margin:0;padding:2px;text-align:center;'
-                       'background-color:#ddd;">'
-                       + self.tr('Task') + '</th>')
-        table_text += ('<th style="border:2px solid black;'
-                       'margin:0;padding:2px;text-align:center;'
-                       'background-color:#ddd;width:20%;">'
-                       + self.tr('Time') + '</th>')
-        table_text += '</tr>'
-
-        rows = model.rowCount()
-        columns_to_export = (ResultColumn.Task.value, ResultColumn.Time.value)
-
-        for i in range(0, rows):
-            table_text += '<tr>'
-            for j in columns_to_export:
-                content = model.data(model.index(i, j), Qt.DisplayRole)
-                if j == 0:
-                    table_text += ('<td style="border:2px solid black;'
-                                   'margin:0;padding:2px;text-align:left;">'
-                                   '{}</td>'
-                                   ).format(content)
-                else:
-                    table_text += ('<td style="border:2px solid black;'
-                                   'margin:0;padding:2px;text-align:center;'
-                                   'width:20%;">{}</td>'
-                                   ).format(content)
-            table_text += '</tr>'
-
-        table_text += '</tr></table></body></html>'
-
-        clipboard = QApplication.clipboard()
-        mime_data = QMimeData()
-        bytes_array = QByteArray()
-        bytes_array.append(table_text)
-        mime_data.setData('text/html', bytes_array)
-
-        clipboard.setMimeData(mime_data, QClipboard.Clipboard)
-
     def __update_settings(self):
         """Update user interface with new settings."""
         self.__init_current_cell_color(self.task_view)
         self.__init_current_cell_color(self.result_view)
         self.__init_current_cell_color(self.daily_result_view)
+        self.week_cache.update_rendering()
         self.__update_time()
         self.man_day_edit.setTime(SettingModel.default_man_day_time())
@@ -0,0 +1,79 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter performance dialog."""
+
+import logging
+
+from PyQt5.QtCore import pyqtSlot
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import (QDialog, QDialogButtonBox, QPlainTextEdit,
+                             QPushButton, QVBoxLayout)
+
+from taskcounter.db import DB
+
+from .centermixin import CenterMixin
+
+
+class PerformanceDialog(CenterMixin, QDialog):
+    """Dialog showing the SQL statements of each user interface action."""
+
+    def __init__(self, parent=None):
+        """Construct a performance dialog."""
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self.logger.info('Opening performance dialog')
+        self.setWindowTitle(self.tr('Performance'))
+        self.setMinimumHeight(600)
+        self.setMinimumWidth(800)
+        self.center()
+
+        self.report_edit = QPlainTextEdit(self)
+        self.report_edit.setReadOnly(True)
+        self.report_edit.setLineWrapMode(QPlainTextEdit.NoWrap)
+        font = QFont('Courier')
+        font.setStyleHint(QFont.Monospace)
+        font.setPointSize(11)
+        font.setFixedPitch(True)
+        self.report_edit.setFont(font)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        refresh_button = QPushButton(self.tr('Refresh'), self)
+        reset_button = QPushButton(self.tr('Reset'), self)
+        button_box.addButton(refresh_button, QDialogButtonBox.ActionRole)
+        button_box.addButton(reset_button, QDialogButtonBox.ResetRole)
+        button_box.rejected.connect(self.reject)
+        refresh_button.clicked.connect(self.__refresh)
+        reset_button.clicked.connect(self.__reset)
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        layout.addWidget(self.report_edit)
+        layout.addWidget(button_box)
+
+        self.__refresh()
+
+    @pyqtSlot()
+    def __refresh(self):
+        """Show the current report."""
+        self.report_edit.setPlainText(DB.instrumentation.report())
+
+    @pyqtSlot()
+    def __reset(self):
+        """Forget the recorded statements."""
+        DB.instrumentation.reset()
+        self.__refresh()
@@ -0,0 +1,79 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter refresh scheduler."""
+
+import logging
+from collections import OrderedDict, namedtuple
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSlot
+
+RefreshStats = namedtuple('RefreshStats', ['requested', 'recomputed',
+                                           'saved'])
+
+
+class RefreshScheduler(QObject):
+    """Coalesce the refreshes of named widgets.
+
+    A widget marked dirty is refreshed once, at the latest a delay after it
+    was first marked, however many times it has been marked meanwhile. A
+    zero delay refreshes on the next event loop iteration.
+    """
+
+    def __init__(self, delay=0, parent=None):
+        """Construct a refresh scheduler, delay is in milliseconds."""
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self._refreshes = OrderedDict()
+        self._dirty = set()
+        self._requested = 0
+        self._recomputed = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self.flush)
+
+    def register(self, name, refresh):
+        """Register the refresh function of a name, in refresh order."""
+        self._refreshes[name] = refresh
+
+    def mark_dirty(self, *names):
+        """Mark names to be refreshed, all registered names if none."""
+        names = names or self._refreshes.keys()
+        self._requested += len(names)
+        self._dirty.update(names)
+        # later marks do not push the refresh back.
+        if not self._timer.isActive():
+            self._timer.start()
+
+    @pyqtSlot()
+    def flush(self):
+        """Refresh the dirty names now."""
+        self._timer.stop()
+        dirty = self._dirty
+        self._dirty = set()
+        for name, refresh in self._refreshes.items():
+            if name in dirty:
+                self._recomputed += 1
+                refresh()
+        self.logger.debug('Refresh stats: %s', self.stats())
+
+    def stats(self):
+        """Get the requested and recomputed refreshes, and the saved ones."""
+        return RefreshStats(self._requested, self._recomputed,
+                            self._requested - self._recomputed
+                            - len(self._dirty))
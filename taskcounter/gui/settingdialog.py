@@ -24,7 +24,7 @@ from PyQt5.QtWidgets import (QColorDialog, QDialog, QGridLayout, QLabel,
                              QPushButton, QTimeEdit)
 
 from taskcounter.gui import CenterMixin, DurationEdit
-from taskcounter.model import SettingModel
+from taskcounter.model import ColorModel, SettingModel
 from taskcounter.utility import contrast_color
 
 
@@ -119,6 +119,7 @@ class SettingDialog(CenterMixin, QDialog):
                                       QColorDialog.DontUseNativeDialog)
         if color.isValid():
             SettingModel.set_invalid_color(color)
+            ColorModel.invalidate()
             self.logger.info('Write invalid color: %s',
                              color.name())
 
@@ -133,6 +134,7 @@ class SettingDialog(CenterMixin, QDialog):
                                       QColorDialog.DontUseNativeDialog)
         if color.isValid():
             SettingModel.set_valid_color(color)
+            ColorModel.invalidate()
             self.logger.info('Write valid color: %s',
                              color.name())
 
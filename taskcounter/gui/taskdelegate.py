@@ -17,29 +17,31 @@
 
 """Task counter task name delegate."""
 
-from PyQt5.QtCore import QStringListModel, Qt, pyqtSlot
+from PyQt5.QtCore import Qt, pyqtSlot
 from PyQt5.QtWidgets import QCompleter, QItemDelegate
 
 from taskcounter.enum import TaskColumn
 from taskcounter.gui.lineedit import LineEdit
-from taskcounter.model import get_last_unique_task_names
+from taskcounter.model import CompletionModel
 
 
 class TaskNameDelegate(QItemDelegate):
     """Delegate with completion for the task name."""
 
-    def __init__(self, parent):
-        """Construct a task name delegate."""
+    def __init__(self, parent, completion_model=None):
+        """Construct a task name delegate, sharing a completion model."""
         super().__init__(parent)
+        if completion_model is None:
+            completion_model = CompletionModel(self)
+        self.completion_model = completion_model
 
     def createEditor(self, parent, option, index):
         """Return the widget used to edit the item specified by index."""
-        completer = QCompleter(self)
-        string_list_model = QStringListModel(
-            get_last_unique_task_names(), completer)
-        completer.setModel(string_list_model)
+        if not self.completion_model.loaded:
+            self.completion_model.load()
         editor = LineEdit(parent)
-        editor.set_completer(completer)
+        # the completer is destroyed with its editor.
+        editor.set_completer(QCompleter(self.completion_model, editor))
         editor.return_pressed.connect(self.__commit_and_close_editor)
         return editor
 
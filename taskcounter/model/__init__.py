@@ -17,8 +17,44 @@
 
 """Task counter model module init."""
 
-from .utility import get_last_unique_task_names, get_total_annual_worked_hours
+from importlib import import_module
+
+from .utility import (get_annual_summary, get_daily_summary,
+                      get_task_name_uses, get_total_annual_worked_hours,
+                      get_week_summary, summary_from_rows, summary_query,
+                      summary_task)
+from .intervalindex import IntervalIndex
+from .completionindex import CompletionIndex
 from .settingmodel import SettingModel
-from .daymodel import DayModel
-from .summarymodel import SummaryModel
-from .weekmodel import WeekModel
+from .aggregatemodel import AggregateModel
+
+# name: module, of the models based on Qt classes. They are imported when
+# first used, so that the command line interface does not import Qt.
+_QT_MODELS = {
+    'ColorModel': 'colormodel',
+    'DayModel': 'daymodel',
+    'SummaryModel': 'summarymodel',
+    'WeekModel': 'weekmodel',
+    'WeekPrefetcher': 'weekprefetcher',
+    'load_week_rows': 'weekprefetcher',
+    'WeekCache': 'weekcache',
+    'CompletionModel': 'completionmodel',
+    'QueryExecutor': 'queryexecutor',
+}
+
+
+def __getattr__(name):
+    """Import a model based on Qt classes when first used."""
+    try:
+        module_name = _QT_MODELS[name]
+    except KeyError:
+        raise AttributeError('module {!r} has no attribute {!r}'
+                             .format(__name__, name)) from None
+    value = getattr(import_module('.' + module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Get the names of the module, with the models not imported yet."""
+    return sorted(set(globals()) | set(_QT_MODELS))
@@ -0,0 +1,211 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter aggregate model."""
+
+import logging
+
+from taskcounter.db import Day, Task, Week, fn
+from taskcounter.enum import TaskColumn
+from taskcounter.model import summary_from_rows
+
+
+def time_to_seconds(a_time):
+    """Get the number of seconds since midnight of a time."""
+    return a_time.hour * 3600 + a_time.minute * 60 + a_time.second
+
+
+class AggregateModel:
+    """In-memory worked time totals, maintained incrementally.
+
+    Totals per day, week and year are loaded once from the database, then
+    each task insertion, update or deletion is applied as a delta.
+    """
+
+    def __init__(self, load=True):
+        """Construct an aggregate model, and load the totals if load."""
+        self.logger = logging.getLogger(__name__)
+        self._day_seconds = {}
+        self._day_names = {}
+        self._week_seconds = {}
+        self._week_names = {}
+        self._week_tasks = {}
+        self._week_years = {}
+        self._week_minutes_to_work = {}
+        self._year_seconds = {}
+        self._total_seconds = 0
+        self._total_minutes_to_work = 0
+        if load:
+            self.reload()
+
+    def reload(self):
+        """Load all the totals from the database."""
+        self.set_rows(self.load_rows())
+
+    @staticmethod
+    def load_rows():
+        """Get the rows of the weeks and of the task totals per day and name.
+
+        It only reads the database, so it can run on a worker thread.
+        """
+        logger = logging.getLogger(__name__)
+        weeks = list(Week.select(Week.id, Week.year, Week.minutes_to_work)
+                     .tuples())
+
+        query = (Task.select(Day.date, Day.week, Task.name,
+                             fn.SUM(Task.duration),
+                             fn.COUNT(Task.id))
+                 .join(Day)
+                 .where(Task.duration.is_null(False))
+                 .group_by(Day.id, Task.name)
+                 .tuples())
+        logger.debug('Executing query: %s', query.sql())
+        return weeks, list(query)
+
+    def set_rows(self, rows):
+        """Set all the totals from rows got with load_rows."""
+        weeks, tasks = rows
+        self._day_seconds = {}
+        self._day_names = {}
+        self._week_seconds = {}
+        self._week_names = {}
+        self._week_tasks = {}
+        self._week_years = {}
+        self._week_minutes_to_work = {}
+        self._year_seconds = {}
+        self._total_seconds = 0
+        self._total_minutes_to_work = 0
+
+        for week_id, year, minutes_to_work in weeks:
+            self._week_years[week_id] = year
+            self._week_minutes_to_work[week_id] = minutes_to_work
+
+        for date_, week_id, name, seconds, count in tasks:
+            self.__accumulate(date_, week_id, name, seconds, count)
+
+        self.logger.info('Loaded totals of %s days and %s weeks',
+                         len(self._day_seconds), len(self._week_seconds))
+
+    def register_week(self, week_id, year, minutes_to_work):
+        """Register a week, that may have been created since loading."""
+        if week_id not in self._week_years:
+            self._week_years[week_id] = year
+            self._week_minutes_to_work[week_id] = minutes_to_work
+
+    def set_minutes_to_work(self, week_id, minutes_to_work):
+        """Set the work time in minutes of a week."""
+        previous = self._week_minutes_to_work.get(week_id, 0)
+        self._week_minutes_to_work[week_id] = minutes_to_work
+        if self._week_tasks.get(week_id):
+            self._total_minutes_to_work += minutes_to_work - previous
+
+    def apply(self, date_, week_id, old_task, new_task):
+        """Apply the change of a task of a day.
+
+        Tasks are cached rows of a day model, None when the task is created
+        (old_task) or deleted (new_task).
+        """
+        if old_task:
+            self.__apply_task(date_, week_id, old_task, -1)
+        if new_task:
+            self.__apply_task(date_, week_id, new_task, 1)
+
+    def __apply_task(self, date_, week_id, task, sign):
+        """Add (sign is 1) or remove (sign is -1) a task from the totals."""
+        start = task[TaskColumn.Start_Time]
+        end = task[TaskColumn.End_Time]
+        if start is None or end is None:
+            # incomplete tasks are not counted.
+            return
+        seconds = time_to_seconds(end) - time_to_seconds(start)
+        self.__accumulate(date_, week_id, task[TaskColumn.Task],
+                          sign * seconds, sign)
+
+    def __accumulate(self, date_, week_id, name, seconds, count):
+        """Add seconds and a task count to every total."""
+        year = self._week_years.get(week_id)
+
+        self._day_seconds[date_] = self._day_seconds.get(date_, 0) + seconds
+        self._week_seconds[week_id] = (self._week_seconds.get(week_id, 0)
+                                       + seconds)
+        self._year_seconds[year] = self._year_seconds.get(year, 0) + seconds
+        self._total_seconds += seconds
+
+        self.__accumulate_name(self._day_names.setdefault(date_, {}),
+                               name, seconds, count)
+        self.__accumulate_name(self._week_names.setdefault(week_id, {}),
+                               name, seconds, count)
+
+        # only weeks with tasks count in the time to work.
+        tasks = self._week_tasks.get(week_id, 0)
+        if not tasks and count > 0:
+            self._total_minutes_to_work += (
+                self._week_minutes_to_work.get(week_id, 0))
+        elif tasks and tasks + count <= 0:
+            self._total_minutes_to_work -= (
+                self._week_minutes_to_work.get(week_id, 0))
+        self._week_tasks[week_id] = tasks + count
+
+    @staticmethod
+    def __accumulate_name(names, name, seconds, count):
+        """Add seconds and a task count to the total of a task name."""
+        total_seconds, total_count = names.get(name, (0, 0))
+        total_count += count
+        if total_count > 0:
+            names[name] = (total_seconds + seconds, total_count)
+        else:
+            names.pop(name, None)
+
+    def minutes_of_day(self, date_):
+        """Get the total time in minutes of the tasks of a day."""
+        return self._day_seconds.get(date_, 0) / 60
+
+    def minutes_of_week(self, week_id):
+        """Get the total time in minutes of the tasks of a week."""
+        return self._week_seconds.get(week_id, 0) / 60
+
+    @property
+    def total_time_to_work(self):
+        """Get the total time (minutes) to work for the entire period."""
+        return self._total_minutes_to_work
+
+    @property
+    def total_time_worked(self):
+        """Get the total worked time (minutes) for the entire period."""
+        return self._total_seconds / 60
+
+    def annual_worked_hours(self, year):
+        """Get the total time worked in hours of a year."""
+        return max(int(self._year_seconds.get(int(year), 0) / 3600), 0)
+
+    def week_summary(self, week_id, man_day_minutes):
+        """Get the week summary: tasks and total time in minutes."""
+        return self.__summary(self._week_names.get(week_id, {}),
+                              man_day_minutes)
+
+    def daily_summary(self, date_, man_day_minutes):
+        """Get the day summary: tasks and total time in minutes."""
+        return self.__summary(self._day_names.get(date_, {}),
+                              man_day_minutes)
+
+    @staticmethod
+    def __summary(names, man_day_minutes):
+        """Get a summary from the totals of task names."""
+        rows = sorted(((name, seconds / 60)
+                       for name, (seconds, _) in names.items()),
+                      key=lambda row: (-row[1], row[0]))
+        return summary_from_rows(man_day_minutes, rows)
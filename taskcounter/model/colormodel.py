@@ -0,0 +1,72 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter color model."""
+
+import logging
+
+from PyQt5.QtGui import QColor
+
+from taskcounter.model import SettingModel
+from taskcounter.utility import color_between, contrast_color
+
+
+class ColorModel:
+    """Colors computed from the color settings, cached until invalidated.
+
+    Contrast colors do not depend on settings, they are kept for the whole
+    process.
+    """
+
+    # number of colors of the gradient between invalid and valid colors.
+    GRADIENT_STEPS = 256
+
+    _gradient = None
+    # rgb: contrast color.
+    _contrasts = {}
+
+    @classmethod
+    def invalidate(cls):
+        """Forget the gradient, when color settings have changed."""
+        logger = logging.getLogger(__name__)
+        cls._gradient = None
+        logger.info('Invalidated gradient colors')
+
+    @classmethod
+    def gradient_color(cls, percent):
+        """Get the color between invalid and valid colors, for a ratio."""
+        if cls._gradient is None:
+            invalid_color = SettingModel.invalid_color().name()
+            valid_color = SettingModel.valid_color().name()
+            last_step = cls.GRADIENT_STEPS - 1
+            cls._gradient = tuple(
+                QColor(color_between(invalid_color, valid_color,
+                                     step / last_step))
+                for step in range(cls.GRADIENT_STEPS))
+        percent = min(max(percent, 0), 1)
+        return cls._gradient[round(percent * (cls.GRADIENT_STEPS - 1))]
+
+    @classmethod
+    def contrast_color(cls, color):
+        """Get the black or white contrast color of a color."""
+        rgb = color.rgb()
+        try:
+            return cls._contrasts[rgb]
+        except KeyError:
+            contrast = QColor(contrast_color(color.name()))
+            cls._contrasts[rgb] = contrast
+            return contrast
@@ -0,0 +1,204 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter completion index."""
+
+import re
+from bisect import bisect_left
+from datetime import date
+from heapq import nsmallest
+from itertools import islice
+
+# greater than any character, to find the end of a prefix range.
+_LAST_CHARACTER = chr(0x10ffff)
+
+
+def _prefix_matcher(query):
+    """Get a function checking a key starts with a query."""
+    return lambda key: key.startswith(query)
+
+
+def _substring_matcher(query):
+    """Get a function checking a key contains a query."""
+    return lambda key: query in key
+
+
+def _subsequence_matcher(query):
+    """Get a function checking a key contains the characters of a query.
+
+    Each character is matched at its first occurrence, so the regexp does not
+    backtrack.
+    """
+    return re.compile(''.join('[^{0}]*{0}'.format(re.escape(character))
+                              for character in query)).match
+
+
+class CompletionIndex:
+    """Task names ranked by use, matched case insensitively.
+
+    Names loaded from the history are ranked once by score. Prefix matches
+    are a range of the names sorted by case folded key, found by bisection:
+    the best ranks of a small range are selected, while a large range is
+    matched by walking the names in rank order until enough are found.
+    Substring and fuzzy matches walk, in rank order, the names containing the
+    rarest character of the text, resuming the walk while the user types.
+
+    Names used since loading are kept apart with their new score, and ranked
+    with the loaded names when completing.
+    """
+
+    PREFIX = 'prefix'
+    SUBSTRING = 'substring'
+    FUZZY = 'fuzzy'
+
+    MATCHES = (PREFIX, SUBSTRING, FUZZY)
+
+    # days for the weight of the uses of a name to halve.
+    HALF_LIFE = 30
+
+    # number of completions kept, for the texts typed again.
+    RESULTS_CACHE_SIZE = 1000
+
+    # number of names matched at once, while walking the ranks.
+    WALK_CHUNK = 256
+
+    def __init__(self, uses=(), today=None):
+        """Construct an index from (name, count, last used date) uses."""
+        self._today = today or date.today()
+        self._uses = {}
+        self._scores = {}
+        for name, count, last_date in uses:
+            self.__set_use(name, count, last_date)
+
+        # rank: name, best score first.
+        self._ranked = sorted(self._scores,
+                              key=lambda name: (-self._scores[name], name))
+        self._ranked_keys = [name.casefold() for name in self._ranked]
+        # the ranks sorted by case folded key, for prefix ranges.
+        self._key_ranks = sorted(range(len(self._ranked)),
+                                 key=self._ranked_keys.__getitem__)
+        self._keys = [self._ranked_keys[rank] for rank in self._key_ranks]
+        # character: ranks of the names containing it, ascending.
+        self._postings = {}
+        for rank, key in enumerate(self._ranked_keys):
+            for character in set(key):
+                self._postings.setdefault(character, []).append(rank)
+
+        # name: case folded key, of the names used since loading.
+        self._used = {}
+        self._results = {}
+        # match, query, ranks found, ranks to walk, walk position.
+        self._walk = None
+
+    def __len__(self):
+        """Get the number of names."""
+        return len(self._uses)
+
+    def __contains__(self, name):
+        """Check a name is in the index."""
+        return name in self._uses
+
+    def __set_use(self, name, count, last_date):
+        """Set the use count and last use date of a name, and its score."""
+        self._uses[name] = (count, last_date)
+        age = (self._today - last_date).days if last_date else 0
+        self._scores[name] = count * 0.5 ** (max(age, 0) / self.HALF_LIFE)
+
+    def score(self, name):
+        """Get the score of a name, 0 if unknown."""
+        return self._scores.get(name, 0)
+
+    def use(self, name, last_date=None):
+        """Record a use of a name, adding it if unknown."""
+        last_date = last_date or self._today
+        count, previous_date = self._uses.get(name, (0, None))
+        if previous_date and previous_date > last_date:
+            last_date = previous_date
+        self.__set_use(name, count + 1, last_date)
+        self._used[name] = name.casefold()
+        self._results = {}
+
+    def complete(self, text, match=PREFIX, limit=50):
+        """Get the names matching a text, most used and recent first."""
+        query = text.casefold()
+        if not query:
+            return []
+        try:
+            return self._results[match, query, limit]
+        except KeyError:
+            pass
+
+        if match == self.SUBSTRING:
+            matches = _substring_matcher(query)
+            ranks = self.__walk(match, query, limit, matches)
+        elif match == self.FUZZY:
+            matches = _subsequence_matcher(query)
+            ranks = self.__walk(match, query, limit, matches)
+        else:
+            matches = _prefix_matcher(query)
+            ranks = self.__prefix_ranks(query, limit)
+
+        names = {self._ranked[rank] for rank in ranks}
+        names.update(name for name, key in self._used.items()
+                     if matches(key))
+        scores = self._scores
+        results = nsmallest(limit, names,
+                            key=lambda name: (-scores[name], name))
+        if len(self._results) >= self.RESULTS_CACHE_SIZE:
+            self._results = {}
+        self._results[match, query, limit] = results
+        return results
+
+    def __prefix_ranks(self, query, limit):
+        """Get the best ranks of the loaded names starting with a query."""
+        start = bisect_left(self._keys, query)
+        end = bisect_left(self._keys, query + _LAST_CHARACTER, start)
+        size = end - start
+        # about size steps to select in the range, or len / size * limit
+        # steps to walk the ranks until enough names are found.
+        if size * size <= len(self._ranked) * limit:
+            return nsmallest(limit, self._key_ranks[start:end])
+        return list(islice((rank for rank, key
+                            in enumerate(self._ranked_keys)
+                            if key.startswith(query)), limit))
+
+    def __walk(self, match, query, limit, matches):
+        """Get the best ranks of the loaded names matching a query.
+
+        The names containing the rarest character of the query are walked in
+        rank order until enough names match. While the query grows, the walk
+        resumes: the names a longer query matches are among the names found
+        so far, or not walked yet.
+        """
+        keys = self._ranked_keys
+        if (self._walk is not None and self._walk[0] == match
+                and query.startswith(self._walk[1])):
+            _, _, found, ranks, position = self._walk
+            found = [rank for rank in found if matches(keys[rank])]
+        else:
+            found = []
+            ranks = min((self._postings.get(character, ())
+                         for character in set(query)), key=len)
+            position = 0
+
+        # found holds every matching rank before the position.
+        while len(found) < limit and position < len(ranks):
+            chunk = ranks[position:position + self.WALK_CHUNK]
+            position += len(chunk)
+            found.extend([rank for rank in chunk if matches(keys[rank])])
+        self._walk = (match, query, found, ranks, position)
+        return found[:limit]
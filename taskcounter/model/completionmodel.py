@@ -0,0 +1,88 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter completion model."""
+
+import logging
+
+from PyQt5.QtCore import QStringListModel
+
+from taskcounter.enum import TaskColumn
+from taskcounter.model import (CompletionIndex, SettingModel,
+                               get_task_name_uses)
+
+
+class CompletionModel(QStringListModel):
+    """Ranked task names completing a text, shared by every task name editor.
+
+    The uses of task names are loaded once, then kept up to date with the
+    changes of tasks, so that opening an editor does not query the database.
+    """
+
+    # maximum number of completions.
+    LIMIT = 50
+
+    def __init__(self, parent=None):
+        """Construct an empty completion model."""
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self._index = CompletionIndex()
+        self._loaded = False
+
+    @property
+    def loaded(self):
+        """Get whether the task name uses are loaded."""
+        return self._loaded
+
+    def load(self):
+        """Load the uses of every task name."""
+        self.__set_index(self.load_index())
+
+    @staticmethod
+    def load_index():
+        """Index the uses of every task name, without changing the model."""
+        return CompletionIndex(get_task_name_uses())
+
+    def set_index(self, index):
+        """Set the index of the uses loaded in the background, if not loaded.
+
+        An editor may have loaded the uses meanwhile, and its index has the
+        uses recorded since, that the background index misses.
+        """
+        if self._loaded:
+            self.logger.info('Task names already loaded, index ignored')
+            return
+        self.__set_index(index)
+
+    def __set_index(self, index):
+        """Set the index of the loaded uses."""
+        self._index = index
+        self._loaded = True
+        self.setStringList([])
+        self.logger.info('Loaded %s task names to complete', len(self._index))
+
+    def complete(self, text):
+        """Show the task names matching a text, most used first."""
+        self.setStringList(self._index.complete(
+            text, SettingModel.completion_match(), self.LIMIT))
+
+    def apply(self, old_task, new_task):
+        """Apply the change of a task, the new task may use a name."""
+        if new_task is not None and (
+                old_task is None
+                or old_task[TaskColumn.Task] != new_task[TaskColumn.Task]):
+            self._index.use(new_task[TaskColumn.Task])
@@ -18,33 +18,77 @@
 """Task counter day model."""
 
 import logging
+from bisect import bisect_right
+from contextlib import ExitStack, contextmanager
+from datetime import time
 
-from PyQt5.QtCore import QAbstractTableModel, Qt, QTime, QVariant
-from PyQt5.QtGui import QBrush, QColor
+from PyQt5.QtCore import (QAbstractTableModel, QModelIndex, Qt, QTime,
+                          QTimer, QVariant, pyqtSignal, pyqtSlot)
+from PyQt5.QtGui import QBrush
 
-from taskcounter.db import SQL, Day, IntegrityError, Task, fn
+from taskcounter import DEBUG
+from taskcounter.db import (DB, SQL, DatabaseError, Day, IntegrityError,
+                            Task, fn, instrumented)
 from taskcounter.enum import TaskColumn
-from taskcounter.utility import contrast_color
-from taskcounter.model import SettingModel
+from taskcounter.model import ColorModel, IntervalIndex, SettingModel
 
 
 class DayModel(QAbstractTableModel):
     """Wrapper for the day model."""
 
-    def __init__(self, date_, week, parent=None):
-        """Construct a day wrapper object."""
+    # emitted with the cached rows of a task before and after a change, the
+    # row before is None on creation, the row after is None on deletion.
+    task_changed = pyqtSignal(object, object)
+
+    # emitted with the rows of the tasks a rejected time edit overlaps.
+    overlap_rejected = pyqtSignal(list)
+
+    # emitted when the writes of a window cannot be committed, they are
+    # rolled back and the tasks are read again from the database.
+    write_failed = pyqtSignal()
+
+    # alignment of each column.
+    ALIGNMENTS = (Qt.AlignCenter | Qt.AlignVCenter,
+                  Qt.AlignLeft | Qt.AlignVCenter,
+                  Qt.AlignCenter | Qt.AlignVCenter,
+                  Qt.AlignCenter | Qt.AlignVCenter)
+
+    # writes made within this delay in milliseconds share one transaction,
+    # zero commits every write.
+    WRITE_WINDOW = 500
+
+    def __init__(self, date_, week, parent=None, day_id=None, tasks=None):
+        """Construct a day wrapper object, from prefetched tasks if any."""
         super().__init__(parent)
         self.logger = logging.getLogger(__name__)
-        self._day = Day.get_or_create(date=date_,
-                                      week=week)[0]
+        if day_id is None:
+            self._day = Day.get_or_create(date=date_,
+                                          week=week)[0]
+        else:
+            # the day already exists.
+            self._day = Day(id=day_id, date=date_, week=week)
         self._cached_data = None
-        self.__cache_data()
+        self._rendered_data = None
+        self._valid_brushes = None
+        self._invalid_brushes = None
+        self._interval_index = None
+        self._write_transaction = None
+        self._write_timer = QTimer(self)
+        self._write_timer.setSingleShot(True)
+        self._write_timer.setInterval(self.WRITE_WINDOW)
+        self._write_timer.timeout.connect(self.flush_writes)
+        self.__cache_data(tasks)
 
     @property
     def week(self):
         """Get the week property."""
         return self._day.week
 
+    @property
+    def week_id(self):
+        """Get the week id property."""
+        return self._day.week_id
+
     @property
     def date(self):
         """Get the date property."""
@@ -58,33 +102,104 @@ class DayModel(QAbstractTableModel):
         """Return the number of columns under the given parent."""
         return len(TaskColumn)
 
-    def __cache_data(self):
-        """Cache data."""
-        self._cached_data = {}
-
-        # ensure that null start_time appears in last positions
-        for counter, task in enumerate(Task.select(Task.id, Task.name,
-                                                   Task.start_time,
-                                                   Task.end_time)
-                                       .join(Day)
-                                       .where(Task.day == self._day)
-                                       .order_by(SQL(
-                                           "IFNULL(start_time, '24:00')"
-                                       ))):
-            row = {
-                TaskColumn.Id: task.id,
-                TaskColumn.Task: task.name,
-                TaskColumn.Start_Time: task.start_time,
-                TaskColumn.End_Time: task.end_time
-            }
-            self._cached_data[counter] = row
-            self.logger.debug('Cached data: %s', self._cached_data)
+    def __cache_data(self, tasks=None):
+        """Cache data, or the given sorted task rows."""
+        if tasks is not None:
+            self._cached_data = tasks
+        else:
+            self._cached_data = []
+            # ensure that null start_time appears in last positions
+            for task in (Task.select(Task.id, Task.name,
+                                     Task.start_time, Task.end_time)
+                         .join(Day)
+                         .where(Task.day == self._day)
+                         .order_by(SQL("IFNULL(start_time, '24:00')"))):
+                row = {
+                    TaskColumn.Id: task.id,
+                    TaskColumn.Task: task.name,
+                    TaskColumn.Start_Time: task.start_time,
+                    TaskColumn.End_Time: task.end_time
+                }
+                self._cached_data.append(row)
+            if DEBUG:
+                self.logger.debug('Cached data: %s', self._cached_data)
+
+        self._interval_index = IntervalIndex(
+            (task[TaskColumn.Id], task[TaskColumn.Start_Time],
+             task[TaskColumn.End_Time]) for task in self._cached_data
+            if task[TaskColumn.Start_Time] and task[TaskColumn.End_Time])
+
+        self.__render_data()
+
+    @staticmethod
+    def __sort_key(task):
+        """Get the sort key of a task, null start times in last positions."""
+        start = task[TaskColumn.Start_Time]
+        return (start is None, start or time.min)
+
+    def __render_data(self):
+        """Precompute the data of every row, for every role."""
+        valid_color = SettingModel.valid_color()
+        invalid_color = SettingModel.invalid_color()
+        # brushes are shared between rows.
+        self._valid_brushes = (
+            QBrush(valid_color),
+            QBrush(ColorModel.contrast_color(valid_color)))
+        self._invalid_brushes = (
+            QBrush(invalid_color),
+            QBrush(ColorModel.contrast_color(invalid_color)))
+
+        self._rendered_data = [self.__render_task(task)
+                               for task in self._cached_data]
+        # the last row, to create a new task.
+        self._rendered_data.append({Qt.TextAlignmentRole: self.ALIGNMENTS})
+
+    def __render_task(self, task):
+        """Get the data of a task, for every role and every column."""
+        task_id = int(task[TaskColumn.Id])
+        name = str(task[TaskColumn.Task])
+        start = task[TaskColumn.Start_Time]
+        end = task[TaskColumn.End_Time]
+
+        times = []
+        edit_times = []
+        for value in (start, end):
+            if value is None:
+                times.append(QVariant())
+                edit_times.append(QTime(0, 0))
+            else:
+                a_time = QTime(value.hour, value.minute, value.second)
+                times.append(a_time)
+                edit_times.append(a_time)
+
+        valid = bool(start and end and start < end)
+        background, foreground = (self._valid_brushes if valid
+                                  else self._invalid_brushes)
+
+        return {
+            Qt.DisplayRole: (task_id, name, *times),
+            Qt.EditRole: (task_id, name, *edit_times),
+            # html text allows automatic word-wrapping on tooltip.
+            Qt.ToolTipRole: (task_id, '<html>{}</html>'.format(name),
+                             *times),
+            Qt.BackgroundRole: (background,) * len(TaskColumn),
+            Qt.ForegroundRole: (foreground,) * len(TaskColumn),
+            Qt.TextAlignmentRole: self.ALIGNMENTS,
+        }
+
+    def update_rendering(self):
+        """Render the data again, when colors have changed."""
+        self.__render_data()
+        self.dataChanged.emit(self.index(0, 0),
+                              self.index(self.rowCount() - 1,
+                                         self.columnCount() - 1),
+                              [Qt.BackgroundRole, Qt.ForegroundRole])
 
     def get_cached_data(self, row, column):
         """Get the cached data for a given row and column."""
         try:
             return self._cached_data[row][column]
-        except KeyError:
+        except IndexError:
             return ''
 
     def data(self, index, role=None):
@@ -96,55 +211,12 @@ class DayModel(QAbstractTableModel):
         if not index.isValid():
             return QVariant()
 
-        row = index.row()
-        column = index.column()
-        if role in (Qt.DisplayRole, Qt.EditRole, Qt.ToolTipRole):
-            try:
-                value = self._cached_data[row][TaskColumn(column)]
-            except KeyError:
-                return QVariant()
-            else:
-                if column == TaskColumn.Id.value:
-                    return int(value)
-                elif column == TaskColumn.Task.value:
-                    if role == Qt.ToolTipRole:
-                        # html text allows automatic word-wrapping on tooltip.
-                        return '<html>{}</html>'.format(str(value))
-                    else:
-                        return str(value)
-                elif column in (TaskColumn.Start_Time.value,
-                                TaskColumn.End_Time.value):
-                    try:
-                        a_time = QTime(value.hour, value.minute, value.second)
-                        return QVariant(a_time)
-                    except AttributeError:
-                        if role == Qt.EditRole:
-                            return QVariant(QTime(0, 0))
-                        else:
-                            return QVariant()
-        elif role in (Qt.BackgroundRole, Qt.ForegroundRole):
-            try:
-                start = self._cached_data[row][TaskColumn.Start_Time]
-                end = self._cached_data[row][TaskColumn.End_Time]
-                background_color = SettingModel.valid_color()
-                if role == Qt.BackgroundRole:
-                    if not start or not end or start >= end:
-                        background_color = SettingModel.invalid_color()
-                    return QBrush(background_color)
-                elif role == Qt.ForegroundRole:
-                    text_color = contrast_color(background_color.name())
-                    return QBrush(QColor(text_color))
-            except KeyError:
-                pass
-
-        elif role == Qt.TextAlignmentRole:
-            if column == TaskColumn.Task.value:
-                return Qt.AlignLeft | Qt.AlignVCenter
-            else:
-                return Qt.AlignCenter | Qt.AlignVCenter
-
-        return QVariant()
+        try:
+            return self._rendered_data[index.row()][role][index.column()]
+        except (KeyError, IndexError):
+            return QVariant()
 
+    @instrumented
     def setData(self, index, value, role=None):
         """Set the role data for the item at index to value."""
         if role == Qt.EditRole:
@@ -153,68 +225,152 @@ class DayModel(QAbstractTableModel):
 
             field = TaskColumn(column)
 
-            if row in self._cached_data:
+            if row < len(self._cached_data):
                 task_id = self._cached_data[row][TaskColumn.Id]
+                old_task = self._cached_data[row]
 
                 if field == TaskColumn.Task and not value:
+                    self.__open_write_window()
                     if self.delete_task(task_id):
-                        self.__cache_data()
-                        self.layoutAboutToBeChanged.emit()
-                        top_left = self.index(0, 0)
-                        bottom_right = self.index(
-                            self.rowCount() + 1, self.columnCount())
-                        self.dataChanged.emit(top_left, bottom_right,
-                                              [Qt.DisplayRole])
-                        self.layoutChanged.emit()
+                        self.__remove_row(row)
+                        self.task_changed.emit(old_task, None)
                         return True
                 else:
                     if not value:
                         return False
 
-                    if field == TaskColumn.Start_Time:
-                        end = self._cached_data[row][TaskColumn.End_Time]
-                        if end and value >= end:
-                            return False
-                    elif field == TaskColumn.End_Time:
-                        start = self._cached_data[row][TaskColumn.Start_Time]
-                        if start and value <= start:
+                    new_task = dict(old_task)
+                    if field == TaskColumn.Task:
+                        new_task[field] = value
+                    else:
+                        # times are stored without seconds.
+                        new_task[field] = time(value.hour(), value.minute())
+
+                        start = new_task[TaskColumn.Start_Time]
+                        end = new_task[TaskColumn.End_Time]
+                        if start and end and start >= end:
                             return False
-                    if field in (TaskColumn.Start_Time, TaskColumn.End_Time):
-                        if self.__overlaps_other_range(task_id,
-                                                       field, value):
+
+                        overlapping = self.__overlapping_tasks(new_task)
+                        if overlapping:
+                            self.overlap_rejected.emit(
+                                [row for row, task
+                                 in enumerate(self._cached_data)
+                                 if task[TaskColumn.Id] in overlapping])
                             return False
 
+                    self.__open_write_window()
                     if self.update_task(task_id, field, value):
-                        self.__cache_data()
-
-                        self.layoutAboutToBeChanged.emit()
-                        top_left = self.index(0, 0)
-                        bottom_right = self.index(
-                            self.rowCount() + 1, self.columnCount())
-                        self.dataChanged.emit(top_left, bottom_right,
-                                              [Qt.DisplayRole])
-                        self.layoutChanged.emit()
+                        self.__replace_row(row, new_task)
+                        self.task_changed.emit(old_task, new_task)
                         return True
             else:
                 if field == TaskColumn.Task and value:
                     # insert only when task name is not empty
-                    if self.create_task(value):
-                        self.__cache_data()
-
-                        self.layoutAboutToBeChanged.emit()
-
-                        top_left = self.index(0, 0)
-                        bottom_right = self.index(
-                            self.rowCount() + 1, self.columnCount())
-                        self.dataChanged.emit(
-                            top_left, bottom_right, [Qt.DisplayRole])
-
-                        self.layoutChanged.emit()
-
+                    self.__open_write_window()
+                    task_id = self.create_task(value)
+                    if task_id:
+                        new_task = {
+                            TaskColumn.Id: task_id,
+                            TaskColumn.Task: value,
+                            TaskColumn.Start_Time: None,
+                            TaskColumn.End_Time: None
+                        }
+                        self.__insert_row(new_task)
+                        self.task_changed.emit(None, new_task)
                         return True
 
         return False
 
+    def __sorted_row(self, task):
+        """Get the row where a task is sorted, among the cached tasks."""
+        keys = [self.__sort_key(cached) for cached in self._cached_data]
+        return bisect_right(keys, self.__sort_key(task))
+
+    def __insert_row(self, task):
+        """Insert a task in the cached rows, at its sorted position."""
+        row = self.__sorted_row(task)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._cached_data.insert(row, task)
+        self._rendered_data.insert(row, self.__render_task(task))
+        self.endInsertRows()
+
+    def __remove_row(self, row):
+        """Remove a row from the cached rows."""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self._interval_index.remove(self._cached_data[row][TaskColumn.Id])
+        del self._cached_data[row]
+        del self._rendered_data[row]
+        self.endRemoveRows()
+
+    def __replace_row(self, row, task):
+        """Replace the task of a row, moving it when its start time has
+        changed its position."""
+        old_task = self._cached_data[row]
+        self._interval_index.remove(task[TaskColumn.Id])
+        if task[TaskColumn.Start_Time] and task[TaskColumn.End_Time]:
+            self._interval_index.add(task[TaskColumn.Id],
+                                     task[TaskColumn.Start_Time],
+                                     task[TaskColumn.End_Time])
+
+        new_row = row
+        if (task[TaskColumn.Start_Time]
+                != old_task[TaskColumn.Start_Time]):
+            del self._cached_data[row]
+            new_row = self.__sorted_row(task)
+            self._cached_data.insert(row, old_task)
+
+        if new_row != row:
+            # destination is given in rows before the move.
+            destination = new_row + 1 if new_row > row else new_row
+            self.beginMoveRows(QModelIndex(), row, row,
+                               QModelIndex(), destination)
+            del self._cached_data[row]
+            del self._rendered_data[row]
+            self._cached_data.insert(new_row, task)
+            self._rendered_data.insert(new_row, self.__render_task(task))
+            self.endMoveRows()
+        else:
+            self._cached_data[row] = task
+            self._rendered_data[row] = self.__render_task(task)
+
+        self.dataChanged.emit(self.index(new_row, 0),
+                              self.index(new_row, self.columnCount() - 1))
+
+    def __open_write_window(self):
+        """Open a transaction for the writes made until the window ends."""
+        if (self.WRITE_WINDOW > 0 and self._write_transaction is None
+                and not DB.in_transaction()):
+            self._write_transaction = ExitStack()
+            self._write_transaction.enter_context(DB.atomic())
+            self._write_timer.start()
+
+    @pyqtSlot()
+    @instrumented
+    def flush_writes(self):
+        """Commit the writes of the current window."""
+        self._write_timer.stop()
+        if self._write_transaction is not None:
+            self.logger.debug('Commit writes of the window')
+            try:
+                self._write_transaction.close()
+            except DatabaseError:
+                self.logger.exception('Unable to commit writes of the window')
+                DB.rollback()
+                self.beginResetModel()
+                self.__cache_data()
+                self.endResetModel()
+                self.write_failed.emit()
+            finally:
+                self._write_transaction = None
+
+    @contextmanager
+    def batch(self):
+        """Group the writes made in the block into one transaction."""
+        self.flush_writes()
+        with DB.atomic():
+            yield
+
     def headerData(self, section, orientation, role=None):
         """Return the header data.
 
@@ -264,14 +420,14 @@ class DayModel(QAbstractTableModel):
         return query.execute() > 0
 
     def create_task(self, task_name):
-        """Create a task for a given task name."""
+        """Create a task for a given task name, return its id."""
         try:
             query = Task.insert(name=task_name, day=self._day)
             self.logger.debug('Executing query: %s', query.sql())
             # pylint: disable=locally-disabled,E1120
-            return query.execute() > 0
+            return query.execute()
         except IntegrityError:
-            return False
+            return None
 
     @property
     def last_task_cell_index(self):
@@ -281,55 +437,20 @@ class DayModel(QAbstractTableModel):
     @property
     def minutes_of_day(self):
         """Get the total time in minutes of today's tasks."""
-        minutes = (Task.select(fn.SUM((fn.strftime('%s', Task.end_time)
-                                       - fn.strftime('%s', Task.start_time))
-                                      .cast('real') / 60).alias('sum')
-                               )
+        minutes = (Task.select((fn.SUM(Task.duration) / 60.0)
+                               .alias('sum'))
                    .where((Task.day == self._day)
-                          & Task.start_time.is_null(False)
-                          & Task.end_time.is_null(False)
+                          & Task.duration.is_null(False)
                           )
                    .scalar())
-        self.logger.debug('Minutes of day: %s', minutes)
+        if DEBUG:
+            self.logger.debug('Minutes of day: %s', minutes)
         return minutes or 0
 
-    def __overlaps_other_range(self, task_id, field, value):
-        """Check range overlaps another range."""
-        if not self._cached_data:
-            return False
-
-        start_time = None
-        end_time = None
-        # find start and end times of task_id.
-        for r in self._cached_data:
-            if self._cached_data[r][TaskColumn.Id] == task_id:
-                if field == TaskColumn.Start_Time:
-                    start_time = value
-                    end_time = self._cached_data[r][TaskColumn.End_Time]
-                if field == TaskColumn.End_Time:
-                    start_time = self._cached_data[r][TaskColumn.Start_Time]
-                    end_time = value
-                break
-
-        # check new value is not in another range and current range does not
-        # overlap another start or end time.
-        for r in self._cached_data:
-            if self._cached_data[r][TaskColumn.Id] != task_id:
-
-                if (self._cached_data[r][TaskColumn.Start_Time]
-                        and self._cached_data[r][TaskColumn.End_Time]):
-
-                    if (self._cached_data[r][TaskColumn.Start_Time] < value
-                            < self._cached_data[r][TaskColumn.End_Time]):
-                        return True
-
-                    if (start_time and end_time
-                        and (start_time
-                             < self._cached_data[r][TaskColumn.Start_Time]
-                             < end_time
-                             or start_time
-                             < self._cached_data[r][TaskColumn.End_Time]
-                             < end_time)):
-                        return True
-
-        return False
+    def __overlapping_tasks(self, task):
+        """Get the ids of the other tasks overlapping the range of a task."""
+        start = task[TaskColumn.Start_Time]
+        end = task[TaskColumn.End_Time]
+        # a lone start or end time must not be inside another range.
+        return self._interval_index.overlapping(start or end, end or start,
+                                                exclude=task[TaskColumn.Id])
@@ -0,0 +1,86 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter interval index."""
+
+from bisect import bisect_left, bisect_right
+
+
+class IntervalIndex:
+    """Sorted index of half-open [start, end) intervals.
+
+    Intervals are sorted by start, along with the running maximum of their
+    ends, so that the intervals which may overlap a range are found by two
+    binary searches.
+    """
+
+    def __init__(self, intervals=()):
+        """Construct an interval index from (key, start, end) tuples."""
+        self._starts = []
+        self._ends = []
+        self._keys = []
+        self._max_ends = []
+        for key, start, end in sorted(intervals,
+                                      key=lambda interval: interval[1]):
+            self._starts.append(start)
+            self._ends.append(end)
+            self._keys.append(key)
+        self.__update_max_ends(0)
+
+    def __len__(self):
+        """Get the number of intervals."""
+        return len(self._keys)
+
+    def __contains__(self, key):
+        """Check an interval is indexed for a key."""
+        return key in self._keys
+
+    def __update_max_ends(self, position):
+        """Update the running maximum of ends from a position."""
+        del self._max_ends[position:]
+        for end in self._ends[position:]:
+            if self._max_ends:
+                end = max(end, self._max_ends[-1])
+            self._max_ends.append(end)
+
+    def add(self, key, start, end):
+        """Add the interval of a key."""
+        position = bisect_right(self._starts, start)
+        self._starts.insert(position, start)
+        self._ends.insert(position, end)
+        self._keys.insert(position, key)
+        self.__update_max_ends(position)
+
+    def remove(self, key):
+        """Remove the interval of a key, if any."""
+        try:
+            position = self._keys.index(key)
+        except ValueError:
+            return
+        del self._starts[position]
+        del self._ends[position]
+        del self._keys[position]
+        self.__update_max_ends(position)
+
+    def overlapping(self, start, end, exclude=None):
+        """Get the keys of the intervals overlapping [start, end)."""
+        # intervals starting before end, with an end after start.
+        last = bisect_left(self._starts, end)
+        first = bisect_right(self._max_ends, start, 0, last)
+        return [self._keys[position] for position in range(first, last)
+                if self._ends[position] > start
+                and self._keys[position] != exclude]
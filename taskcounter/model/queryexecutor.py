@@ -0,0 +1,127 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter asynchronous query executor."""
+
+import logging
+
+from PyQt5.QtCore import (QCoreApplication, QObject, QThread, pyqtSignal,
+                          pyqtSlot)
+
+from taskcounter.db import DB, instrumented
+
+
+class _QueryWorker(QObject):
+    """Run queries on the thread it has been moved to."""
+
+    done = pyqtSignal(object, int, object)
+    error = pyqtSignal(object, int)
+
+    def __init__(self, executor):
+        """Construct a query worker for an executor."""
+        super().__init__()
+        self.executor = executor
+
+    @pyqtSlot(object, int, object, object)
+    @instrumented
+    def run(self, key, generation, function, args):
+        """Run a request, unless it has been superseded or cancelled."""
+        logger = logging.getLogger(__name__)
+        if not self.executor.is_current(key, generation):
+            logger.debug('Skip superseded request: %s', key)
+            return
+        try:
+            result = function(*args)
+        except Exception:
+            logger.error('Unable to run request: %s', key, exc_info=True)
+            self.error.emit(key, generation)
+        else:
+            self.done.emit(key, generation, result)
+
+    @pyqtSlot()
+    def close_connection(self):
+        """Close the connection of the worker thread."""
+        if not DB.is_closed():
+            DB.close()
+
+
+class QueryExecutor(QObject):
+    """Run read-only queries on a worker thread with its own connection.
+
+    Requests are identified by a key. A request supersedes the previous
+    requests with the same key: those still waiting are skipped, and the
+    results of the running one are dropped. Results are delivered to the
+    GUI thread with queued signals.
+    """
+
+    # emitted with the key and the result of the last request of a key.
+    finished = pyqtSignal(object, object)
+    # emitted with the key of the last request of a key, when it fails.
+    failed = pyqtSignal(object)
+
+    _requested = pyqtSignal(object, int, object, object)
+
+    def __init__(self, parent=None):
+        """Construct a query executor and start its worker thread."""
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self._generations = {}
+        self._thread = QThread(self)
+        self._worker = _QueryWorker(self)
+        self._worker.moveToThread(self._thread)
+        self._requested.connect(self._worker.run)
+        self._worker.done.connect(self.__done)
+        self._worker.error.connect(self.__error)
+        self._thread.finished.connect(self._worker.close_connection)
+        self._thread.start()
+        if QCoreApplication.instance():
+            QCoreApplication.instance().aboutToQuit.connect(self.stop)
+
+    def submit(self, key, function, *args):
+        """Run function with args on the worker thread, for a key."""
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        self._requested.emit(key, generation, function, args)
+
+    def cancel(self, key):
+        """Cancel the requests of a key."""
+        self._generations[key] = self._generations.get(key, 0) + 1
+
+    def is_current(self, key, generation):
+        """Check a request is the last one of its key."""
+        return self._generations.get(key) == generation
+
+    def stop(self):
+        """Cancel all requests, and wait for the worker thread to end."""
+        for key in self._generations:
+            self.cancel(key)
+        self._thread.quit()
+        self._thread.wait()
+
+    @pyqtSlot(object, int, object)
+    def __done(self, key, generation, result):
+        """Deliver the result of a request, unless superseded."""
+        if self.is_current(key, generation):
+            self.finished.emit(key, result)
+        else:
+            self.logger.debug('Drop superseded result: %s', key)
+
+    @pyqtSlot(object, int)
+    def __error(self, key, generation):
+        """Deliver the failure of a request, unless superseded."""
+        if self.is_current(key, generation):
+            self.failed.emit(key)
@@ -18,28 +18,78 @@
 """Task counter setting model."""
 
 
+import io
 import logging
 import pickle
-
-from PyQt5.QtCore import QTime
-from PyQt5.QtGui import QColor
+from collections import namedtuple
+from datetime import time
 
 from taskcounter.db import IntegrityError, Setting
+from taskcounter.db.instrumentation import QueryInstrumentation
+from taskcounter.db.model import DEFAULT_PRAGMA_PROFILE
+from taskcounter.model.completionindex import CompletionIndex
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'size'])
+
+
+class _TimeUnpickler(pickle.Unpickler):
+    """Unpickler loading a pickled QTime as a time, without Qt."""
+
+    def find_class(self, module, name):
+        """Get the time class for QTime, constructed with the same hours,
+        minutes, seconds and milliseconds, refuse any other class."""
+        if (module, name) == ('PyQt5.QtCore', 'QTime'):
+            return time
+        raise pickle.UnpicklingError('Not a time: {}.{}'.format(module, name))
 
 
 class SettingModel:
-    """Wrapper for the setting model."""
+    """Wrapper for the setting model.
+
+    Values are cached for the whole process, a cached value is invalidated
+    when the setting is written. Qt is imported by the getters of Qt values
+    only, so that the other settings are read without Qt.
+    """
 
     WEEK_TIME_PROPERTY = 'default_week_time'
     MAN_DAY_TIME_PROPERTY = 'default_man_day_time'
     INVALID_COLOR_PROPERTY = 'invalid_color'
     VALID_COLOR_PROPERTY = 'valid_color'
     CURRENT_CELL_COLOR_PROPERTY = 'current_cell_color'
+    DATABASE_PROFILE_PROPERTY = 'database_profile'
+    WEEK_CACHE_SIZE_PROPERTY = 'week_cache_size'
+    REFRESH_DELAY_PROPERTY = 'refresh_delay'
+    SLOW_QUERY_THRESHOLD_PROPERTY = 'slow_query_threshold'
+    COMPLETION_MATCH_PROPERTY = 'completion_match'
 
-    @staticmethod
-    def insert_or_update(name, value):
+    DEFAULT_MAN_DAY_MINUTES = 7 * 60
+
+    _cache = {}
+    _hits = 0
+    _misses = 0
+
+    @classmethod
+    def load_cache(cls):
+        """Load all the settings in the cache."""
+        logger = logging.getLogger(__name__)
+        cls._cache = {}
+        cls._hits = 0
+        cls._misses = 0
+        for name, hex_value in Setting.select(Setting.name,
+                                              Setting.value).tuples():
+            cls._cache[name] = cls.__load_value(name, hex_value)
+        logger.info('Loaded %s settings in cache', len(cls._cache))
+
+    @classmethod
+    def cache_info(cls):
+        """Get the cache hits, misses and size."""
+        return CacheInfo(cls._hits, cls._misses, len(cls._cache))
+
+    @classmethod
+    def insert_or_update(cls, name, value):
         """Insert or update a value for a named setting."""
         logger = logging.getLogger(__name__)
+        cls._cache.pop(name, None)
         dump = pickle.dumps(value).hex()
         try:
             Setting.create(name=name, value=dump)
@@ -50,15 +100,32 @@ class SettingModel:
             logger.debug('Query: %s', query.sql())
             query.execute()
 
-    @staticmethod
-    def get_value(name):
+    @classmethod
+    def get_value(cls, name):
         """Get value for a named setting."""
+        try:
+            value = cls._cache[name]
+        except KeyError:
+            cls._misses += 1
+        else:
+            cls._hits += 1
+            return value
+
         logger = logging.getLogger(__name__)
         logger.debug('Get value for setting: %s', name)
-        value = None
         hex_value = (Setting.select(Setting.value)
                             .where(Setting.name == name)
                             .scalar())
+        # missing settings are cached too, as None.
+        value = cls.__load_value(name, hex_value)
+        cls._cache[name] = value
+        return value
+
+    @staticmethod
+    def __load_value(name, hex_value):
+        """Load a value from its hexadecimal pickle dump."""
+        logger = logging.getLogger(__name__)
+        value = None
         if hex_value:
             try:
                 bytes_value = bytes.fromhex(hex_value)
@@ -83,7 +150,26 @@ class SettingModel:
     @classmethod
     def default_man_day_time(cls):
         """Get the default man day time."""
-        return cls.get_value(cls.MAN_DAY_TIME_PROPERTY) or QTime(7, 0)
+        from PyQt5.QtCore import QTime
+        return (cls.get_value(cls.MAN_DAY_TIME_PROPERTY)
+                or QTime(*divmod(cls.DEFAULT_MAN_DAY_MINUTES, 60)))
+
+    @classmethod
+    def default_man_day_minutes(cls):
+        """Get the default man day time in minutes, read without Qt."""
+        logger = logging.getLogger(__name__)
+        hex_value = (Setting.select(Setting.value)
+                            .where(Setting.name == cls.MAN_DAY_TIME_PROPERTY)
+                            .scalar())
+        if hex_value:
+            try:
+                man_day_time = _TimeUnpickler(
+                    io.BytesIO(bytes.fromhex(hex_value))).load()
+                return man_day_time.hour * 60 + man_day_time.minute
+            except (pickle.PickleError, TypeError, ValueError):
+                logger.error('Error when reading setting: %s',
+                             cls.MAN_DAY_TIME_PROPERTY)
+        return cls.DEFAULT_MAN_DAY_MINUTES
 
     @classmethod
     def set_default_man_day_time(cls, default_man_day_time):
@@ -94,6 +180,7 @@ class SettingModel:
     @classmethod
     def invalid_color(cls):
         """Get the invalid color setting."""
+        from PyQt5.QtGui import QColor
         return (cls.get_value(cls.INVALID_COLOR_PROPERTY) or
                 QColor('#FFCDD2'))
 
@@ -105,6 +192,7 @@ class SettingModel:
     @classmethod
     def valid_color(cls):
         """Get the valid color setting."""
+        from PyQt5.QtGui import QColor
         return (cls.get_value(cls.VALID_COLOR_PROPERTY) or
                 QColor('#DAF7A6'))
 
@@ -116,6 +204,7 @@ class SettingModel:
     @classmethod
     def current_cell_color(cls):
         """Get the current cell color setting."""
+        from PyQt5.QtGui import QColor
         return (cls.get_value(cls.CURRENT_CELL_COLOR_PROPERTY) or
                 QColor('#fffd88'))
 
@@ -124,3 +213,58 @@ class SettingModel:
         """Set the current cell color setting."""
         cls.insert_or_update(cls.CURRENT_CELL_COLOR_PROPERTY,
                              current_cell_color)
+
+    @classmethod
+    def database_profile(cls):
+        """Get the database pragma profile setting."""
+        return (cls.get_value(cls.DATABASE_PROFILE_PROPERTY) or
+                DEFAULT_PRAGMA_PROFILE)
+
+    @classmethod
+    def set_database_profile(cls, database_profile):
+        """Set the database pragma profile setting, used on next start."""
+        cls.insert_or_update(cls.DATABASE_PROFILE_PROPERTY, database_profile)
+
+    @classmethod
+    def week_cache_size(cls):
+        """Get the number of recently visited weeks kept in memory."""
+        size = cls.get_value(cls.WEEK_CACHE_SIZE_PROPERTY)
+        return 8 if size is None else size
+
+    @classmethod
+    def set_week_cache_size(cls, week_cache_size):
+        """Set the number of recently visited weeks, used on next start."""
+        cls.insert_or_update(cls.WEEK_CACHE_SIZE_PROPERTY, week_cache_size)
+
+    @classmethod
+    def refresh_delay(cls):
+        """Get the delay in milliseconds to coalesce counter refreshes."""
+        return cls.get_value(cls.REFRESH_DELAY_PROPERTY) or 0
+
+    @classmethod
+    def set_refresh_delay(cls, refresh_delay):
+        """Set the delay to coalesce counter refreshes, used on next start."""
+        cls.insert_or_update(cls.REFRESH_DELAY_PROPERTY, refresh_delay)
+
+    @classmethod
+    def slow_query_threshold(cls):
+        """Get the time in milliseconds from which a query is slow."""
+        return (cls.get_value(cls.SLOW_QUERY_THRESHOLD_PROPERTY) or
+                QueryInstrumentation.DEFAULT_SLOW_THRESHOLD * 1000)
+
+    @classmethod
+    def set_slow_query_threshold(cls, slow_query_threshold):
+        """Set the time from which a query is slow, used on next start."""
+        cls.insert_or_update(cls.SLOW_QUERY_THRESHOLD_PROPERTY,
+                             slow_query_threshold)
+
+    @classmethod
+    def completion_match(cls):
+        """Get how task names match the text: prefix, substring or fuzzy."""
+        return (cls.get_value(cls.COMPLETION_MATCH_PROPERTY) or
+                CompletionIndex.PREFIX)
+
+    @classmethod
+    def set_completion_match(cls, completion_match):
+        """Set how task names match the typed text."""
+        cls.insert_or_update(cls.COMPLETION_MATCH_PROPERTY, completion_match)
@@ -21,6 +21,7 @@ import logging
 
 from PyQt5.QtCore import QAbstractTableModel, Qt, QVariant
 
+from taskcounter import DEBUG
 from taskcounter.enum import ResultColumn
 from taskcounter.utility import minutes_to_time_str, minutes_to_decimal_time_str
 
@@ -47,7 +48,8 @@ class SummaryModel(QAbstractTableModel):
     @property
     def tasks(self):
         """Get the tasks."""
-        self.logger.debug('Get tasks: %s', self._tasks)
+        if DEBUG:
+            self.logger.debug('Get tasks: %s', self._tasks)
         return self._tasks
 
     @tasks.setter
@@ -55,7 +57,8 @@ class SummaryModel(QAbstractTableModel):
         """Set the tasks."""
         self.layoutAboutToBeChanged.emit()
 
-        self.logger.debug('Set tasks: %s', self._tasks)
+        if DEBUG:
+            self.logger.debug('Set tasks: %s', self._tasks)
         self._tasks = tasks
 
         top_left = self.index(0, 0)
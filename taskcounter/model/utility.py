@@ -19,39 +19,87 @@
 
 import logging
 
-from datetime import date, timedelta
+from datetime import date
 
-from taskcounter.db import Day, Task, Week, fn
+from taskcounter.db import SQL, Day, Task, Week, fn
+from taskcounter.enum import ResultColumn
 
 
-def get_last_unique_task_names():
-    """Return the last unique task names since last three months."""
+def get_task_name_uses():
+    """Return the name, use count and last use date of every task name."""
     logger = logging.getLogger(__name__)
 
-    last_3_months = date.today() + timedelta(days=-90)
-    logger.debug('Last unique task names period: %s', last_3_months)
-    tasks = (tuple(x.name for x in Task.select(Task.name)
-                   .join(Day)
-                   .distinct()
-                   .where(Day.date > last_3_months)
-                   .order_by(Task.name)))
-    logger.debug('Last unique task names: %s', tasks)
-    return tasks
+    uses = tuple(Task.select(Task.name, fn.COUNT(Task.id),
+                             fn.MAX(Day.date).coerce(False))
+                 .join(Day)
+                 .group_by(Task.name)
+                 .tuples())
+    logger.debug('Task name uses: %s', len(uses))
+    return tuple((name, count, date.fromisoformat(last_date))
+                 for name, count, last_date in uses)
 
 
 def get_total_annual_worked_hours(_year):
     """Get the total time worked in hours of `_year`."""
     logger = logging.getLogger(__name__)
 
-    minutes = (Task.select(fn.SUM((fn.strftime('%s', Task.end_time)
-                                   - fn.strftime('%s', Task.start_time))
-                                  .cast('real') / 60).alias('sum')
-                           ).join(Day)
+    minutes = (Task.select((fn.SUM(Task.duration) / 60.0)
+                           .alias('sum')).join(Day)
                .join(Week)
                .where((Week.year == int(_year))
-                      & Task.start_time.is_null(False)
-                      & Task.end_time.is_null(False)
+                      & Task.duration.is_null(False)
                       )
                .scalar())
     logger.debug('Get total time of year: %s', minutes)
     return max(int(minutes / 60), 0) if minutes is not None else 0
+
+
+def get_week_summary(week, man_day_minutes):
+    """Get the summary (tasks and total time in minutes) of a week."""
+    return summary_from_rows(man_day_minutes,
+                             summary_query(Day.week == week))
+
+
+def get_daily_summary(day_date, man_day_minutes):
+    """Get the summary (tasks and total time in minutes) of a date."""
+    return summary_from_rows(man_day_minutes,
+                             summary_query(Day.date == day_date))
+
+
+def get_annual_summary(_year, man_day_minutes):
+    """Get the summary (tasks and total time in minutes) of the weeks of
+    `_year`."""
+    return summary_from_rows(man_day_minutes,
+                             summary_query(Week.year == int(_year))
+                             .switch(Day).join(Week))
+
+
+def summary_query(days):
+    """Get the rows of task name and total time in minutes of days, the
+    longest first."""
+    return (Task.select(Task.name,
+                        (fn.SUM(Task.duration) / 60.0)
+                        .alias('sum'))
+            .join(Day)
+            .where(days & Task.duration.is_null(False))
+            .group_by(Task.name)
+            .order_by(SQL('sum').desc())
+            .tuples())
+
+
+def summary_from_rows(man_day_minutes, rows):
+    """Return the summary (tasks and total time in minutes) from rows of
+    task name and total time in minutes."""
+    return {counter: summary_task(man_day_minutes, name, minutes)
+            for counter, (name, minutes) in enumerate(rows)}
+
+
+def summary_task(man_day_minutes, name, minutes):
+    """Return the summary of a task name from its total time in minutes."""
+    task = {ResultColumn.Task: name, ResultColumn.Time: minutes,
+            ResultColumn.Decimal_Time: minutes}
+    if man_day_minutes:
+        task[ResultColumn.Man_Day] = round(minutes / man_day_minutes, 2)
+    else:
+        task[ResultColumn.Man_Day] = ''
+    return task
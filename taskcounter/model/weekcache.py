@@ -0,0 +1,102 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter week cache."""
+
+import logging
+from collections import OrderedDict, namedtuple
+
+from taskcounter.model import WeekModel, WeekPrefetcher
+from taskcounter.utility import next_week, previous_week
+
+WeekCacheInfo = namedtuple('WeekCacheInfo',
+                           ['hits', 'misses', 'evictions', 'size',
+                            'max_size'])
+
+
+class WeekCache:
+    """Least recently used week models, by year and week number.
+
+    The day models of a cached week are the only writers of its tasks, so
+    they stay in sync with the database. A week changed by other means
+    must be invalidated. Weeks which are not cached are built from
+    prefetched rows when available.
+    """
+
+    def __init__(self, max_size, parent=None):
+        """Construct a week cache keeping at most max_size weeks."""
+        self.logger = logging.getLogger(__name__)
+        self.parent = parent
+        self._max_size = max(1, max_size)
+        self._weeks = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self.prefetcher = WeekPrefetcher(parent)
+
+    def get(self, year, week_number):
+        """Get the week model of a year and a week number."""
+        key = (year, week_number)
+        if key in self._weeks:
+            self._hits += 1
+            self._weeks.move_to_end(key)
+            return self._weeks[key]
+
+        self._misses += 1
+        rows = self.prefetcher.take(key)
+        # rows loaded from now on may miss the writes of the week model.
+        self.prefetcher.discard(key)
+        week = WeekModel(year, week_number, self.parent, rows=rows)
+        self._weeks[key] = week
+        while len(self._weeks) > self._max_size:
+            evicted_key, evicted_week = self._weeks.popitem(last=False)
+            self._evictions += 1
+            self.logger.debug('Evict week: %s', evicted_key)
+            self.prefetcher.discard(evicted_key)
+            evicted_week.release()
+        return week
+
+    def prefetch_around(self, year, week_number):
+        """Prefetch the weeks before and after a week, when idle."""
+        self.prefetcher.schedule(
+            key for key in (previous_week(year, week_number),
+                            next_week(year, week_number))
+            if key not in self._weeks)
+
+    def invalidate(self, year, week_number):
+        """Remove the week model of a year and a week number."""
+        self.prefetcher.discard((year, week_number))
+        week = self._weeks.pop((year, week_number), None)
+        if week:
+            week.release()
+
+    def clear(self):
+        """Remove all the week models."""
+        for key, week in self._weeks.items():
+            self.prefetcher.discard(key)
+            week.release()
+        self._weeks = OrderedDict()
+
+    def update_rendering(self):
+        """Update the rendering of all the week models."""
+        for week in self._weeks.values():
+            week.update_rendering()
+
+    def cache_info(self):
+        """Get the cache hits, misses, evictions, size and maximum size."""
+        return WeekCacheInfo(self._hits, self._misses, self._evictions,
+                             len(self._weeks), self._max_size)
@@ -19,19 +19,30 @@
 
 import logging
 
-from taskcounter.db import SQL, Day, Task, Week, fn
-from taskcounter.enum import ResultColumn, WeekDay
-from taskcounter.model import DayModel, SettingModel
+from taskcounter import DEBUG
+from taskcounter.db import Day, Task, Week, fn
+from taskcounter.enum import WeekDay
+from taskcounter.model import (DayModel, SettingModel, get_daily_summary,
+                               get_week_summary)
 from taskcounter.utility import seven_days_of_week, weekday_from_date
 
 
 class WeekModel:
     """Wrapper for the week model."""
 
-    def __init__(self, year, week_number, parent=None):
-        """Construct a week wrapper object."""
+    def __init__(self, year, week_number, parent=None, rows=None):
+        """Construct a week wrapper object, from prefetched rows if any."""
         self.logger = logging.getLogger(__name__)
         self.parent = parent
+        self._day_models = {}
+        if rows:
+            self._week = Week(id=rows.week_id, year=year,
+                              week_number=week_number,
+                              minutes_to_work=rows.minutes_to_work)
+            self._day_ids = rows.day_ids
+            self._tasks = rows.tasks
+            return
+
         # get the default work time, to use it as this week value
         default_time = SettingModel.default_week_time()
         self.logger.info('Default time for new week: %s', default_time)
@@ -40,13 +51,20 @@ class WeekModel:
                                         defaults={'minutes_to_work':
                                                   default_time})[0]
         self.logger.debug('Week: %s', self._week)
-        self.__create_days()
+        self._day_ids = self.__create_days()
+        self._tasks = {}
+
+    @property
+    def week_id(self):
+        """Get the database id of this week instance."""
+        return self._week.id
 
     @property
     def minutes_to_work(self):
         """Get work time in minutes of this week instance."""
         minutes = self._week.minutes_to_work
-        self.logger.debug('Get minutes to work: %s', minutes)
+        if DEBUG:
+            self.logger.debug('Get minutes to work: %s', minutes)
         return minutes
 
     @minutes_to_work.setter
@@ -63,36 +81,56 @@ class WeekModel:
         Return a DayModel.
         """
         if week_day in WeekDay:
-            for day in (Day.select(Day)
-                        .join(Week)
-                        .where((Week.week_number == self._week.week_number) &
-                               (Week.year == self._week.year))
-                        .order_by(Day.date)):
-                if week_day is weekday_from_date(day.date):
-                    day_model = DayModel(day.date, day.week, self.parent)
-                    self.logger.debug('Get day model: %s', day_model)
-                    return day_model
+            # day models are created lazily, then reused.
+            if week_day not in self._day_models:
+                for date_, day_id in self._day_ids.items():
+                    if week_day is weekday_from_date(date_):
+                        self._day_models[week_day] = DayModel(
+                            date_, self._week, self.parent, day_id=day_id,
+                            tasks=self._tasks.pop(date_, None))
+                        break
+            day_model = self._day_models.get(week_day)
+            if DEBUG:
+                self.logger.debug('Get day model: %s', day_model)
+            return day_model
         return None
 
     def __create_days(self):
-        """Create the days of this week."""
-        for date_ in seven_days_of_week(self._week.year,
-                                        self._week.week_number):
-            DayModel(date_, self._week, self.parent)
+        """Create the days of this week, return their ids by date."""
+        dates = seven_days_of_week(self._week.year, self._week.week_number)
+        (Day.insert_many([{'date': date_, 'week': self._week}
+                          for date_ in dates])
+         .on_conflict_ignore()
+         .execute())
+        return dict(Day.select(Day.date, Day.id)
+                    .where(Day.week == self._week)
+                    .order_by(Day.date)
+                    .tuples())
+
+    def update_rendering(self):
+        """Update the rendering of the day models of this week."""
+        for day_model in self._day_models.values():
+            day_model.update_rendering()
+
+    def release(self):
+        """Flush the writes of the day models of this week, then delete
+        them."""
+        for day_model in self._day_models.values():
+            day_model.flush_writes()
+            day_model.deleteLater()
+        self._day_models = {}
 
     @property
     def minutes_of_week(self):
         """Get the total time in minutes of week's tasks."""
-        minutes = (Task.select(fn.SUM((fn.strftime('%s', Task.end_time)
-                                       - fn.strftime('%s', Task.start_time))
-                                      .cast('real') / 60).alias('sum')
-                               ).join(Day)
+        minutes = (Task.select((fn.SUM(Task.duration) / 60.0)
+                               .alias('sum')).join(Day)
                    .where((Day.week == self._week)
-                          & Task.start_time.is_null(False)
-                          & Task.end_time.is_null(False)
+                          & Task.duration.is_null(False)
                           )
                    .scalar())
-        self.logger.debug('Get minutes of week: %s', minutes)
+        if DEBUG:
+            self.logger.debug('Get minutes of week: %s', minutes)
         return minutes or 0
 
     @property
@@ -103,8 +141,7 @@ class WeekModel:
                        .where(Week.id
                               .in_(Week.select(Week.id).distinct()
                                    .join(Day).join(Task)
-                                   .where(Task.start_time.is_null(False) &
-                                          Task.end_time.is_null(False))))
+                                   .where(Task.duration.is_null(False))))
                    .scalar())
         self.logger.debug('Get total minutes to work: %s', minutes)
         return minutes or 0
@@ -112,12 +149,9 @@ class WeekModel:
     @property
     def total_time_worked(self):
         """Get the total worked time (minutes) for the entire period."""
-        minutes = (Task.select(fn.SUM((fn.strftime('%s', Task.end_time)
-                                       - fn.strftime('%s', Task.start_time))
-                                      .cast('real') / 60).alias('sum')
-                               )
-                   .where(Task.start_time.is_null(False)
-                          & Task.end_time.is_null(False)
+        minutes = (Task.select((fn.SUM(Task.duration) / 60.0)
+                               .alias('sum'))
+                   .where(Task.duration.is_null(False)
                           )
                    .scalar())
         self.logger.debug('Get total time worked: %s', minutes)
@@ -125,54 +159,14 @@ class WeekModel:
 
     def week_summary(self, man_day_minutes):
         """Get the week summary: tasks and total time in minutes."""
-        query = (Task.select(Task.name,
-                             fn.SUM((fn.strftime('%s', Task.end_time) -
-                                     fn.strftime('%s', Task.start_time))
-                                    .cast('real') / 60).alias('sum')
-                             )
-                 .join(Day)
-                 .where((Day.week == self._week)
-                        & Task.start_time.is_null(False)
-                        & Task.end_time.is_null(False)
-                        )
-                 .group_by(Task.name)
-                 .order_by(SQL('sum').desc()))
-
-        tasks = self.__summary_from_query(man_day_minutes, query)
-        self.logger.debug('Week summary: %s', tasks)
+        tasks = get_week_summary(self._week, man_day_minutes)
+        if DEBUG:
+            self.logger.debug('Week summary: %s', tasks)
         return tasks
 
     def daily_summary(self, today_date, man_day_minutes):
         """Get the day summary: tasks and total time in minutes."""
-        query = (Task.select(Task.name,
-                             fn.SUM((fn.strftime('%s', Task.end_time) -
-                                     fn.strftime('%s', Task.start_time))
-                                    .cast('real') / 60).alias('sum')
-                             )
-                 .join(Day)
-                 .where((Day.date == today_date)
-                        & Task.start_time.is_null(False)
-                        & Task.end_time.is_null(False)
-                        )
-                 .group_by(Task.name)
-                 .order_by(SQL('sum').desc()))
-
-        tasks = self.__summary_from_query(man_day_minutes, query)
-        self.logger.debug('Daily summary: %s', tasks)
-        return tasks
-
-    @staticmethod
-    def __summary_from_query(man_day_minutes, query):
-        """Return the summary (tasks and total time in minutes) from an
-        executed query."""
-        tasks = {}
-        for counter, row in enumerate(query):
-            task = {ResultColumn.Task: row.name, ResultColumn.Time: row.sum,
-                    ResultColumn.Decimal_Time: row.sum}
-            if man_day_minutes:
-                task[ResultColumn.Man_Day] = round(row.sum /
-                                                   man_day_minutes, 2)
-            else:
-                task[ResultColumn.Man_Day] = ''
-            tasks[counter] = task
+        tasks = get_daily_summary(today_date, man_day_minutes)
+        if DEBUG:
+            self.logger.debug('Daily summary: %s', tasks)
         return tasks
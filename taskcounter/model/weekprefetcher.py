@@ -0,0 +1,176 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter week prefetcher."""
+
+import logging
+from collections import namedtuple
+
+from PyQt5.QtCore import (QObject, QRunnable, QThreadPool, QTimer,
+                          pyqtSignal, pyqtSlot)
+
+from taskcounter.db import DB, SQL, Day, Task, Week, instrumented
+from taskcounter.enum import TaskColumn
+
+WeekRows = namedtuple('WeekRows', ['week_id', 'minutes_to_work', 'day_ids',
+                                   'tasks'])
+
+
+def load_week_rows(year, week_number):
+    """Load the rows of an existing week, its days and their tasks.
+
+    Return None if the week or one of its days does not exist yet.
+    """
+    week = (Week.select(Week.id, Week.minutes_to_work)
+            .where((Week.year == year) & (Week.week_number == week_number))
+            .tuples()
+            .first())
+    if week is None:
+        return None
+
+    week_id, minutes_to_work = week
+    day_ids = dict(Day.select(Day.date, Day.id)
+                   .where(Day.week == week_id)
+                   .tuples())
+    if len(day_ids) < 7:
+        return None
+
+    tasks = {date_: [] for date_ in day_ids}
+    # ensure that null start_time appears in last positions
+    for task_id, name, start_time, end_time, date_ in (
+            Task.select(Task.id, Task.name, Task.start_time, Task.end_time,
+                        Day.date)
+            .join(Day)
+            .where(Day.week == week_id)
+            .order_by(Day.date, SQL("IFNULL(start_time, '24:00')"))
+            .tuples()):
+        tasks[date_].append({
+            TaskColumn.Id: task_id,
+            TaskColumn.Task: name,
+            TaskColumn.Start_Time: start_time,
+            TaskColumn.End_Time: end_time
+        })
+
+    return WeekRows(week_id, minutes_to_work, day_ids, tasks)
+
+
+class _PrefetchSignals(QObject):
+    """Signals of a prefetch runnable, delivered to the GUI thread."""
+
+    loaded = pyqtSignal(object, int, object)
+
+
+class _PrefetchRunnable(QRunnable):
+    """Load the rows of a week on a worker thread."""
+
+    def __init__(self, key, generation, signals):
+        """Construct a runnable for a week key."""
+        super().__init__()
+        self.key = key
+        self.generation = generation
+        self.signals = signals
+
+    @instrumented
+    def run(self):
+        """Load the rows, on the connection of the worker thread."""
+        logger = logging.getLogger(__name__)
+        rows = None
+        try:
+            rows = load_week_rows(*self.key)
+        except Exception:
+            logger.warning('Unable to prefetch week %s', self.key,
+                           exc_info=True)
+        finally:
+            if not DB.is_closed():
+                DB.close()
+        self.signals.loaded.emit(self.key, self.generation, rows)
+
+
+class WeekPrefetcher(QObject):
+    """Prefetch the rows of weeks on a worker thread, while the user is idle.
+
+    Each worker thread has its own SQLite connection. Rows are handed to the
+    GUI thread with a queued signal, and taken once to build a week model.
+    """
+
+    # delay in milliseconds without navigation before prefetching.
+    IDLE_DELAY = 300
+
+    week_prefetched = pyqtSignal(int, int)
+
+    def __init__(self, parent=None):
+        """Construct a week prefetcher."""
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self._rows = {}
+        self._pending = set()
+        self._generations = {}
+        self._scheduled = []
+        self._signals = _PrefetchSignals(self)
+        self._signals.loaded.connect(self.__loaded)
+        # a single worker, thus a single extra connection.
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(self.IDLE_DELAY)
+        self._idle_timer.timeout.connect(self.__start_scheduled)
+
+    def schedule(self, keys):
+        """Prefetch weeks by (year, week number) once the user is idle."""
+        self._scheduled = list(keys)
+        self._idle_timer.start()
+
+    def prefetch(self, key):
+        """Prefetch a week by (year, week number) now."""
+        if key in self._rows or key in self._pending:
+            return
+        self._pending.add(key)
+        self._pool.start(_PrefetchRunnable(
+            key, self._generations.get(key, 0), self._signals))
+
+    def take(self, key):
+        """Take the prefetched rows of a week, None if not prefetched."""
+        return self._rows.pop(key, None)
+
+    def discard(self, key):
+        """Discard the prefetched rows of a week, loaded or in progress."""
+        self._rows.pop(key, None)
+        self._generations[key] = self._generations.get(key, 0) + 1
+
+    def wait(self):
+        """Cancel scheduled prefetches and wait for the running ones."""
+        self._idle_timer.stop()
+        self._pool.waitForDone()
+
+    @pyqtSlot()
+    def __start_scheduled(self):
+        """Start the scheduled prefetches."""
+        for key in self._scheduled:
+            self.prefetch(key)
+        self._scheduled = []
+
+    @pyqtSlot(object, int, object)
+    def __loaded(self, key, generation, rows):
+        """Keep the loaded rows of a week, unless discarded since."""
+        self._pending.discard(key)
+        if rows is None or generation != self._generations.get(key, 0):
+            self.logger.debug('Drop prefetched week: %s', key)
+            return
+        self._rows[key] = rows
+        self.logger.debug('Prefetched week: %s', key)
+        self.week_prefetched.emit(*key)
@@ -0,0 +1,103 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter startup profiling."""
+
+import logging
+import os
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+
+from taskcounter import log_dir
+from taskcounter.db.model import DB
+
+PROFILE_STARTUP_ARGUMENT = '--profile-startup'
+
+# environment variable enabling the startup profiling.
+PROFILE_STARTUP_VARIABLE = 'TASKCOUNTER_PROFILE_STARTUP'
+
+STARTUP_PROFILE_FILE = os.path.join(log_dir, 'startup-profile.log')
+
+Phase = namedtuple('Phase', ['name', 'seconds', 'statements'])
+
+
+def profile_startup_enabled(arguments):
+    """Check the startup profiling is enabled by argument or variable."""
+    return (PROFILE_STARTUP_ARGUMENT in arguments
+            or bool(os.environ.get(PROFILE_STARTUP_VARIABLE)))
+
+
+class StartupProfiler:
+    """Record the wall-clock time and SQL statements of startup phases.
+
+    Only the statements of the thread running the phases are counted, not
+    those of the query executor or week prefetcher threads.
+    """
+
+    def __init__(self, enabled=True):
+        """Construct a startup profiler, doing nothing unless enabled."""
+        self.enabled = enabled
+        self.phases = []
+        self._start = time.perf_counter()
+        self._current = None
+
+    def begin(self, name):
+        """Begin a phase, that may end in another function."""
+        if self.enabled:
+            self._current = (name, time.perf_counter(), DB.statement_count)
+
+    def end(self):
+        """End the current phase."""
+        if self.enabled and self._current:
+            name, start, statements = self._current
+            self.phases.append(Phase(name, time.perf_counter() - start,
+                                     DB.statement_count - statements))
+            self._current = None
+
+    @contextmanager
+    def phase(self, name):
+        """Record a phase, around the block of a with statement."""
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def report(self):
+        """Get the report of the recorded phases."""
+        lines = ['Startup profile, {}'.format(
+            datetime.now().strftime('%d/%m/%Y %H:%M:%S')),
+            'Statements of the main thread only, worker threads excluded',
+            '{:<24} {:>10} {:>11}'.format('phase', 'ms', 'statements')]
+        for phase in self.phases:
+            lines.append('{:<24} {:>10.1f} {:>11}'.format(
+                phase.name, phase.seconds * 1000, phase.statements))
+        lines.append('{:<24} {:>10.1f} {:>11}'.format(
+            'total', (time.perf_counter() - self._start) * 1000,
+            sum(phase.statements for phase in self.phases)))
+        return '\n'.join(lines) + '\n'
+
+    def write_report(self, path=STARTUP_PROFILE_FILE):
+        """Append the report to a file, if enabled."""
+        if not self.enabled:
+            return
+        logger = logging.getLogger(__name__)
+        with open(path, 'a', encoding='utf-8') as report_file:
+            report_file.write(self.report() + '\n')
+        logger.info('Startup profile written to: %s', path)
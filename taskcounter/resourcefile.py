@@ -0,0 +1,76 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter binary resource file.
+
+Usage: python3 -m taskcounter.resourcefile, to write resources.rcc from
+the compiled resources module.
+"""
+
+import logging
+import os
+import struct
+
+from PyQt5.QtCore import QResource
+
+RESOURCE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'resources.rcc')
+
+# environment variable forcing the resources module, for comparison.
+RESOURCE_MODULE_VARIABLE = 'TASKCOUNTER_RESOURCE_MODULE'
+
+
+def load_resources(path=RESOURCE_FILE):
+    """Register the resources, from the binary resource file if possible.
+
+    Qt maps the binary file in memory, instead of parsing and registering
+    the byte literals of the resources module.
+    """
+    logger = logging.getLogger(__name__)
+    if (not os.environ.get(RESOURCE_MODULE_VARIABLE)
+            and os.path.exists(path)
+            and QResource.registerResource(path)):
+        logger.info('Resources registered from: %s', path)
+        return True
+
+    logger.info('Resources registered from the resources module')
+    # the resources module registers its data when imported.
+    from taskcounter import resources
+    resources.qInitResources()
+    return False
+
+
+def write_resource_file(path=RESOURCE_FILE):
+    """Write the binary resource file of the resources module."""
+    from taskcounter import resources
+
+    # rcc binary format version 2: header, then data, names and tree.
+    header_size = 4 + 4 * 4
+    data_offset = header_size
+    names_offset = data_offset + len(resources.qt_resource_data)
+    tree_offset = names_offset + len(resources.qt_resource_name)
+    with open(path, 'wb') as resource_file:
+        resource_file.write(b'qres')
+        resource_file.write(struct.pack('>iiii', 2, tree_offset,
+                                        data_offset, names_offset))
+        resource_file.write(resources.qt_resource_data)
+        resource_file.write(resources.qt_resource_name)
+        resource_file.write(resources.qt_resource_struct_v2)
+
+
+if __name__ == '__main__':
+    write_resource_file()
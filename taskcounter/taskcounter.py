@@ -21,52 +21,76 @@ import locale
 import logging
 import sys
 
-from PyQt5.QtCore import QLocale, QTranslator
+from PyQt5.QtCore import QLocale, QTimer, QTranslator
 from PyQt5.QtWidgets import QApplication
 
-from taskcounter import resources
-from taskcounter.db import create_database
+from taskcounter.db import DB, create_database
 from taskcounter.db.utility import migrate_database
 from taskcounter.gui import MainWindow
+from taskcounter.model import SettingModel
+from taskcounter.profiling import StartupProfiler, profile_startup_enabled
+from taskcounter.resourcefile import load_resources
 
 
 def main():
     """Start the application."""
     logger = logging.getLogger(__name__)
+    profiler = StartupProfiler(profile_startup_enabled(sys.argv))
 
     logger.info('Starting application')
 
-    app = QApplication(sys.argv)
+    with profiler.phase('application'):
+        app = QApplication(sys.argv)
 
     logger.info('Init resources')
-    resources.qInitResources()
-
-    locale_name = QLocale.system().name()
-    logger.info('Locale name: ' + locale_name)
-
-    if sys.platform == 'darwin':
-        locale.setlocale(locale.LC_TIME, locale_name)
-        locale.setlocale(locale.LC_CTYPE, locale_name)
-    elif sys.platform == 'win32':
-        locale_bcp47 = QLocale.system().bcp47Name()
-        logger.info('Locale bcp47: ' + locale_bcp47)
-        locale.setlocale(locale.LC_TIME, locale_bcp47)
-        locale.setlocale(locale.LC_CTYPE, locale_bcp47)
-
-    translation_file = ':/{}.qm'.format(locale_name)
-    logger.info('Translation file: ' + translation_file)
-
-    translator = QTranslator()
-    if translator.load(translation_file):
-        logger.info('Translator loaded. Installing...')
-        app.installTranslator(translator)
-    else:
-        logger.warning('Unable to load translator')
-
-    create_database()
-    migrate_database()
-
-    main_window = MainWindow()
-    main_window.init_ui()
+    with profiler.phase('resources'):
+        load_resources()
+
+    with profiler.phase('locale'):
+        locale_name = QLocale.system().name()
+        logger.info('Locale name: ' + locale_name)
+
+        if sys.platform == 'darwin':
+            locale.setlocale(locale.LC_TIME, locale_name)
+            locale.setlocale(locale.LC_CTYPE, locale_name)
+        elif sys.platform == 'win32':
+            locale_bcp47 = QLocale.system().bcp47Name()
+            logger.info('Locale bcp47: ' + locale_bcp47)
+            locale.setlocale(locale.LC_TIME, locale_bcp47)
+            locale.setlocale(locale.LC_CTYPE, locale_bcp47)
+
+    with profiler.phase('translator'):
+        translation_file = ':/{}.qm'.format(locale_name)
+        logger.info('Translation file: ' + translation_file)
+
+        translator = QTranslator()
+        if translator.load(translation_file):
+            logger.info('Translator loaded. Installing...')
+            app.installTranslator(translator)
+        else:
+            logger.warning('Unable to load translator')
+
+    with profiler.phase('create_database'):
+        create_database()
+    with profiler.phase('migrate_database'):
+        migrate_database()
+    with profiler.phase('settings'):
+        SettingModel.load_cache()
+        DB.instrumentation.slow_threshold = (
+            SettingModel.slow_query_threshold() / 1000)
+
+    with profiler.phase('main_window'):
+        main_window = MainWindow()
+    with profiler.phase('init_ui'):
+        main_window.init_ui()
+
+    def end_of_startup():
+        """End the startup profile."""
+        profiler.end()
+        profiler.write_report()
+
+    # the first iteration refreshes the counters and paints the window.
+    profiler.begin('first_event_loop')
+    QTimer.singleShot(0, end_of_startup)
 
     return app.exec_()
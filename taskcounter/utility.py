@@ -20,18 +20,25 @@
 import logging
 
 import re
-from datetime import date, timedelta
+from datetime import date
 from math import floor
 
+from taskcounter import DEBUG
 from taskcounter.enum import WeekDay
+from taskcounter.weekcalendar import dates_of_week, iso_weeks_for_year
+
+logger = logging.getLogger(__name__)
+
+# hex color like #rrggbb or #rgb.
+COLOR_REGEXP = re.compile(r'^#(?:[0-9a-fA-F]{3}){1,2}$')
 
 
 def weekday_from_date(date_):
     """From a date, returns a WeekDay."""
-    logger = logging.getLogger(__name__)
     if isinstance(date_, date):
         weekday = WeekDay(date_.weekday())
-        logger.debug('Week day: %s', weekday)
+        if DEBUG:
+            logger.debug('Week day: %s', weekday)
         return weekday
     logger.error('%s is not an instance of date.', date_)
     return None
@@ -39,28 +46,38 @@ def weekday_from_date(date_):
 
 def weeks_for_year(year):
     """From a year, gets the number of iso weeks."""
-    # https://stackoverflow.com/a/29263010
-    logger = logging.getLogger(__name__)
     try:
-        last_week = date(int(year), 12, 28)
-        logger.debug('Last week: %s', last_week)
+        week = iso_weeks_for_year(int(year))
     except (TypeError, ValueError):
-        logger.error('Unable to convert %s to int.', exc_info=True)
+        logger.error('Unable to convert %s to int.', year, exc_info=True)
         return None
     else:
-        week = last_week.isocalendar()[1]
-        logger.debug('ISO calendar week number: %s', week)
+        if DEBUG:
+            logger.debug('ISO calendar week number: %s', week)
         return week
 
 
+def previous_week(year, week_number):
+    """Get the year and the week number of the week before a given week."""
+    if week_number - 1 == 0:
+        return year - 1, weeks_for_year(year - 1)
+    return year, week_number - 1
+
+
+def next_week(year, week_number):
+    """Get the year and the week number of the week after a given week."""
+    if week_number + 1 > weeks_for_year(year):
+        return year + 1, 1
+    return year, week_number + 1
+
+
 def seven_days_of_week(a_year, a_week_number):
     """Get seven dates from a given year and a given week number."""
-    logger = logging.getLogger(__name__)
-
     try:
         year = int(a_year)
         week_number = int(a_week_number)
-        logger.debug('Year: %s, week: %s', year, week_number)
+        if DEBUG:
+            logger.debug('Year: %s, week: %s', year, week_number)
     except (TypeError, ValueError):
         logger.error('Unable to convert %s or %s to int.',
                      a_year, a_week_number, exc_info=True)
@@ -69,36 +86,14 @@ def seven_days_of_week(a_year, a_week_number):
         if weeks_for_year(year) < week_number or week_number < 1:
             return None
 
-        # december 28 is always in the last week ot the year.
-        december_28 = date(year - 1, 12, 28)
-        logger.debug('December 28: %s', december_28)
-
-        monday_of_first_week = december_28
-
-        # go until next monday (first week of the year)
-        while 'the next monday has not been found yet':
-            monday_of_first_week += timedelta(days=1)
-            if monday_of_first_week.weekday() == WeekDay.Monday.value:
-                break
-        # now monday_of_first_week is really the monday of the first week
-        logger.debug('Monday of first week: %s', monday_of_first_week)
-
-        assert(monday_of_first_week.weekday() == WeekDay.Monday.value)
-
-        # add week_number - 1 to find the monday of the week_number th week
-        searched_week = monday_of_first_week + \
-            timedelta(weeks=(week_number - 1))
-        logger.debug('Searched week: %s', searched_week)
-
-        for i in range(7):
-            day = searched_week + timedelta(days=i)
-            logger.debug('Yield: %s', day)
-            yield day
+        dates = dates_of_week(year, week_number)
+        if DEBUG:
+            logger.debug('Dates: %s', dates)
+        yield from dates
 
 
 def minutes_to_time(a_total_minutes):
     """Get a tuple hours / minutes from a number of minutes."""
-    logger = logging.getLogger(__name__)
     try:
         total_minutes = int(a_total_minutes)
     except (TypeError, ValueError):
@@ -111,21 +106,20 @@ def minutes_to_time(a_total_minutes):
             return None
         else:
             time = divmod(total_minutes, 60)
-            logger.debug('Time: %s', time)
+            if DEBUG:
+                logger.debug('Time: %s', time)
             return time
 
 
 def minutes_to_time_str(a_total_minutes):
     """Get a hh:mm string from a number of minutes."""
-    logger = logging.getLogger(__name__)
-    logger.debug('Total minutes: %s', a_total_minutes)
-
     time = minutes_to_time(a_total_minutes)
 
-    logger.debug('Time: %s', time)
     if time:
         time = '{:02d}:{:02d}'.format(*time)
-        logger.debug('Return: %s', time)
+        if DEBUG:
+            logger.debug('Total minutes: %s, return: %s', a_total_minutes,
+                         time)
         return time
     logger.error('Return None')
     return None
@@ -133,17 +127,15 @@ def minutes_to_time_str(a_total_minutes):
 
 def minutes_to_decimal_time_str(a_total_minutes):
     """Get a h,m in decimal time from a number of minutes."""
-    logger = logging.getLogger(__name__)
-    logger.debug('Total minutes: %s', a_total_minutes)
-
     time = minutes_to_time(a_total_minutes)
 
-    logger.debug('Time: %s', time)
     if time:
         hours = time[0]
         decimal_minutes = floor(time[1] / 60 * 100) / 100
         decimal_time = str(hours + decimal_minutes)
-        logger.debug('%s', decimal_time)
+        if DEBUG:
+            logger.debug('Total minutes: %s, return: %s', a_total_minutes,
+                         decimal_time)
         return decimal_time
     return None
 
@@ -151,41 +143,28 @@ def minutes_to_decimal_time_str(a_total_minutes):
 def split_color(color):
     """Split hex color like #rrggbb or #rgb into three int components."""
     color = color[1:]
-    logger = logging.getLogger(__name__)
-    logger.debug('Input color to split: %s', color)
     r = g = b = 0
     if len(color) == 6:
         r, g, b = [int(color[i:i + 2], 16) for i in range(0, 6, 2)]
     elif len(color) == 3:
         r, g, b = [int(color[i:i + 1], 16) for i in range(0, 3)]
-    logger.debug('Split: %s', (r, g, b))
+    if DEBUG:
+        logger.debug('Split %s: %s', color, (r, g, b))
     return r, g, b
 
 
 def color_between(start_color, end_color, percent):
     """Get a hex color between a start and end color using a percentage."""
-    logger = logging.getLogger(__name__)
-    logger.debug('Get color between %s and %s with ratio %s',
-                 start_color, end_color, percent)
-
     if percent < 0:
         percent = 0
     if percent > 1:
         percent = 1
 
-    logger.debug('Retained ratio: %s', percent)
-
-    regexp = r'^#(?:[0-9a-fA-F]{3}){1,2}$'
-    if (re.search(regexp, start_color)
-            and re.search(regexp, end_color)):
-        logger.debug('Start and end colors match regexp')
-
+    if (COLOR_REGEXP.search(start_color)
+            and COLOR_REGEXP.search(end_color)):
         r1, g1, b1 = split_color(start_color)
         r2, g2, b2 = split_color(end_color)
 
-        logger.debug('Start split color: %s', (r1, g1, b1))
-        logger.debug('End split color: %s', (r2, g2, b2))
-
         color = ('#{:02x}{:02x}{:02x}'.format(int(r1 + (r2 - r1) * percent),
                                               int(g1 + (g2 - g1) * percent),
                                               int(b1 + (b2 - b1) * percent)))
@@ -194,25 +173,21 @@ def color_between(start_color, end_color, percent):
         logger.warning('Start or end color does not match regexp')
         color = '#000000'
 
-    logger.debug('Color between: %s', color)
+    if DEBUG:
+        logger.debug('Color between %s and %s with ratio %s: %s',
+                     start_color, end_color, percent, color)
     return color
 
 
 def contrast_color(color):
     """Get black or white contrast depending on a given color."""
-    regexp = r'^#(?:[0-9a-fA-F]{3}){1,2}$'
-
-    logger = logging.getLogger(__name__)
-    logger.debug('Get contrast color for %s', color)
-
-    if re.search(regexp, color):
+    if COLOR_REGEXP.search(color):
         r, g, b = split_color(color)
-        logger.debug('Split color: %s', (r, g, b))
         lightness = r * 0.299 + g * 0.587 + b * 0.114
-        logger.debug('Lightness: %s', lightness)
         result = '#000000' if lightness > 160 else '#ffffff'
     else:
         result = '#000000'
 
-    logger.debug('Contrast color: %s', result)
+    if DEBUG:
+        logger.debug('Contrast color of %s: %s', color, result)
     return result
@@ -0,0 +1,76 @@
+#     Copyright (C) 2018  Matthieu PETIOT
+#
+#     https://github.com/ardeidae/taskcounter
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task counter ISO week calendar."""
+
+from datetime import date, timedelta
+from functools import lru_cache
+
+
+@lru_cache(maxsize=512)
+def iso_weeks_for_year(year):
+    """Get the number of ISO weeks of a year, 52 or 53."""
+    # december 28 is always in the last week of the year.
+    return date(year, 12, 28).isocalendar()[1]
+
+
+@lru_cache(maxsize=512)
+def monday_of_week(year, week_number):
+    """Get the monday of an ISO week, raise ValueError if out of range."""
+    return date.fromisocalendar(year, week_number, 1)
+
+
+def dates_of_week(year, week_number):
+    """Get the seven dates of an ISO week, from monday to sunday."""
+    monday = monday_of_week(year, week_number)
+    return tuple(monday + timedelta(days=i) for i in range(7))
+
+
+def dates_of_weeks(year, first_week_number, last_week_number):
+    """Get the dates of the weeks first to last of a year, included.
+
+    The last week number may exceed the number of weeks of the year, then
+    the weeks continue in the next years.
+    """
+    monday = monday_of_week(year, first_week_number)
+    days = 7 * (last_week_number - first_week_number + 1)
+    return [monday + timedelta(days=i) for i in range(max(days, 0))]
+
+
+def week_of_date(date_):
+    """Get the ISO year and week number of a date."""
+    year, week_number, _ = date_.isocalendar()
+    return year, week_number
+
+
+def weeks_of_dates(dates):
+    """Get the ISO year and week number of each date, in the same order.
+
+    Dates of the same week share one computation, so that thousands of
+    dates are mapped cheaply.
+    """
+    weeks = {}
+    result = []
+    for date_ in dates:
+        monday = date_.toordinal() - date_.weekday()
+        try:
+            result.append(weeks[monday])
+        except KeyError:
+            week = week_of_date(date_)
+            weeks[monday] = week
+            result.append(week)
+    return result
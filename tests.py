@@ -17,13 +17,48 @@
 
 """Task counter tests."""
 
+import csv
+import io
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time as clock
 import unittest
-from datetime import date
-
+from contextlib import redirect_stdout
+from datetime import date, time
+from unittest import mock
+
+from peewee import OperationalError
+from PyQt5.QtCore import QCoreApplication, Qt, QTime
+from PyQt5.QtGui import QColor
+
+from taskcounter.cli import main as cli_main
+from taskcounter.db import Day, Task, close_database, create_database
+from taskcounter.db.instrumentation import QueryInstrumentation
+from taskcounter.db.model import DB
+from taskcounter.db.utility import explain_query_plan, migrate_database
 from taskcounter.enum import ResultColumn, TaskColumn, WeekDay
-from taskcounter.utility import (minutes_to_time, minutes_to_time_str,
-                                 seven_days_of_week, weekday_from_date,
-                                 weeks_for_year)
+from taskcounter.export import (SUMMARY, TASKS, Writer, export,
+                                summary_rows, summary_table_rows, task_rows)
+from taskcounter.gui import RefreshScheduler
+from taskcounter.model import (AggregateModel, ColorModel, CompletionIndex,
+                               CompletionModel, DayModel, IntervalIndex,
+                               QueryExecutor, SettingModel, WeekCache,
+                               WeekModel, load_week_rows,
+                               get_total_annual_worked_hours,
+                               get_week_summary)
+from taskcounter.profiling import StartupProfiler, profile_startup_enabled
+from taskcounter.resourcefile import RESOURCE_FILE, write_resource_file
+from taskcounter.utility import (contrast_color, minutes_to_time,
+                                 minutes_to_time_str, seven_days_of_week,
+                                 weekday_from_date, weeks_for_year)
+from taskcounter.weekcalendar import (dates_of_week, dates_of_weeks,
+                                      iso_weeks_for_year, week_of_date,
+                                      weeks_of_dates)
 
 
 class TestWeeksForYear(unittest.TestCase):
@@ -260,6 +295,35 @@ class TestSevenDaysOfWeek(unittest.TestCase):
             next(generator)
 
 
+class TestWeekCalendar(unittest.TestCase):
+    """Tests for the ISO week calendar functions."""
+
+    def test_dates_of_week_are_in_the_week(self):
+        """Test the dates of each week of a few years are in the week."""
+        for year in range(2015, 2027):
+            for week_number in range(1, iso_weeks_for_year(year) + 1):
+                dates = dates_of_week(year, week_number)
+                self.assertEqual(
+                    [(year, week_number, day) for day in range(1, 8)],
+                    [tuple(date_.isocalendar()) for date_ in dates])
+
+    def test_dates_of_weeks_continue_in_next_year(self):
+        """Test the dates of weeks continue in the next year."""
+        dates = dates_of_weeks(2020, 53, 54)
+        self.assertEqual(14, len(dates))
+        self.assertEqual(date(2020, 12, 28), dates[0])
+        self.assertEqual(date(2021, 1, 10), dates[-1])
+        self.assertEqual([], dates_of_weeks(2020, 2, 1))
+
+    def test_weeks_of_dates(self):
+        """Test the weeks of dates, in the same order as the dates."""
+        dates = [date(2021, 1, 3), date(2021, 1, 4), date(2020, 12, 31),
+                 date(2021, 1, 10)]
+        self.assertEqual([(2020, 53), (2021, 1), (2020, 53), (2021, 1)],
+                         weeks_of_dates(dates))
+        self.assertEqual((2020, 53), week_of_date(date(2021, 1, 1)))
+
+
 class TestMinutesToTime(unittest.TestCase):
     """Tests for minutes_to_time function."""
 
@@ -348,5 +412,950 @@ class TestMinutesToTimeStr(unittest.TestCase):
         self.assertEqual(minutes_to_time_str(645), '10:45')
 
 
+class TestDebugLogs(unittest.TestCase):
+    """Tests for debug logs of hot paths."""
+
+    def test_debug_logs_are_skipped_unless_enabled(self):
+        """Test debug logs are skipped unless enabled, whatever the level."""
+        with mock.patch('taskcounter.utility.DEBUG', False), \
+                mock.patch('taskcounter.utility.logger') as logger:
+            logger.isEnabledFor.return_value = True
+            self.assertEqual('01:05', minutes_to_time_str(65))
+            self.assertEqual('#ffffff', contrast_color('#000000'))
+            logger.debug.assert_not_called()
+
+        with mock.patch('taskcounter.utility.DEBUG', True), \
+                mock.patch('taskcounter.utility.logger') as logger:
+            minutes_to_time_str(65)
+            logger.debug.assert_called()
+
+
+class TestIntervalIndex(unittest.TestCase):
+    """Tests for IntervalIndex class."""
+
+    def setUp(self):
+        """Create an interval index."""
+        self.index = IntervalIndex([(1, time(9, 0), time(10, 0)),
+                                    (2, time(8, 0), time(12, 0)),
+                                    (3, time(13, 0), time(14, 0))])
+
+    def test_overlapping(self):
+        """Test overlapping intervals are found, bounds are half-open."""
+        self.assertEqual([2, 1], self.index.overlapping(time(9, 30),
+                                                        time(11, 0)))
+        self.assertEqual([], self.index.overlapping(time(12, 0),
+                                                    time(13, 0)))
+        self.assertEqual([3], self.index.overlapping(time(13, 0),
+                                                     time(14, 0)))
+        self.assertEqual([3], self.index.overlapping(time(13, 30),
+                                                     time(13, 30)))
+        self.assertEqual([2], self.index.overlapping(time(9, 0), time(10, 0),
+                                                     exclude=1))
+
+    def test_add_and_remove(self):
+        """Test intervals can be added and removed."""
+        self.index.remove(2)
+        self.index.add(4, time(11, 0), time(13, 30))
+        self.assertNotIn(2, self.index)
+        self.assertEqual(3, len(self.index))
+        self.assertEqual([4, 3], self.index.overlapping(time(12, 0),
+                                                        time(15, 0)))
+        self.assertEqual([], self.index.overlapping(time(10, 0),
+                                                    time(11, 0)))
+
+
+class TestResourceFile(unittest.TestCase):
+    """Tests for the binary resource file."""
+
+    def test_resource_file_is_up_to_date(self):
+        """Test the resource file matches the resources module."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'resources.rcc')
+            write_resource_file(path)
+            with open(path, 'rb') as written, \
+                    open(RESOURCE_FILE, 'rb') as shipped:
+                self.assertEqual(written.read(), shipped.read())
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Base for tests using an in-memory database."""
+
+    def setUp(self):
+        """Create an in-memory database."""
+        DB.init(':memory:')
+        create_database()
+        migrate_database()
+        SettingModel.load_cache()
+
+    def tearDown(self):
+        """Close the in-memory database."""
+        close_database()
+
+
+class TestSettingModel(DatabaseTestCase):
+    """Tests for SettingModel cache."""
+
+    def test_cached_values_do_not_query_the_database(self):
+        """Test that cached values do not query the database."""
+        SettingModel.set_default_week_time(1200)
+        SettingModel.load_cache()
+        with mock.patch.object(DB, 'execute_sql',
+                               wraps=DB.execute_sql) as execute_sql:
+            for _ in range(3):
+                self.assertEqual(1200, SettingModel.default_week_time())
+                self.assertEqual('#ffcdd2',
+                                 SettingModel.invalid_color().name())
+        self.assertEqual(1, execute_sql.call_count)
+        self.assertEqual((5, 1), SettingModel.cache_info()[:2])
+
+    def test_write_invalidates_the_cached_value(self):
+        """Test that write invalidates the cached value."""
+        self.assertEqual(35 * 60, SettingModel.default_week_time())
+        SettingModel.set_default_week_time(1200)
+        self.assertEqual(1200, SettingModel.default_week_time())
+        self.assertEqual((0, 2), SettingModel.cache_info()[:2])
+
+    def test_man_day_minutes_are_read_without_qt(self):
+        """Test that the man day minutes are read from the pickled time."""
+        self.assertEqual(7 * 60, SettingModel.default_man_day_minutes())
+        SettingModel.set_default_man_day_time(QTime(7, 45))
+        with mock.patch.dict(sys.modules, {'PyQt5.QtCore': None}):
+            self.assertEqual(465, SettingModel.default_man_day_minutes())
+
+
+class TestColorModel(DatabaseTestCase):
+    """Tests for ColorModel class."""
+
+    def setUp(self):
+        """Forget the colors of another test."""
+        super().setUp()
+        ColorModel.invalidate()
+
+    def test_gradient_is_invalidated_with_colors(self):
+        """Test the gradient from invalid to valid colors, until changed."""
+        SettingModel.set_invalid_color(QColor('#000000'))
+        SettingModel.set_valid_color(QColor('#ffffff'))
+        self.assertEqual('#000000', ColorModel.gradient_color(-1).name())
+        self.assertEqual('#808080', ColorModel.gradient_color(0.5).name())
+        self.assertEqual('#ffffff', ColorModel.gradient_color(2).name())
+
+        SettingModel.set_valid_color(QColor('#ff0000'))
+        self.assertEqual('#ffffff', ColorModel.gradient_color(1).name())
+        ColorModel.invalidate()
+        self.assertEqual('#ff0000', ColorModel.gradient_color(1).name())
+
+    def test_contrast_color_is_memoised(self):
+        """Test the contrast color is computed once per color, settings
+        changes do not forget it."""
+        with mock.patch.object(ColorModel, '_contrasts', {}), \
+                mock.patch('taskcounter.model.colormodel.contrast_color',
+                           wraps=contrast_color) as contrast:
+            for _ in range(3):
+                self.assertEqual('#000000', ColorModel.contrast_color(
+                    QColor('#ffff00')).name())
+                ColorModel.invalidate()
+            self.assertEqual(1, contrast.call_count)
+
+
+class TestTaskDuration(DatabaseTestCase):
+    """Tests for the task duration column."""
+
+    def setUp(self):
+        """Create a day."""
+        super().setUp()
+        self.day = WeekModel(2018, 10)[WeekDay.Monday]._day
+
+    def test_duration_is_computed_on_insert(self):
+        """Test that duration is computed on insert."""
+        task = Task.create(name='a', start_time=time(9, 0),
+                           end_time=time(10, 30), day=self.day)
+        self.assertEqual(5400, Task.get_by_id(task.id).duration)
+
+    def test_duration_is_computed_on_update(self):
+        """Test that duration is computed on update."""
+        task = Task.create(name='a', start_time=time(9, 0), day=self.day)
+        self.assertIsNone(Task.get_by_id(task.id).duration)
+        Task.update(end_time='09:45').where(Task.id == task.id).execute()
+        self.assertEqual(2700, Task.get_by_id(task.id).duration)
+        Task.update(start_time=None).where(Task.id == task.id).execute()
+        self.assertIsNone(Task.get_by_id(task.id).duration)
+
+
+class TestDayModelWrites(DatabaseTestCase):
+    """Tests for DayModel write transactions."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create an application, to run the write window timer."""
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        """Create a day model."""
+        super().setUp()
+        self.day_model = WeekModel(2018, 10)[WeekDay.Monday]
+
+    def set_task_name(self, row, name):
+        """Set the task name of a row."""
+        index = self.day_model.index(row, TaskColumn.Task.value)
+        return self.day_model.setData(index, name, Qt.EditRole)
+
+    def test_writes_of_a_window_share_one_transaction(self):
+        """Test that writes of a window share one transaction."""
+        self.assertTrue(self.set_task_name(0, 'a'))
+        self.assertTrue(self.set_task_name(1, 'b'))
+        self.assertTrue(DB.in_transaction())
+        # read your writes, in the cached rows of the model.
+        self.assertEqual('b', self.day_model.get_cached_data(
+            1, TaskColumn.Task))
+
+        self.day_model.flush_writes()
+        self.assertFalse(DB.in_transaction())
+        self.assertEqual(2, Task.select().count())
+
+    def test_failed_commit_is_rolled_back(self):
+        """Test that a failed commit rolls back and reloads the tasks."""
+        failed = mock.Mock()
+        self.day_model.write_failed.connect(failed)
+        self.set_task_name(0, 'a')
+        with mock.patch.object(DB, 'commit', side_effect=OperationalError(
+                'database is locked')), self.assertLogs(level='ERROR'):
+            self.day_model.flush_writes()
+        failed.assert_called_once_with()
+        self.assertFalse(DB.in_transaction())
+        self.assertEqual(0, Task.select().count())
+        self.assertEqual(1, self.day_model.rowCount())
+        # the next writes open a new window.
+        self.set_task_name(0, 'b')
+        self.day_model.flush_writes()
+        self.assertEqual(['b'], [task.name for task in Task.select()])
+
+    def test_window_commits_when_the_timer_fires(self):
+        """Test that the window commits when its timer fires."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'taskcounter.db')
+        close_database()
+        DB.init(path)
+        create_database()
+        migrate_database()
+        self.day_model = WeekModel(2018, 10)[WeekDay.Monday]
+        self.set_task_name(0, 'a')
+
+        connection = sqlite3.connect(path)
+        self.addCleanup(connection.close)
+        query = 'SELECT name FROM task'
+        self.assertEqual([], connection.execute(query).fetchall())
+        deadline = clock.monotonic() + DayModel.WRITE_WINDOW / 1000 + 1
+        while clock.monotonic() < deadline:
+            self.app.processEvents()
+        self.assertFalse(DB.in_transaction())
+        self.assertEqual([('a',)], connection.execute(query).fetchall())
+
+    def test_batch_commits_at_the_end_of_the_block(self):
+        """Test that batch commits at the end of the block."""
+        self.set_task_name(0, 'a')
+        with self.day_model.batch():
+            self.set_task_name(0, 'b')
+            self.set_task_name(1, 'c')
+            self.assertTrue(DB.in_transaction())
+        self.assertFalse(DB.in_transaction())
+        self.assertEqual(['b', 'c'], [task.name for task in
+                                      Task.select().order_by(Task.id)])
+
+
+class TestDayModelData(DatabaseTestCase):
+    """Tests for DayModel rendered data."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create an application, to run the write window timer."""
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        """Create a day model with a valid and an invalid task."""
+        super().setUp()
+        day = WeekModel(2018, 10)[WeekDay.Monday]
+        Task.create(name='a', start_time=time(9, 0), end_time=time(10, 0),
+                    day=day._day)
+        Task.create(name='b', start_time=time(11, 0), day=day._day)
+        self.day_model = WeekModel(2018, 10)[WeekDay.Monday]
+
+    def data(self, row, column, role):
+        """Get the data of a cell for a role."""
+        return self.day_model.data(
+            self.day_model.index(row, column.value), role)
+
+    def test_rendered_data(self):
+        """Test rendered data for each role."""
+        self.assertEqual('a', self.data(0, TaskColumn.Task, Qt.DisplayRole))
+        self.assertEqual('<html>a</html>',
+                         self.data(0, TaskColumn.Task, Qt.ToolTipRole))
+        self.assertEqual(QTime(9, 0),
+                         self.data(0, TaskColumn.Start_Time, Qt.DisplayRole))
+        self.assertFalse(
+            self.data(1, TaskColumn.End_Time, Qt.DisplayRole).isValid())
+        self.assertEqual(QTime(0, 0),
+                         self.data(1, TaskColumn.End_Time, Qt.EditRole))
+        self.assertFalse(
+            self.data(2, TaskColumn.Task, Qt.DisplayRole).isValid())
+
+    def test_brushes_are_shared_by_valid_and_invalid_rows(self):
+        """Test that brushes are shared by valid and invalid rows."""
+        valid = self.data(0, TaskColumn.Task, Qt.BackgroundRole)
+        invalid = self.data(1, TaskColumn.Task, Qt.BackgroundRole)
+        self.assertEqual(SettingModel.valid_color(), valid.color())
+        self.assertEqual(SettingModel.invalid_color(), invalid.color())
+        self.assertIs(valid,
+                      self.data(0, TaskColumn.End_Time, Qt.BackgroundRole))
+
+    def test_edits_emit_row_level_signals(self):
+        """Test that edits emit row signals instead of a layout change."""
+        layout = mock.Mock()
+        moved = mock.Mock()
+        removed = mock.Mock()
+        self.day_model.layoutChanged.connect(layout)
+        self.day_model.rowsMoved.connect(moved)
+        self.day_model.rowsRemoved.connect(removed)
+
+        index = self.day_model.index(1, TaskColumn.Start_Time.value)
+        self.assertTrue(self.day_model.setData(index, QTime(8, 0),
+                                               Qt.EditRole))
+        self.assertEqual(1, moved.call_count)
+        self.assertEqual(['b', 'a'], [self.data(row, TaskColumn.Task,
+                                                Qt.DisplayRole)
+                                      for row in range(2)])
+        self.assertEqual(QTime(8, 0), self.data(0, TaskColumn.Start_Time,
+                                                Qt.DisplayRole))
+
+        index = self.day_model.index(0, TaskColumn.Task.value)
+        self.assertTrue(self.day_model.setData(index, '', Qt.EditRole))
+        self.assertEqual(1, removed.call_count)
+        self.assertEqual(2, self.day_model.rowCount())
+        layout.assert_not_called()
+        self.day_model.flush_writes()
+
+    def test_overlapping_edit_is_rejected(self):
+        """Test that an edit overlapping another task is rejected."""
+        rejected = mock.Mock()
+        self.day_model.overlap_rejected.connect(rejected)
+        index = self.day_model.index(1, TaskColumn.Start_Time.value)
+        self.assertTrue(self.day_model.setData(index, QTime(9, 0),
+                                               Qt.EditRole))
+        # the same bounds as the first task.
+        index = self.day_model.index(1, TaskColumn.End_Time.value)
+        self.assertFalse(self.day_model.setData(index, QTime(10, 0),
+                                                Qt.EditRole))
+        rejected.assert_called_with([0])
+        self.day_model.flush_writes()
+
+
+class TestCompletionIndex(unittest.TestCase):
+    """Tests for CompletionIndex class."""
+
+    def setUp(self):
+        """Create an index of task names."""
+        today = date(2018, 3, 31)
+        self.index = CompletionIndex((
+            ('Meeting', 3, date(2018, 3, 30)),
+            ('meeting notes', 10, date(2018, 3, 29)),
+            ('Mail', 10, date(2017, 3, 29)),
+            ('team meeting', 1, date(2018, 3, 31))), today)
+
+    def test_prefix_matches_rank_by_use(self):
+        """Test prefix matches, case insensitive, most used first."""
+        self.assertEqual(['meeting notes', 'Meeting', 'Mail'],
+                         self.index.complete('m'))
+        self.assertEqual(['meeting notes', 'Meeting'],
+                         self.index.complete('MEE'))
+        self.assertEqual(['Meeting'], self.index.complete('m', limit=2)[1:])
+        self.assertEqual([], self.index.complete(''))
+
+        self.index.use('Mail')
+        self.assertEqual(['Mail', 'meeting notes', 'Meeting'],
+                         self.index.complete('m'))
+        self.index.use('Mails')
+        self.assertIn('Mails', self.index.complete('mails'))
+
+    def test_substring_and_fuzzy_matches(self):
+        """Test substring and fuzzy matches, narrowed while typing."""
+        substring = CompletionIndex.SUBSTRING
+        fuzzy = CompletionIndex.FUZZY
+        self.assertEqual(['meeting notes', 'Meeting', 'team meeting'],
+                         self.index.complete('eet', substring))
+        self.assertEqual(['team meeting'],
+                         self.index.complete('eam', substring))
+        for text in ('m', 'mt', 'mtg', 'mtgn'):
+            self.index.complete(text, fuzzy)
+        self.assertEqual(['meeting notes'], self.index.complete('mtgn', fuzzy))
+        self.assertEqual(['meeting notes', 'Meeting', 'team meeting'],
+                         self.index.complete('mtg', fuzzy))
+
+
+class TestCompletionModel(DatabaseTestCase):
+    """Tests for CompletionModel class."""
+
+    def test_uses_are_loaded_once_then_applied(self):
+        """Test uses are loaded once, then kept up to date by task changes."""
+        year, week_number, weekday = date.today().isocalendar()
+        today = WeekModel(year, week_number)[WeekDay(weekday - 1)]
+        today.create_task('ab')
+        today.create_task('ab')
+        today.create_task('ac')
+        model = CompletionModel()
+        self.assertFalse(model.loaded)
+        model.load()
+        self.assertTrue(model.loaded)
+        model.complete('a')
+        self.assertEqual(['ab', 'ac'], model.stringList())
+
+        with mock.patch.object(DB, 'execute_sql') as execute_sql:
+            model.apply(None, {TaskColumn.Task: 'ad'})
+            model.apply({TaskColumn.Task: 'ab'}, {TaskColumn.Task: 'ac'})
+            model.apply(None, {TaskColumn.Task: 'ac'})
+            model.apply({TaskColumn.Task: 'ac'}, {TaskColumn.Task: 'ac'})
+            model.apply({TaskColumn.Task: 'ab'}, None)
+            model.complete('a')
+            execute_sql.assert_not_called()
+        self.assertEqual(['ac', 'ab', 'ad'], model.stringList())
+
+    def test_background_index_does_not_replace_a_loaded_one(self):
+        """Test an index loaded in the background keeps recorded uses."""
+        background_index = CompletionModel.load_index()
+        model = CompletionModel()
+        # an editor opens before the background index arrives.
+        model.load()
+        model.apply(None, {TaskColumn.Task: 'new'})
+        model.set_index(background_index)
+        model.complete('new')
+        self.assertEqual(['new'], model.stringList())
+
+
+class TestWeekModel(DatabaseTestCase):
+    """Tests for WeekModel days."""
+
+    def test_days_are_created_in_bulk(self):
+        """Test the days of a week are created with few queries."""
+        week = WeekModel(2018, 10)
+        monday = week[WeekDay.Monday]
+        self.assertEqual(7, Day.select().count())
+        self.assertEqual(date(2018, 3, 5), monday.date)
+        self.assertIs(monday, week[WeekDay.Monday])
+        self.assertEqual(date(2018, 3, 11), week[WeekDay.Sunday].date)
+
+        # week, days insertion, days selection, tasks of the day.
+        with mock.patch.object(DB, 'execute_sql',
+                               wraps=DB.execute_sql) as execute_sql:
+            WeekModel(2018, 10)[WeekDay.Monday]
+        self.assertEqual(4, execute_sql.call_count)
+        self.assertEqual(7, Day.select().count())
+
+
+class TestWeekCache(DatabaseTestCase):
+    """Tests for WeekCache class."""
+
+    def test_least_recently_used_week_is_evicted(self):
+        """Test the least recently used week is evicted."""
+        cache = WeekCache(2)
+        week_10 = cache.get(2018, 10)
+        cache.get(2018, 11)
+        self.assertIs(week_10, cache.get(2018, 10))
+        cache.get(2018, 12)
+        self.assertEqual((1, 3, 1, 2, 2), cache.cache_info())
+        self.assertIsNot(week_10, cache.get(2018, 11))
+
+    def test_invalidated_week_is_reloaded(self):
+        """Test an invalidated week is reloaded from the database."""
+        cache = WeekCache(2)
+        monday = cache.get(2018, 10)[WeekDay.Monday]
+        Task.create(name='a', day=monday._day)
+        cache.invalidate(2018, 10)
+        self.assertEqual('a', cache.get(2018, 10)[WeekDay.Monday]
+                         .get_cached_data(0, TaskColumn.Task))
+
+
+class TestWeekPrefetcher(DatabaseTestCase):
+    """Tests for prefetched weeks."""
+
+    def test_week_is_built_from_prefetched_rows(self):
+        """Test a week is built from prefetched rows without queries."""
+        self.assertIsNone(load_week_rows(2018, 10))
+        monday = WeekModel(2018, 10)[WeekDay.Monday]
+        Task.create(name='b', start_time=time(11, 0), day=monday._day)
+        Task.create(name='a', start_time=time(9, 0), day=monday._day)
+        rows = load_week_rows(2018, 10)
+
+        cache = WeekCache(2)
+        with mock.patch.object(cache.prefetcher, 'take',
+                               return_value=rows), \
+                mock.patch.object(DB, 'execute_sql',
+                                  wraps=DB.execute_sql) as execute_sql:
+            week = cache.get(2018, 10)
+            prefetched_monday = week[WeekDay.Monday]
+        execute_sql.assert_not_called()
+        self.assertEqual(monday.week_id, week.week_id)
+        self.assertEqual(['a', 'b'], [prefetched_monday.get_cached_data(
+            row, TaskColumn.Task) for row in range(2)])
+        self.assertEqual(0, week[WeekDay.Sunday].rowCount() - 1)
+
+
+class TestQueryExecutor(unittest.TestCase):
+    """Tests for QueryExecutor class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create an application, to deliver queued signals."""
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        """Create a query executor."""
+        self.executor = QueryExecutor()
+        self.results = []
+        self.executor.finished.connect(
+            lambda key, result: self.results.append((key, result)))
+
+    def tearDown(self):
+        """Stop the query executor."""
+        self.executor.stop()
+
+    def wait_for_results(self, count):
+        """Process events until count results are delivered."""
+        deadline = clock.monotonic() + 5
+        while len(self.results) < count and clock.monotonic() < deadline:
+            self.app.processEvents()
+        # late results would be delivered now.
+        self.executor.stop()
+        self.app.processEvents()
+
+    def test_superseded_requests_are_dropped(self):
+        """Test only the last request of a key delivers its result."""
+        self.executor.submit('a', clock.sleep, 0.1)
+        self.executor.submit('a', sum, (1, 2))
+        self.executor.submit('b', sum, (3, 4))
+        self.executor.submit('c', sum, (5, 6))
+        self.executor.cancel('c')
+        self.wait_for_results(2)
+        self.assertEqual([('a', 3), ('b', 7)], self.results)
+
+
+class TestRefreshScheduler(unittest.TestCase):
+    """Tests for RefreshScheduler class."""
+
+    def test_dirty_names_are_refreshed_once(self):
+        """Test dirty names are refreshed once, in registration order."""
+        refreshes = []
+        scheduler = RefreshScheduler()
+        for name in ('a', 'b', 'c'):
+            scheduler.register(name, lambda name=name: refreshes.append(name))
+
+        scheduler.mark_dirty('c', 'a')
+        scheduler.mark_dirty('a')
+        scheduler.mark_dirty()
+        scheduler.flush()
+        scheduler.flush()
+        self.assertEqual(['a', 'b', 'c'], refreshes)
+        self.assertEqual((6, 3, 3), scheduler.stats())
+
+    def test_steady_marks_do_not_delay_the_refresh(self):
+        """Test a refresh happens within the delay of the first mark."""
+        app = QCoreApplication.instance() or QCoreApplication([])
+        refreshes = []
+        scheduler = RefreshScheduler(200)
+        scheduler.register('a', lambda: refreshes.append(clock.monotonic()))
+
+        start = clock.monotonic()
+        while clock.monotonic() < start + 0.5:
+            scheduler.mark_dirty('a')
+            app.processEvents()
+            clock.sleep(0.01)
+        scheduler.flush()
+        self.assertGreater(len(refreshes), 1)
+        self.assertLess(refreshes[0] - start, 0.4)
+
+
+class TestStartupProfiler(DatabaseTestCase):
+    """Tests for StartupProfiler class."""
+
+    def test_phases_record_statements(self):
+        """Test phases record their statements, and the report lists them."""
+        profiler = StartupProfiler()
+        with profiler.phase('week'):
+            WeekModel(2018, 10)
+        with profiler.phase('nothing'):
+            pass
+        self.assertEqual(['week', 'nothing'],
+                         [phase.name for phase in profiler.phases])
+        self.assertGreater(profiler.phases[0].statements, 0)
+        self.assertEqual(0, profiler.phases[1].statements)
+        self.assertIn('nothing', profiler.report())
+        self.assertIn('worker threads excluded', profiler.report())
+
+    def test_worker_statements_are_not_counted(self):
+        """Test statements of another thread are not counted in a phase."""
+        profiler = StartupProfiler()
+        counts = []
+
+        def work():
+            """Execute statements on a connection of the worker thread."""
+            for _ in range(3):
+                DB.execute_sql('SELECT 1')
+            counts.append(DB.statement_count)
+            DB.close()
+
+        with profiler.phase('worker'):
+            worker = threading.Thread(target=work)
+            worker.start()
+            worker.join()
+        self.assertEqual([3], counts)
+        self.assertEqual(0, profiler.phases[0].statements)
+
+    def test_disabled_profiler_records_nothing(self):
+        """Test a disabled profiler records nothing."""
+        profiler = StartupProfiler(profile_startup_enabled(['main.py']))
+        with profiler.phase('week'):
+            pass
+        self.assertEqual([], profiler.phases)
+        self.assertTrue(profile_startup_enabled(['main.py',
+                                                 '--profile-startup']))
+
+
+class TestQueryInstrumentation(unittest.TestCase):
+    """Tests for QueryInstrumentation class."""
+
+    def test_statements_are_grouped_by_outermost_action(self):
+        """Test statements are grouped by the outermost action."""
+        instrumentation = QueryInstrumentation(slow_threshold=1)
+        with instrumentation.action('outer'):
+            instrumentation.record('SELECT 1', 0.001)
+            with instrumentation.action('inner'):
+                instrumentation.record('SELECT 1', 0.002)
+        instrumentation.record('SELECT 2', 0.001)
+
+        outer = instrumentation.actions['outer']
+        self.assertEqual((1, 2), (outer.calls, outer.statements))
+        self.assertEqual(2, outer.queries['SELECT 1'][0])
+        self.assertNotIn('inner', instrumentation.actions)
+        self.assertIn('(no action)', instrumentation.actions)
+        self.assertIn('outer: 1 calls, 2 statements',
+                      instrumentation.report())
+
+    def test_slow_queries_are_recorded(self):
+        """Test slow queries are recorded, until reset."""
+        instrumentation = QueryInstrumentation(slow_threshold=0.01)
+        with instrumentation.action('action'):
+            with self.assertLogs('taskcounter.db.instrumentation', 'WARNING'):
+                instrumentation.record('SELECT 1', 0.02)
+            instrumentation.record('SELECT 2', 0.001)
+        self.assertEqual([('action', 'SELECT 1', 0.02)],
+                         list(instrumentation.slow_queries))
+
+        instrumentation.reset()
+        self.assertEqual({}, instrumentation.actions)
+        self.assertEqual(0, len(instrumentation.slow_queries))
+
+
+class TestQueryPlans(DatabaseTestCase):
+    """Tests that model queries use the covering indexes."""
+
+    def setUp(self):
+        """Create a week."""
+        super().setUp()
+        self.week = WeekModel(2018, 10)
+        self.monday = self.week[WeekDay.Monday]
+
+    def assert_uses_index(self, table, index, function, *args):
+        """Assert that queries on a table executed by a function use an
+        index."""
+        with mock.patch.object(DB, 'execute_sql',
+                               wraps=DB.execute_sql) as execute_sql:
+            function(*args)
+
+        calls = [call for call in execute_sql.call_args_list
+                 if 'FROM "{}"'.format(table) in call[0][0]]
+        self.assertTrue(calls)
+        for call in calls:
+            plan = explain_query_plan(*call[0])
+            with self.subTest(sql=call[0][0]):
+                self.assertTrue(any(index in detail for detail in plan),
+                                plan)
+
+    def test_summary_queries_use_task_covering_index(self):
+        """Test that summary queries use task covering index."""
+        index = 'COVERING INDEX task_day_id_name_duration'
+        self.assert_uses_index('task', index,
+                               lambda: self.monday.minutes_of_day)
+        self.assert_uses_index('task', index,
+                               lambda: self.week.minutes_of_week)
+        self.assert_uses_index('task', index, self.week.week_summary, 420)
+        self.assert_uses_index('task', index, self.week.daily_summary,
+                               self.monday.date, 420)
+        self.assert_uses_index('task', index,
+                               get_total_annual_worked_hours, 2018)
+
+    def test_days_of_week_query_uses_day_covering_index(self):
+        """Test that days of week query uses day covering index."""
+        self.assert_uses_index('day', 'COVERING INDEX day_week_id_date',
+                               WeekModel, 2018, 10)
+
+
+class TestAggregateModel(DatabaseTestCase):
+    """Tests for AggregateModel class."""
+
+    def setUp(self):
+        """Create a week with tasks."""
+        super().setUp()
+        self.week = WeekModel(2018, 10)
+        self.monday = self.week[WeekDay.Monday]
+        self.tuesday = self.week[WeekDay.Tuesday]
+        for day, name, start, end in (
+                (self.monday, 'a', time(9, 0), time(10, 30)),
+                (self.monday, 'b', time(10, 30), time(11, 0)),
+                (self.monday, 'c', None, None),
+                (self.tuesday, 'a', time(14, 0), time(15, 15))):
+            Task.create(name=name, start_time=start, end_time=end,
+                        day=day._day)
+
+    def assert_same_as_database(self, aggregates):
+        """Assert that aggregates are the same as the database queries."""
+        self.assertEqual(self.monday.minutes_of_day,
+                         aggregates.minutes_of_day(self.monday.date))
+        self.assertEqual(self.week.minutes_of_week,
+                         aggregates.minutes_of_week(self.week.week_id))
+        self.assertEqual(self.week.total_time_worked,
+                         aggregates.total_time_worked)
+        self.assertEqual(self.week.total_time_to_work,
+                         aggregates.total_time_to_work)
+        self.assertEqual(self.week.week_summary(420),
+                         aggregates.week_summary(self.week.week_id, 420))
+        self.assertEqual(
+            self.week.daily_summary(self.monday.date, 420),
+            aggregates.daily_summary(self.monday.date, 420))
+
+    def test_loaded_totals_are_the_same_as_the_database(self):
+        """Test that loaded totals are the same as the database."""
+        aggregates = AggregateModel()
+        self.assert_same_as_database(aggregates)
+        self.assertEqual(3, aggregates.annual_worked_hours(2018))
+        self.assertEqual(0, aggregates.annual_worked_hours(2017))
+
+    def test_applied_changes_are_the_same_as_the_database(self):
+        """Test that applied changes are the same as the database."""
+        aggregates = AggregateModel()
+        task = Task.get(Task.name == 'c')
+        old = {TaskColumn.Id: task.id, TaskColumn.Task: 'c',
+               TaskColumn.Start_Time: None, TaskColumn.End_Time: None}
+        new = dict(old)
+        new[TaskColumn.Start_Time] = time(11, 0)
+        new[TaskColumn.End_Time] = time(12, 10)
+        Task.update(start_time=time(11, 0),
+                    end_time=time(12, 10)).where(Task.id == task.id).execute()
+        aggregates.apply(self.monday.date, self.week.week_id, old, new)
+        self.assert_same_as_database(aggregates)
+
+        task.delete_instance()
+        aggregates.apply(self.monday.date, self.week.week_id, new, None)
+        self.assert_same_as_database(aggregates)
+
+    def test_time_to_work_ignores_weeks_without_tasks(self):
+        """Test that time to work ignores weeks without tasks."""
+        aggregates = AggregateModel()
+        aggregates.set_minutes_to_work(self.week.week_id, 600)
+        self.assertEqual(600, aggregates.total_time_to_work)
+
+        for task in Task.select():
+            row = {TaskColumn.Id: task.id, TaskColumn.Task: task.name,
+                   TaskColumn.Start_Time: task.start_time,
+                   TaskColumn.End_Time: task.end_time}
+            aggregates.apply(task.day.date, self.week.week_id, row, None)
+        self.assertEqual(0, aggregates.total_time_to_work)
+        self.assertEqual(0, aggregates.total_time_worked)
+        self.assertEqual({}, aggregates.week_summary(self.week.week_id, 420))
+
+
+class TestExport(DatabaseTestCase):
+    """Tests for the export reports and writers."""
+
+    def setUp(self):
+        """Create tasks in three weeks, the last one out of the period."""
+        super().setUp()
+        for week_number, name in ((10, 'a|b'), (11, '<c>'), (12, 'd')):
+            day = WeekModel(2018, week_number)[WeekDay.Monday]._day
+            Task.create(name=name, start_time=time(9, 0),
+                        end_time=time(10, 30), day=day)
+            Task.create(name='e', start_time=time(8, 0),
+                        end_time=time(8, 45), day=day)
+            Task.create(name='e', day=day)
+        self.start = date(2018, 3, 5)
+        self.end = date(2018, 3, 18)
+
+    def export(self, format_, report=SUMMARY):
+        """Export a report of the period, return the text written."""
+        stream = io.StringIO(newline='')
+        export(stream, format_, report, self.start, self.end, 450)
+        return stream.getvalue()
+
+    def test_summary_rows(self):
+        """Test summary rows sum the period, most time first."""
+        self.assertEqual([('<c>', '01:30', '1.5', 0.2),
+                          ('a|b', '01:30', '1.5', 0.2),
+                          ('e', '01:30', '1.5', 0.2)],
+                         sorted(summary_rows(self.start, self.end, 450)))
+        self.assertEqual([('d', '01:30', '1.5', ''),
+                          ('e', '00:45', '0.75', '')],
+                         list(summary_rows(date(2018, 3, 19),
+                                           date(2018, 3, 25))))
+
+    def test_summary_rows_match_the_week_summary(self):
+        """Test summary rows of a week match the week summary."""
+        week = WeekModel(2018, 11)
+        self.assertEqual(
+            list(summary_table_rows(get_week_summary(week.week_id, 450))),
+            list(summary_rows(date(2018, 3, 12), date(2018, 3, 18), 450)))
+
+    def test_task_rows(self):
+        """Test task rows are chronological, tasks without start last."""
+        self.assertEqual([('2018-03-05', 'e', '08:00', '08:45', '00:45'),
+                          ('2018-03-05', 'a|b', '09:00', '10:30', '01:30'),
+                          ('2018-03-05', 'e', '', '', '')],
+                         list(task_rows(self.start, self.start)))
+
+    def test_csv(self):
+        """Test the csv export."""
+        rows = list(csv.reader(io.StringIO(self.export('csv', TASKS),
+                                           newline='')))
+        self.assertEqual(['Date', 'Task', 'Start Time', 'End Time', 'Time'],
+                         rows[0])
+        self.assertEqual(7, len(rows))
+        self.assertEqual(['2018-03-12', '<c>', '09:00', '10:30', '01:30'],
+                         rows[5])
+
+    def test_json_lines(self):
+        """Test the json lines export."""
+        rows = [json.loads(line)
+                for line in self.export('jsonl').splitlines()]
+        self.assertEqual(3, len(rows))
+        self.assertIn({'Task': '<c>', 'Time': '01:30', 'Decimal Time': '1.5',
+                       'Man Day': 0.2}, rows)
+
+    def test_markdown(self):
+        """Test the markdown export escapes pipes."""
+        lines = self.export('markdown').splitlines()
+        self.assertEqual('| Task | Time | Decimal Time | Man Day |', lines[0])
+        self.assertEqual('| --- | --- | --- | --- |', lines[1])
+        self.assertIn('| a\\|b | 01:30 | 1.5 | 0.2 |', lines)
+
+    def test_html(self):
+        """Test the html export escapes names."""
+        text = self.export('html')
+        self.assertTrue(text.startswith('<html>'))
+        self.assertIn('>&lt;c&gt;</td>', text)
+        self.assertEqual(4, text.count('<tr>'))
+
+    def test_columns(self):
+        """Test given column titles replace the untranslated ones."""
+        stream = io.StringIO(newline='')
+        export(stream, 'csv', SUMMARY, self.start, self.end, 450,
+               ('Tâche', 'Temps', 'Temps décimal', 'Jour homme'))
+        self.assertTrue(stream.getvalue().startswith(
+            'Tâche,Temps,Temps décimal,Jour homme\r\n'))
+
+    def test_writer_without_row_cannot_be_created(self):
+        """Test a writer missing an override fails when it is created."""
+        class HeaderWriter(Writer):
+            """Writer of the header row only."""
+
+            def begin(self, columns):
+                """Write nothing."""
+
+        with self.assertRaises(TypeError):
+            HeaderWriter(io.StringIO())
+
+    def test_unknown_format(self):
+        """Test an unknown format raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.export('xml')
+
+
+class TestCommandLine(unittest.TestCase):
+    """Tests for the command line interface."""
+
+    def setUp(self):
+        """Create a database file with tasks in two weeks of 2018."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.database = os.path.join(self.directory.name, 'taskcounter.db')
+        DB.init(self.database)
+        create_database()
+        migrate_database()
+        for week_number, name in ((10, 'a'), (11, 'b')):
+            day = WeekModel(2018, week_number)[WeekDay.Monday]._day
+            Task.create(name=name, start_time=time(9, 0),
+                        end_time=time(12, 30), day=day)
+            Task.create(name='c', start_time=time(13, 0),
+                        end_time=time(14, 0), day=day)
+        close_database()
+
+    def tearDown(self):
+        """Remove the database file."""
+        close_database()
+        self.directory.cleanup()
+
+    def run_cli(self, *args):
+        """Run the command line interface, return its output."""
+        stream = io.StringIO()
+        with redirect_stdout(stream):
+            self.assertEqual(0, cli_main(['--database', self.database]
+                                         + list(args)))
+        return stream.getvalue()
+
+    def test_week_report(self):
+        """Test the summary of a week, with the man day setting."""
+        rows = list(csv.reader(io.StringIO(self.run_cli(
+            'report', '--year', '2018', '--week', '10'))))
+        self.assertEqual([['Task', 'Time', 'Decimal Time', 'Man Day'],
+                          ['a', '03:30', '3.5', '0.5'],
+                          ['c', '01:00', '1.0', '0.14']], rows)
+
+    def test_year_and_date_reports(self):
+        """Test the summaries of a year and of a date."""
+        output = self.run_cli('report', '--year', '2018', '--format',
+                              'markdown', '--man-day', '08:00')
+        self.assertIn('| c | 02:00 | 2.0 | 0.25 |', output)
+        self.assertEqual(5, len(output.splitlines()))
+        output = self.run_cli('report', '--date', '2018-03-12', '--format',
+                              'jsonl')
+        self.assertEqual('b', json.loads(output.splitlines()[0])['Task'])
+        self.assertEqual('', self.run_cli('report', '--year', '2017',
+                                          '--week', '10', '--format',
+                                          'jsonl'))
+
+    def test_hours(self):
+        """Test the hours worked in a year."""
+        self.assertEqual('9\n', self.run_cli('hours', '--year', '2018'))
+
+    def test_invalid_arguments(self):
+        """Test invalid arguments exit with status 2."""
+        for args in (['report', '--week', '54', '--year', '2018'],
+                     ['report', '--man-day', '7h'],
+                     ['--database', os.path.join(self.directory.name, 'x'),
+                      'hours']):
+            with self.subTest(args=args), \
+                    mock.patch('sys.stderr', io.StringIO()), \
+                    self.assertRaises(SystemExit) as context:
+                cli_main(['--database', self.database] + args)
+            self.assertEqual(2, context.exception.code)
+
+    def test_qt_is_not_imported(self):
+        """Test the command line interface reports without importing Qt."""
+        code = ('import sys\n'
+                'from taskcounter.cli import main\n'
+                'main(["--database", sys.argv[1], "report", "--year", '
+                '"2018"])\n'
+                'print(sorted(m for m in sys.modules if "PyQt5" in m))\n')
+        output = subprocess.run(
+            [sys.executable, '-c', code, self.database], check=True,
+            capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        self.assertEqual('[]', output.splitlines()[-1])
+
+
 if __name__ == '__main__':
     unittest.main()